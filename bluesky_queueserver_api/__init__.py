@@ -5,3 +5,4 @@ del get_versions
 
 from .item import BItem, BPlan, BInst, BFunc  # noqa: F401, E402
 from .api_base import WaitMonitor  # noqa: F401, E402
+from .metrics import MetricsExporter  # noqa: F401, E402
@@ -2,17 +2,34 @@ default_allow_request_fail_exceptions = True
 
 default_status_expiration_period = 0.5  # s
 default_status_polling_period = 1.0  # s
+default_status_polling_period_min = 0.1  # s
 
 default_console_monitor_poll_timeout = 1.0  # s, 0MQ
 default_console_monitor_poll_period = 0.5  # s, HTTP
 default_console_monitor_max_msgs = 10000
 default_console_monitor_max_lines = 1000
+default_console_monitor_streaming = False  # HTTP
+default_console_monitor_overflow = "drop_newest"  # Policy used if the message queue is full
+default_console_monitor_overflow_timeout = 1.0  # s, 'block' overflow policy
 
 default_zmq_request_timeout_recv = 2.0  # s
 default_zmq_request_timeout_send = 0.5  # s
+default_zmq_n_connections = 1  # Number of connections for regular requests
+default_zmq_priority_connection = False
 
 default_http_request_timeout = 5.0  # s
 default_http_login_timeout = 60.0  # s
 default_http_server_uri = "http://localhost:60610"  # Default URI (for testing and evaluation)
+default_http_json_codec = "auto"  # Fastest available JSON library
+default_http_max_connections = 100  # Same as the 'httpx' default
+default_http_max_keepalive_connections = 20  # Same as the 'httpx' default
+default_http_keepalive_expiry = 5.0  # s
+default_http2 = False
+default_http_token_refresh_margin = 30.0  # s, refresh the access token before it expires
 
 default_wait_timeout = 600  # Timeout for wait operations in seconds
+default_item_add_batching_window = 0.05  # s, time window for coalescing of 'item_add' requests
+
+default_metrics_prefix = "qserver_api"  # Prefix of the names of exported metrics
+default_metrics_server_addr = "127.0.0.1"
+default_metrics_server_port = 9610
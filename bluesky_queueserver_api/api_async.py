@@ -1,13 +1,22 @@
 import asyncio
-import copy
+import logging
 import time as ttime
 
-from .api_base import API_Base, WaitMonitor
+from .api_base import (
+    API_Base,
+    WaitMonitor,
+    _WaitCallback,
+    _ItemAddBatch,
+    _cached_api_methods,
+    _prefetch_api_methods,
+)
 from ._defaults import default_wait_timeout
 
 from .api_docstrings import (
     _doc_api_status,
     _doc_api_ping,
+    _doc_api_subscribe_status,
+    _doc_api_unsubscribe_status,
     _doc_api_wait_for_idle,
     _doc_api_wait_for_idle_or_paused,
     _doc_api_item_add,
@@ -23,6 +32,7 @@ from .api_docstrings import (
     _doc_api_queue_stop,
     _doc_api_queue_stop_cancel,
     _doc_api_queue_clear,
+    _doc_api_queue_sync,
     _doc_api_queue_mode_set,
     _doc_api_queue_get,
     _doc_api_history_get,
@@ -56,23 +66,47 @@ from .api_docstrings import (
     _doc_api_unlock,
 )
 
+logger = logging.getLogger(__name__)
+
 
 class API_Async_Mixin(API_Base):
-    def __init__(self, *, status_expiration_period, status_polling_period):
+    def __init__(self, *, status_expiration_period, status_polling_period, status_polling_period_min):
         super().__init__(
-            status_expiration_period=status_expiration_period, status_polling_period=status_polling_period
+            status_expiration_period=status_expiration_period,
+            status_polling_period=status_polling_period,
+            status_polling_period_min=status_polling_period_min,
         )
 
         self._is_closing = False
 
+        # The event is set to wake up the status task: status is requested, a new 'wait'
+        #   callback is added or the API is closed. The task is not woken up periodically.
         self._event_status_get = asyncio.Event()
         self._status_get_cb = []  # A list of callbacks
         self._status_get_cb_lock = asyncio.Lock()
-        self._wait_cb = []
+
+        # Locks prevent concurrent loading of the same cached data: concurrent callers wait
+        #   for the data loaded by a single request (single-flight)
+        self._cache_locks = {_: asyncio.Lock() for _ in _cached_api_methods}
+
+        # The queue and the task for calling status subscribers. The task is created once
+        #   the first subscriber is added.
+        self._status_subscribers_queue = asyncio.Queue()
+        self._task_status_subscribers = None
 
         # Use tasks instead of threads
+        self._loop = asyncio.get_running_loop()
         self._task_status_get = asyncio.create_task(self._task_status_get_func())
-        self._task_status_get = asyncio.create_task(self._task_status_poll_func())
+
+        # Receive the status loaded by other API instances connected to the same RE Manager
+        self._status_cache.add_listener(self)
+
+    def _wake_status_engine(self):
+        # The status may be loaded by an instance running in other thread or event loop
+        try:
+            self._loop.call_soon_threadsafe(self._event_status_get.set)
+        except RuntimeError:
+            pass  # The event loop is closed
 
     async def _event_wait(self, event, timeout):
         """
@@ -86,31 +120,41 @@ class API_Async_Mixin(API_Base):
 
     async def _task_status_get_func(self):
         """
-        The coroutine is run as a background task (not awaited). It periodically checks if
-        ``self._event_status_get`` is set. If the event is set, then the function loads
-        (if needed) and processes RE Manager status.
+        The coroutine is run as a background task (not awaited). The task is sleeping until
+        ``self._event_status_get`` is set or until it is time to poll RE Manager status for
+        pending 'wait' operations. The task does not wake up if there are no status requests
+        and no pending 'wait' operations. Once woken up, the function loads (if needed) and
+        processes RE Manager status.
         """
         while True:
-            load_status = await self._event_wait(self._event_status_get, timeout=0.1)
-            if load_status:
-                if self._status_timestamp:
-                    dt = ttime.time() - self._status_timestamp
-                    dt = dt if (dt >= 0) else None
-                else:
-                    dt = None
+            async with self._status_get_cb_lock:
+                timeout = self._status_engine_timeout()
+
+            await self._event_wait(self._event_status_get, timeout=timeout)
+
+            async with self._status_get_cb_lock:
+                self._event_status_get.clear()
+                self._status_engine_iterations += 1
+                load_status = bool(self._status_get_cb) or self._status_engine_poll_due()
+
+            if self._is_closing:
+                break
 
-                if (dt is None) or (dt > self._status_expiration_period):
-                    status, raised_exception = None, None
-                    try:
-                        status = await self._load_status()
-                    except Exception as ex:
-                        raised_exception = ex
+            status_changed = False
+            if load_status:
+                if self._is_status_expired():
+                    status, raised_exception, status_timestamp, status_generation = await self._load_status()
 
                     if status is not None:
-                        self._status_timestamp = ttime.time()
+                        self._status_timestamp = status_timestamp
+                        self._status_generation = status_generation
+                        self._adjust_status_polling_period(self._status_current, status)
 
+                    status_changed = status != self._status_current
                     self._status_current = status
                     self._status_exception = raised_exception
+                else:
+                    self._stats_cache_record("status", hit=True)
 
                 async with self._status_get_cb_lock:
                     # Call each 'status_get' callback with current status/exception
@@ -118,36 +162,57 @@ class API_Async_Mixin(API_Base):
                         cb(self._status_current, self._status_exception)
                     self._status_get_cb.clear()
 
-                    # Update 'wait' callbacks. Even if the status is not reloaded,
-                    #   the callbacks still check if there are timeouts.
-                    n_cb = 0  # The number of wait callbacks
-                    for cb in self._wait_cb.copy():
-                        if cb(self._status_current):
-                            self._wait_cb.pop(n_cb)
-                        else:
-                            n_cb += 1
-
-                self._event_status_get.clear()
-
-            if self._is_closing:
-                break
+                    notifications = self._status_subscribers_process()
 
-    async def _task_status_poll_func(self):
-        while True:
-            await asyncio.sleep(self._status_polling_period)
+                # Subscribers are called from a separate task without holding the lock
+                for notification in notifications:
+                    self._status_subscribers_queue.put_nowait(notification)
 
             async with self._status_get_cb_lock:
-                if len(self._wait_cb):
-                    self._event_status_get.set()
+                # Update 'wait' callbacks. Even if the status is not reloaded,
+                #   the callbacks with expired deadlines are processed.
+                self._wait_cb_process(status_loaded=load_status, status_changed=status_changed)
 
-            if self._is_closing:
+    async def _task_status_subscribers_func(self):
+        """
+        The coroutine is run as a background task, which is created when the first status subscriber
+        is added. Subscriber callbacks are called (or awaited if they are coroutine functions) by
+        the task, so the callbacks may use other API.
+        """
+        while True:
+            notification = await self._status_subscribers_queue.get()
+            if notification is None:
                 break
+            callback, status, diff = notification
+            if callback not in self._status_subscribers:
+                continue  # The callback was unsubscribed
+            try:
+                result = callback(status, diff)
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception as ex:
+                logger.exception("Exception was raised by status subscriber callback: %s", ex)
 
     async def _load_status(self):
         """
-        Returns status of RE Manager.
+        Returns the tuple ``(status, exception, timestamp, generation)``. The status is loaded from RE Manager
+        or taken from the shared cache if it was recently loaded by another API instance.
+        Only one request is sent if the status is needed by multiple API instances at the same time.
         """
-        return await self.send_request(method="status")
+        identity = self._get_status_cache_identity()
+        async with self._status_cache.get_lock_async():
+            entry = self._status_cache.get(identity, max_age=self._status_expiration_period)
+            self._stats_cache_record("status", hit=entry is not None)
+            if entry is None:
+                status, raised_exception, generation = None, None, self._status_cache.generation
+                try:
+                    status = await self.send_request(method="status")
+                except Exception as ex:
+                    raised_exception = ex
+                entry = self._status_cache.set(
+                    identity, status=status, exception=raised_exception, generation=generation, source=self
+                )
+        return entry
 
     async def _wait_for_condition(self, *, condition, timeout, monitor, reset_time_start=True):
         """
@@ -177,9 +242,6 @@ class API_Async_Mixin(API_Base):
             It is automatically set ``True`` if ``monitor`` is ``None``.
         """
 
-        timeout_occurred = False
-        wait_cancelled = False
-
         if not monitor:
             reset_time_start = True
             monitor = WaitMonitor()
@@ -188,38 +250,40 @@ class API_Async_Mixin(API_Base):
         monitor.set_timeout(timeout)
 
         event = asyncio.Event()
+        wait_cb = _WaitCallback(condition=condition, monitor=monitor, on_completed=event.set)
+        loop = asyncio.get_running_loop()
 
-        def cb(status):
-            nonlocal timeout_occurred, wait_cancelled, event, monitor
-            result = condition(status) if status else False
-
-            if not result and (monitor.time_elapsed > monitor.timeout):
-                timeout_occurred = True
-                result = True
-            elif monitor.is_cancelled:
-                wait_cancelled = True
-                result = True
+        def cb_recheck_in_loop():
+            self._wait_cb_recheck.append(wait_cb)
+            self._event_status_get.set()
 
-            if result:
-                event.set()
+        def cb_recheck():
+            # Called if the monitor is cancelled or the timeout is modified (possibly from other thread)
+            loop.call_soon_threadsafe(cb_recheck_in_loop)
 
-            return result
+        monitor.add_cancel_callback(cb_recheck)
+        monitor._timeout_callbacks.append(cb_recheck)
 
         try:
             async with self._status_get_cb_lock:
-                self._wait_cb.append(cb)
+                self._wait_cb_add(wait_cb)
+                # Wake up the status task, so that it starts polling the status
+                self._event_status_get.set()
 
             await event.wait()
         finally:
             # Remove the callback if it is still in the list. This will remove the
             #   callback if the execution is interrupted with Ctrl-C (in IPython).
             async with self._status_get_cb_lock:
+                self._wait_cb_remove(wait_cb)
+            for cb_list in (monitor._cancel_callbacks, monitor._timeout_callbacks):
                 try:
-                    n = self._wait_cb.index(cb)
-                    self._wait_cb.pop(n)
-                except Exception:
+                    cb_list.remove(cb_recheck)
+                except ValueError:
                     pass
 
+        timeout_occurred, wait_cancelled = wait_cb.timeout_occurred, wait_cb.wait_cancelled
+
         # Attempt to load the updated status
         try:
             await self._status(reload=True)
@@ -268,7 +332,7 @@ class API_Async_Mixin(API_Base):
         async with self._status_get_cb_lock:
             self._status_get_cb.append(cb)
             if reload:
-                self._status_timestamp = None
+                self._invalidate_status()
             self._event_status_get.set()
 
         await event.wait()
@@ -279,9 +343,15 @@ class API_Async_Mixin(API_Base):
 
     def _close_api(self):
         self._is_closing = True  # Exit all tasks
+        self._event_status_get.set()
+        self._release_status_cache()
+        if self._task_status_subscribers is not None:
+            self._status_subscribers_queue.put_nowait(None)
 
     def __del__(self):
-        self._close_api()
+        # The constructor may fail before the API is initialized (e.g. if connection parameters are invalid)
+        if hasattr(self, "_event_status_get"):
+            self._close_api()
 
     # =====================================================================================
     #                 API for monitoring and control of RE Manager
@@ -289,12 +359,51 @@ class API_Async_Mixin(API_Base):
     async def status(self, *, reload=False):
         # Docstring is maintained separately
         status = await self._status(reload=reload)
-        return copy.deepcopy(status)  # Returns copy
+        return self._copy_response_data("status", status)  # Returns copy or read-only view
 
     async def ping(self, *, reload=False):
         # Docstring is maintained separately
         return await self.status(reload=reload)
 
+    async def subscribe_status(self, callback, *, fields=None):
+        # Docstring is maintained separately
+        fields = self._prepare_subscribe_status(callback=callback, fields=fields)
+        async with self._status_get_cb_lock:
+            self._subscribe_status(callback, fields)
+
+    def _subscribe_status(self, callback, fields):
+        """
+        Add status subscriber. The status task does not await while processing subscribers,
+        so the function may be called without holding the lock.
+        """
+        if self._task_status_subscribers is None:
+            self._task_status_subscribers = asyncio.create_task(self._task_status_subscribers_func())
+        self._status_subscriber_add(callback, fields)
+        # Wake up the status task, so that it starts polling the status
+        self._event_status_get.set()
+
+    async def unsubscribe_status(self, callback):
+        # Docstring is maintained separately
+        async with self._status_get_cb_lock:
+            self._status_subscriber_remove(callback)
+
+    def _prefetch_set_subscription(self, enable):
+        # The property setter is not a coroutine, so the subscriber is added without the lock
+        if enable:
+            self._subscribe_status(self._prefetch_cb, set(_prefetch_api_methods))
+        else:
+            self._status_subscriber_remove(self._prefetch_cb)
+
+    async def _prefetch_cb(self, status, diff):
+        """
+        Status subscriber: load the data with changed UIDs to the cache.
+        """
+        for method in self._prefetch_methods(status, diff):
+            try:
+                await getattr(self, method)()
+            except Exception:
+                pass
+
     async def wait_for_idle(self, *, timeout=default_wait_timeout, monitor=None):
         # Docstring is maintained separately
 
@@ -326,11 +435,71 @@ class API_Async_Mixin(API_Base):
             user_group=user_group,
             lock_key=lock_key,
         )
+        if self._item_add_batching_window is not None:
+            key = self._item_add_batch_key(request_params)
+            if key is not None:
+                return await self._item_add_coalesced(request_params=request_params, key=key)
         self._clear_status_timestamp()
         return await self.send_request(method="queue_item_add", params=request_params)
 
+    async def _item_add_coalesced(self, *, request_params, key):
+        """
+        Add the item to the batch of concurrent ``item_add`` requests and return the result.
+        """
+        batch = self._item_add_batch
+        is_sender = (batch is None) or (batch.key != key)
+        if is_sender:
+            # The pending batch has different parameters: send it immediately to preserve the order
+            self._item_add_batch_close()
+            batch = _ItemAddBatch(
+                key=key, request_params=request_params, event_closed=asyncio.Event(), event_done=asyncio.Event()
+            )
+            self._item_add_batch = batch
+        n_item = batch.add(request_params["item"])
+
+        if is_sender:
+            try:
+                try:
+                    await asyncio.wait_for(batch.event_closed.wait(), timeout=self._item_add_batching_window)
+                except asyncio.TimeoutError:
+                    pass
+                if self._item_add_batch is batch:
+                    self._item_add_batch = None
+                self._clear_status_timestamp()
+                response = await self.send_request(method="queue_item_add_batch", params=batch.prepare_request())
+                batch.process_response(response)
+            except self.RequestFailedError:
+                pass  # The items are submitted individually
+            except BaseException as ex:
+                # The exception (including cancellation of the sender) is raised by all callers
+                batch.exception = ex
+            finally:
+                # The callers that joined the batch must not wait for the batch that is never sent
+                if self._item_add_batch is batch:
+                    self._item_add_batch = None
+                batch.event_done.set()
+        else:
+            await batch.event_done.wait()
+
+        if batch.exception is not None:
+            raise batch.exception
+        if batch.responses is None:
+            self._clear_status_timestamp()
+            return await self.send_request(method="queue_item_add", params=request_params)
+        return batch.responses[n_item]
+
     async def item_add_batch(
-        self, items, *, pos=None, before_uid=None, after_uid=None, user=None, user_group=None, lock_key=None
+        self,
+        items,
+        *,
+        pos=None,
+        before_uid=None,
+        after_uid=None,
+        user=None,
+        user_group=None,
+        lock_key=None,
+        chunk_size=None,
+        progress_callback=None,
     ):
         # Docstring is maintained separately
         request_params = self._prepare_item_add_batch(
@@ -342,8 +511,47 @@ class API_Async_Mixin(API_Base):
             user_group=user_group,
             lock_key=lock_key,
         )
-        self._clear_status_timestamp()
-        return await self.send_request(method="queue_item_add_batch", params=request_params)
+        chunks = self._split_item_add_batch(request_params, chunk_size=chunk_size)
+        n_total = len(request_params["items"])
+        if chunks is None:
+            self._clear_status_timestamp()
+            response = await self.send_request(method="queue_item_add_batch", params=request_params)
+            if progress_callback and response["success"]:
+                await self._item_add_batch_progress(progress_callback, n_total, n_total)
+            return response
+
+        # Chunks are sent sequentially, since each chunk is inserted after the last item of the previous chunk
+        responses, chunk_after_uid, n_added = [], None, 0
+        for chunk in chunks:
+            chunk_params = self._prepare_item_add_batch_chunk(
+                request_params, items=chunk, after_uid=chunk_after_uid
+            )
+            self._clear_status_timestamp()
+            try:
+                response = await self.send_request(method="queue_item_add_batch", params=chunk_params)
+            except self.RequestFailedError as ex:
+                response = ex.response
+            responses.append(response)
+            if not response["success"]:
+                break
+            chunk_after_uid = response["items"][-1]["item_uid"]
+            n_added += len(chunk)
+            if progress_callback:
+                await self._item_add_batch_progress(progress_callback, n_added, n_total)
+
+        response = self._combine_item_add_batch_responses(responses, chunks=chunks)
+        self._check_response(
+            request={"method": "queue_item_add_batch", "params": request_params}, response=response
+        )
+        return response
+
+    async def _item_add_batch_progress(self, progress_callback, n_added, n_total):
+        """
+        Call the progress callback, which may be a function or a coroutine function.
+        """
+        result = progress_callback(n_added, n_total)
+        if asyncio.iscoroutine(result):
+            await result
 
     async def item_update(self, item, *, replace=None, user=None, user_group=None, lock_key=None):
         # Docstring is maintained separately
@@ -442,6 +650,25 @@ class API_Async_Mixin(API_Base):
         request_params = self._prepare_queue_clear(lock_key=lock_key)
         return await self.send_request(method="queue_clear", params=request_params)
 
+    async def queue_sync(self, desired_items, *, dry_run=False, user=None, user_group=None, lock_key=None):
+        # Docstring is maintained separately
+        current_items = (await self.queue_get())["items"]
+        operations = self._prepare_queue_sync(
+            current_items=current_items,
+            desired_items=desired_items,
+            user=user,
+            user_group=user_group,
+            lock_key=lock_key,
+        )
+        response = {"success": True, "msg": "", "operations": operations}
+        if not dry_run:
+            for op in operations:
+                op_response = await getattr(self, op["method"])(**op["params"])
+                if not op_response["success"]:
+                    response.update({"success": False, "msg": f"{op['method']}: {op_response['msg']}"})
+                    break
+        return response
+
     async def queue_mode_set(self, **kwargs):
         # Docstring is maintained separately
         request_params = self._prepare_queue_mode_set(**kwargs)
@@ -450,25 +677,27 @@ class API_Async_Mixin(API_Base):
 
     async def queue_get(self, *, reload=False):
         # Docstring is maintained separately
-        status = await self._status(reload=reload)
-        plan_queue_uid = status["plan_queue_uid"]
-        if plan_queue_uid != self._current_plan_queue_uid:
-            response = await self.send_request(method="queue_get")
-            self._process_response_queue_get(response)
-        else:
-            response = self._generate_response_queue_get()
-        return response
+        async with self._cache_locks["queue_get"]:
+            status = await self._status(reload=reload)
+            plan_queue_uid = status["plan_queue_uid"]
+            if plan_queue_uid != self._current_plan_queue_uid:
+                response = await self.send_request(method="queue_get")
+                self._process_response_queue_get(response)
+            else:
+                response = self._generate_response_queue_get()
+            return response
 
     async def history_get(self, *, reload=False):
         # Docstring is maintained separately
-        status = await self._status(reload=reload)
-        plan_history_uid = status["plan_history_uid"]
-        if plan_history_uid != self._current_plan_history_uid:
-            response = await self.send_request(method="history_get")
-            self._process_response_history_get(response)
-        else:
-            response = self._generate_response_history_get()
-        return response
+        async with self._cache_locks["history_get"]:
+            status = await self._status(reload=reload)
+            plan_history_uid = status["plan_history_uid"]
+            if plan_history_uid != self._current_plan_history_uid:
+                response = await self.send_request(method="history_get")
+                self._process_response_history_get(response)
+            else:
+                response = self._generate_response_history_get()
+            return response
 
     async def history_clear(self, *, lock_key=None):
         # Docstring is maintained separately
@@ -478,55 +707,71 @@ class API_Async_Mixin(API_Base):
 
     async def plans_allowed(self, *, reload=False, user_group=None):
         # Docstring is maintained separately
-        status = await self._status(reload=reload)
-        plans_allowed_uid = status["plans_allowed_uid"]
-        user_group = self._get_user_group_for_allowed_plans_devices(user_group=user_group)
-        if (plans_allowed_uid != self._current_plans_allowed_uid) or (
-            user_group not in self._current_plans_allowed
-        ):
-            request_params = self._prepare_plans_devices_allowed(user_group=user_group)
-            response = await self.send_request(method="plans_allowed", params=request_params)
-            self._process_response_plans_allowed(response, user_group=user_group)
-        else:
-            response = self._generate_response_plans_allowed(user_group=user_group)
-        return response
+        async with self._cache_locks["plans_allowed"]:
+            status = await self._status(reload=reload)
+            plans_allowed_uid = status["plans_allowed_uid"]
+            user_group = self._get_user_group_for_allowed_plans_devices(user_group=user_group)
+            if (
+                (plans_allowed_uid != self._current_plans_allowed_uid)
+                or (user_group not in self._current_plans_allowed)
+            ) and (
+                not self._persistent_cache_restore("plans_allowed", uid=plans_allowed_uid, user_group=user_group)
+            ):
+                request_params = self._prepare_plans_devices_allowed(user_group=user_group)
+                response = await self.send_request(method="plans_allowed", params=request_params)
+                self._process_response_plans_allowed(response, user_group=user_group)
+            else:
+                response = self._generate_response_plans_allowed(user_group=user_group)
+            return response
 
     async def devices_allowed(self, *, reload=False, user_group=None):
         # Docstring is maintained separately
-        status = await self._status(reload=reload)
-        devices_allowed_uid = status["devices_allowed_uid"]
-        user_group = self._get_user_group_for_allowed_plans_devices(user_group=user_group)
-        if (devices_allowed_uid != self._current_devices_allowed_uid) or (
-            user_group not in self._current_devices_allowed
-        ):
-            request_params = self._prepare_plans_devices_allowed(user_group=user_group)
-            response = await self.send_request(method="devices_allowed", params=request_params)
-            self._process_response_devices_allowed(response, user_group=user_group)
-        else:
-            response = self._generate_response_devices_allowed(user_group=user_group)
-        return response
+        async with self._cache_locks["devices_allowed"]:
+            status = await self._status(reload=reload)
+            devices_allowed_uid = status["devices_allowed_uid"]
+            user_group = self._get_user_group_for_allowed_plans_devices(user_group=user_group)
+            if (
+                (devices_allowed_uid != self._current_devices_allowed_uid)
+                or (user_group not in self._current_devices_allowed)
+            ) and (
+                not self._persistent_cache_restore(
+                    "devices_allowed", uid=devices_allowed_uid, user_group=user_group
+                )
+            ):
+                request_params = self._prepare_plans_devices_allowed(user_group=user_group)
+                response = await self.send_request(method="devices_allowed", params=request_params)
+                self._process_response_devices_allowed(response, user_group=user_group)
+            else:
+                response = self._generate_response_devices_allowed(user_group=user_group)
+            return response
 
     async def plans_existing(self, *, reload=False):
         # Docstring is maintained separately
-        status = await self._status(reload=reload)
-        plans_existing_uid = status["plans_existing_uid"]
-        if plans_existing_uid != self._current_plans_existing_uid:
-            response = await self.send_request(method="plans_existing")
-            self._process_response_plans_existing(response)
-        else:
-            response = self._generate_response_plans_existing()
-        return response
+        async with self._cache_locks["plans_existing"]:
+            status = await self._status(reload=reload)
+            plans_existing_uid = status["plans_existing_uid"]
+            if (plans_existing_uid != self._current_plans_existing_uid) and (
+                not self._persistent_cache_restore("plans_existing", uid=plans_existing_uid)
+            ):
+                response = await self.send_request(method="plans_existing")
+                self._process_response_plans_existing(response)
+            else:
+                response = self._generate_response_plans_existing()
+            return response
 
     async def devices_existing(self, *, reload=False):
         # Docstring is maintained separately
-        status = await self._status(reload=reload)
-        devices_existing_uid = status["devices_existing_uid"]
-        if devices_existing_uid != self._current_devices_existing_uid:
-            response = await self.send_request(method="devices_existing")
-            self._process_response_devices_existing(response)
-        else:
-            response = self._generate_response_devices_existing()
-        return response
+        async with self._cache_locks["devices_existing"]:
+            status = await self._status(reload=reload)
+            devices_existing_uid = status["devices_existing_uid"]
+            if (devices_existing_uid != self._current_devices_existing_uid) and (
+                not self._persistent_cache_restore("devices_existing", uid=devices_existing_uid)
+            ):
+                response = await self.send_request(method="devices_existing")
+                self._process_response_devices_existing(response)
+            else:
+                response = self._generate_response_devices_existing()
+            return response
 
     async def permissions_reload(self, *, restore_plans_devices=None, restore_permissions=None, lock_key=None):
         # Docstring is maintained separately
@@ -646,15 +891,16 @@ class API_Async_Mixin(API_Base):
 
     async def re_runs(self, option=None, *, reload=False):
         # Docstring is maintained separately
-        self._verify_options_re_runs(option=option)
-        status = await self._status(reload=reload)
-        run_list_uid = status["run_list_uid"]
-        if run_list_uid != self._current_run_list_uid:
-            response = await self.send_request(method="re_runs")
-            response = self._process_response_re_runs(response, option=option)
-        else:
-            response = self._generate_response_re_runs(option=option)
-        return response
+        async with self._cache_locks["re_runs"]:
+            self._verify_options_re_runs(option=option)
+            status = await self._status(reload=reload)
+            run_list_uid = status["run_list_uid"]
+            if run_list_uid != self._current_run_list_uid:
+                response = await self.send_request(method="re_runs")
+                response = self._process_response_re_runs(response, option=option)
+            else:
+                response = self._generate_response_re_runs(option=option)
+            return response
 
     async def re_pause(self, option=None, *, lock_key=None):
         # Docstring is maintained separately
@@ -708,15 +954,16 @@ class API_Async_Mixin(API_Base):
 
     async def lock_info(self, lock_key=None, *, reload=False):
         # Docstring is maintained separately
-        status = await self._status(reload=reload)
-        lock_info_uid = status["lock_info_uid"]
-        if (lock_info_uid != self._current_lock_info_uid) or (lock_key is not None):
-            request_params = self._prepare_lock_info(lock_key=lock_key)
-            response = await self.send_request(method="lock_info", params=request_params)
-            self._process_response_lock_info(response)
-        else:
-            response = self._generate_response_lock_info()
-        return response
+        async with self._cache_locks["lock_info"]:
+            status = await self._status(reload=reload)
+            lock_info_uid = status["lock_info_uid"]
+            if (lock_info_uid != self._current_lock_info_uid) or (lock_key is not None):
+                request_params = self._prepare_lock_info(lock_key=lock_key)
+                response = await self.send_request(method="lock_info", params=request_params)
+                self._process_response_lock_info(response)
+            else:
+                response = self._generate_response_lock_info()
+            return response
 
     async def unlock(self, lock_key=None):
         # Docstring is maintained separately
@@ -727,6 +974,8 @@ class API_Async_Mixin(API_Base):
 
 API_Async_Mixin.status.__doc__ = _doc_api_status
 API_Async_Mixin.ping.__doc__ = _doc_api_ping
+API_Async_Mixin.subscribe_status.__doc__ = _doc_api_subscribe_status
+API_Async_Mixin.unsubscribe_status.__doc__ = _doc_api_unsubscribe_status
 API_Async_Mixin.wait_for_idle.__doc__ = _doc_api_wait_for_idle
 API_Async_Mixin.wait_for_idle_or_paused.__doc__ = _doc_api_wait_for_idle_or_paused
 API_Async_Mixin.item_add.__doc__ = _doc_api_item_add
@@ -742,6 +991,7 @@ API_Async_Mixin.queue_start.__doc__ = _doc_api_queue_start
 API_Async_Mixin.queue_stop.__doc__ = _doc_api_queue_stop
 API_Async_Mixin.queue_stop_cancel.__doc__ = _doc_api_queue_stop_cancel
 API_Async_Mixin.queue_clear.__doc__ = _doc_api_queue_clear
+API_Async_Mixin.queue_sync.__doc__ = _doc_api_queue_sync
 API_Async_Mixin.queue_mode_set.__doc__ = _doc_api_queue_mode_set
 API_Async_Mixin.queue_get.__doc__ = _doc_api_queue_get
 API_Async_Mixin.history_get.__doc__ = _doc_api_history_get
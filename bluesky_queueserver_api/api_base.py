@@ -1,13 +1,235 @@
+import asyncio
+import bisect
 from collections.abc import Mapping, Iterable
+import contextlib
 import copy
 import getpass
+import gzip
+import hashlib
+import heapq
+import itertools
+import json
 import os
 from pathlib import Path
 import secrets
+import threading
 import time as ttime
+from types import MappingProxyType
+import weakref
 
 from .item import BItem
 from .comm_base import RequestParameterError
+from ._defaults import default_item_add_batching_window
+
+# States of RE Manager that are expected to change soon. The status is polled
+#   with the minimum polling period while the manager is in one of those states
+#   (including execution of plans, which may complete at any moment).
+_transitional_manager_states = (
+    "initializing",
+    "creating_environment",
+    "starting_queue",
+    "executing_queue",
+    "executing_task",
+    "closing_environment",
+    "destroying_environment",
+)
+
+# API that return cached data. The data is reloaded when the respective UID in status changes.
+_cached_api_methods = (
+    "queue_get",
+    "history_get",
+    "plans_allowed",
+    "devices_allowed",
+    "plans_existing",
+    "devices_existing",
+    "re_runs",
+    "lock_info",
+)
+
+# Status fields and API used to prefetch the respective cached data once the UID is changed
+_prefetch_api_methods = {
+    "plan_queue_uid": ("queue_get", "_current_plan_queue_uid"),
+    "plan_history_uid": ("history_get", "_current_plan_history_uid"),
+    "run_list_uid": ("re_runs", "_current_run_list_uid"),
+    "lock_info_uid": ("lock_info", "_current_lock_info_uid"),
+}
+
+
+# Item parameters compared by ``queue_sync`` to detect modified items
+_queue_sync_item_fields = ("item_type", "name", "args", "kwargs", "meta")
+
+
+def _longest_increasing_subsequence(values):
+    """
+    Returns the set of indices of elements of the longest increasing subsequence of ``values``.
+    The elements must be unique. Complexity: O(N log N).
+    """
+    tails, tails_indices, prev_indices = [], [], [None] * len(values)
+    for n, v in enumerate(values):
+        k = bisect.bisect_left(tails, v)
+        if k == len(tails):
+            tails.append(v)
+            tails_indices.append(n)
+        else:
+            tails[k] = v
+            tails_indices[k] = n
+        prev_indices[n] = tails_indices[k - 1] if k > 0 else None
+
+    indices, n = set(), tails_indices[-1] if tails_indices else None
+    while n is not None:
+        indices.add(n)
+        n = prev_indices[n]
+    return indices
+
+
+def _unfreeze(data):
+    """
+    Returns a copy of data with all mappings converted to dictionaries and all sequences
+    converted to lists (used to compare items that may be read-only views or contain tuples).
+    """
+    if isinstance(data, Mapping):
+        return {k: _unfreeze(v) for k, v in data.items()}
+    elif isinstance(data, (list, tuple)):
+        return [_unfreeze(_) for _ in data]
+    return data
+
+
+def _freeze(data):
+    """
+    Returns read-only version of data: dictionaries are converted to read-only mappings
+    (``types.MappingProxyType``) and lists are converted to tuples.
+    """
+    if isinstance(data, Mapping):
+        return MappingProxyType({k: _freeze(v) for k, v in data.items()})
+    elif isinstance(data, (list, tuple)):
+        return tuple(_freeze(_) for _ in data)
+    return data
+
+
+class _SharedStatusCache:
+    """
+    Cache of RE Manager status shared by API instances connected to the same RE Manager. The status
+    loaded by one instance is reused by other instances until it expires. Status (or the exception
+    raised while loading status) is cached separately for each authorization identity, since
+    the status may be accessible only to some users. Status is loaded by one instance at a time
+    (``lock_load`` and ``get_lock_async()`` are used for synchronization), so the instances that
+    simultaneously need the status are waiting for a single request to complete.
+
+    The instances do not run a separate poller. Instead, each newly loaded status is passed to
+    the status engines of the other instances with the same identity (see ``add_listener()``).
+    The engines process the status as if it was polled and reschedule their next poll, so
+    the instance that is due first polls RE Manager on behalf of all instances and the server
+    receives a single stream of 'status' requests per identity.
+    """
+
+    def __init__(self):
+        self.ref_count = 0
+        self.lock_load = threading.Lock()
+        self._locks_async = weakref.WeakKeyDictionary()  # Event loop -> asyncio.Lock
+        self._entries = {}  # Identity -> (status, exception, timestamp, generation)
+        # Incremented each time the cache is invalidated
+        self.generation = 0
+        # API instances notified when new status is loaded. The registry does not keep the instances alive.
+        self._listeners = weakref.WeakSet()
+        self._lock = threading.Lock()
+
+    def add_listener(self, api):
+        """
+        Register the API instance, which is notified (``api._status_cache_updated(identity)``)
+        each time the status is loaded by other instance.
+        """
+        with self._lock:
+            self._listeners.add(api)
+
+    def remove_listener(self, api):
+        """
+        Unregister the API instance. The function does nothing if the instance is not registered.
+        """
+        with self._lock:
+            self._listeners.discard(api)
+
+    def get_lock_async(self):
+        """
+        Returns the lock for the running event loop.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if loop not in self._locks_async:
+                self._locks_async[loop] = asyncio.Lock()
+            return self._locks_async[loop]
+
+    def get(self, identity, *, max_age):
+        """
+        Returns the tuple ``(status, exception, timestamp, generation)`` if the cached status
+        is not older than ``max_age`` or ``None`` otherwise.
+        """
+        with self._lock:
+            entry = self._entries.get(identity, None)
+        if entry and (0 <= ttime.time() - entry[2] <= max_age):
+            return entry
+        return None
+
+    def set(self, identity, *, status, exception, generation, source=None):
+        """
+        Save status (or the exception) to the cache. Returns the tuple ``(status, exception, timestamp,
+        generation)``. The status is not saved if the cache was invalidated since the request was sent
+        (``generation`` is the value of ``self.generation`` before the request was sent). Successfully
+        loaded status is passed to all registered listeners except ``source`` (the instance that
+        loaded the status).
+        """
+        entry = (status, exception, ttime.time(), generation)
+        listeners = []
+        with self._lock:
+            if generation == self.generation:
+                self._entries[identity] = entry
+                if exception is None:
+                    listeners = [_ for _ in self._listeners if _ is not source]
+        for api in listeners:
+            api._status_cache_updated(identity)
+        return entry
+
+    def invalidate(self):
+        """
+        Remove status for all identities from the cache.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.generation += 1
+
+
+# Status caches shared by API instances: (protocol, address) -> _SharedStatusCache
+_shared_status_caches = {}
+_shared_status_caches_lock = threading.Lock()
+
+
+def _shared_status_cache_acquire(key):
+    """
+    Returns the cache for the key and increments the reference count. A new private cache
+    is returned if ``key`` is ``None``.
+    """
+    if key is None:
+        return _SharedStatusCache()
+    with _shared_status_caches_lock:
+        if key not in _shared_status_caches:
+            _shared_status_caches[key] = _SharedStatusCache()
+        cache = _shared_status_caches[key]
+        cache.ref_count += 1
+        return cache
+
+
+def _shared_status_cache_release(key):
+    """
+    Decrements the reference count of the cache. The cache is removed once it is released
+    by the last API instance.
+    """
+    if key is None:
+        return
+    with _shared_status_caches_lock:
+        cache = _shared_status_caches.get(key, None)
+        if cache is not None:
+            cache.ref_count -= 1
+            if cache.ref_count <= 0:
+                _shared_status_caches.pop(key)
 
 
 class WaitTimeoutError(TimeoutError):
@@ -101,6 +323,8 @@ class WaitMonitor:
         self._time_start = 0
         self._timeout = 0
         self._cancel_callbacks = []
+        # Internal callbacks, which are called when timeout is modified
+        self._timeout_callbacks = []
 
         self._wait_cancelled = False
 
@@ -130,6 +354,11 @@ class WaitMonitor:
         Modify timeout for the current operation (seconds).
         """
         self._timeout = timeout
+        for cb in self._timeout_callbacks:
+            try:
+                cb()
+            except Exception:
+                pass
 
     def add_cancel_callback(self, cancel_callback):
         """
@@ -161,19 +390,143 @@ class WaitMonitor:
         return self._wait_cancelled
 
 
+class _WaitCallback:
+    """
+    Callback for a single 'wait' operation. The callback holds the condition, the monitor and
+    the deadline of the operation and sets the completion flags. The function ``on_completed``
+    is called once the operation is completed (the condition is satisfied, timeout occurred
+    or the operation is cancelled).
+    """
+
+    def __init__(self, *, condition, monitor, on_completed):
+        self.condition = condition
+        self.monitor = monitor
+        self.on_completed = on_completed
+
+        self.timeout_occurred = False
+        self.wait_cancelled = False
+
+        # The deadline used for ordering of callbacks in the heap
+        self.deadline = self.get_deadline()
+
+    def get_deadline(self):
+        """
+        Returns the current deadline of the operation. The deadline changes if the timeout
+        is modified using the monitor.
+        """
+        return self.monitor.time_start + self.monitor.timeout
+
+    def check_status(self, status):
+        """
+        Check if the status satisfies the condition. Returns ``True`` if the operation is completed.
+        """
+        if self.condition(status) if status else False:
+            self.on_completed()
+            return True
+        return self.check_timeout()
+
+    def check_timeout(self):
+        """
+        Check if the timeout occurred or the operation was cancelled. Returns ``True``
+        if the operation is completed.
+        """
+        if ttime.time() >= self.get_deadline():
+            self.timeout_occurred = True
+        elif self.monitor.is_cancelled:
+            self.wait_cancelled = True
+        else:
+            return False
+        self.on_completed()
+        return True
+
+
+class _ItemAddBatch:
+    """
+    Items submitted by concurrent ``item_add`` calls with identical parameters in the batching mode.
+    The items are sent to RE Manager in a single ``queue_item_add_batch`` request. The first caller
+    sends the request and sets ``event_done`` once per-item responses are ready. If the batch is
+    rejected, then ``responses`` remains ``None`` and the items should be submitted individually.
+    """
+
+    def __init__(self, *, key, request_params, event_closed, event_done):
+        self.key = key
+        self.request_params = request_params
+        # Sequential requests with 'pos="front"' or 'after_uid' insert each item before the previous one
+        self.reversed = (request_params.get("pos", None) == "front") or ("after_uid" in request_params)
+        self.items = []
+        self.responses = None
+        self.exception = None
+        self.event_closed = event_closed  # Set to send the batch without waiting for the end of the window
+        self.event_done = event_done
+
+    def add(self, item):
+        """
+        Add an item to the batch. Returns the index of the item in the batch.
+        """
+        self.items.append(item)
+        return len(self.items) - 1
+
+    def prepare_request(self):
+        """
+        Returns parameters of ``queue_item_add_batch`` request.
+        """
+        request_params = {k: v for k, v in self.request_params.items() if k != "item"}
+        request_params["items"] = self.items[::-1] if self.reversed else self.items
+        return request_params
+
+    def process_response(self, response):
+        """
+        Generate responses for individual ``item_add`` calls.
+        """
+        if response["success"] is True:
+            items = response["items"][::-1] if self.reversed else response["items"]
+            self.responses = [{"success": True, "msg": "", "qsize": response["qsize"], "item": _} for _ in items]
+
+
 class API_Base:
     WaitTimeoutError = WaitTimeoutError
     WaitCancelError = WaitCancelError
 
-    def __init__(self, *, status_expiration_period, status_polling_period):
+    def __init__(self, *, status_expiration_period, status_polling_period, status_polling_period_min):
 
         self._status_expiration_period = status_expiration_period  # seconds
+        # The polling period is adjusted between the minimum and the maximum value
         self._status_polling_period = status_polling_period  # seconds
+        self._status_polling_period_min = min(status_polling_period_min, status_polling_period)  # seconds
+        self._status_polling_period_current = self._status_polling_period
 
         self._status_timestamp = None
+        self._status_generation = None  # Generation of the shared cache when the status was loaded
         self._status_current = None
         self._status_exception = None
 
+        # Status cache shared with other API instances connected to the same RE Manager
+        self._status_cache_key = self._get_status_cache_key()
+        self._status_cache = _shared_status_cache_acquire(self._status_cache_key)
+
+        # Time of the next scheduled status poll (only while 'wait' operations are pending)
+        self._status_next_poll_time = None
+        # Set if the status was loaded by other API instance and needs to be processed without polling
+        self._status_cache_update_pending = False
+        # The number of times the status engine was woken up (used for diagnostics and testing)
+        self._status_engine_iterations = 0
+
+        # Callbacks for pending 'wait' operations. The dictionary is used as an ordered set.
+        self._wait_cb = {}
+        # Callbacks that did not check the condition yet
+        self._wait_cb_new = []
+        # Heap of (deadline, counter, callback). Entries for completed callbacks and outdated
+        #   deadlines are discarded when they reach the top of the heap.
+        self._wait_cb_deadlines = []
+        self._wait_cb_counter = itertools.count()
+        # Callbacks that need to be checked for timeout or cancellation at the next iteration
+        self._wait_cb_recheck = []
+
+        # Status subscribers: callback -> [watched fields (set or None), last status passed to the callback]
+        self._status_subscribers = {}
+        # Set if a subscriber was added and the status needs to be loaded without waiting for the next poll
+        self._status_subscribers_new = False
+
         self._user = "Queue Server API User"  # Meaningful user name should be set in application code.
         self._user_group = "admin"
 
@@ -199,6 +552,233 @@ class API_Base:
         self._default_lock_key_path = os.path.join(Path.home(), ".config", "qserver", "default_lock_key.txt")
         self._enable_locked_api = False
 
+        self._prefetch_enabled = False
+
+        # Directory for persistent cache of lists of plans and devices (disabled if None)
+        self._persistent_cache_dir = None
+
+        self._readonly_responses = False
+        # Read-only views of cached data: name -> (cached data, read-only view)
+        self._readonly_views = {}
+
+        # Time window for coalescing of 'item_add' requests (batching is disabled if None)
+        self._item_add_batching_window = None
+        # The batch that is currently collecting items
+        self._item_add_batch = None
+
+    def _copy_response_data(self, name, data):
+        """
+        Returns a deep copy of cached data. If read-only responses are enabled, returns a read-only
+        view of the data instead. The view is created once each time the cached data is replaced
+        and then shared by all responses.
+        """
+        if not self._readonly_responses:
+            return copy.deepcopy(data)
+        view = self._readonly_views.get(name, None)
+        if (view is None) or (view[0] is not data):
+            view = (data, _freeze(data))
+            self._readonly_views[name] = view
+        return view[1]
+
+    def _item_add_batch_key(self, request_params):
+        """
+        Returns the key used to find ``item_add`` requests that could be combined in a batch or
+        ``None`` if the request can not be combined with other requests. Requests with integer
+        ``pos`` are not combined, because each item is inserted at the same index.
+        """
+        if request_params.get("pos", "back") not in ("front", "back"):
+            return None
+        key = {k: v for k, v in request_params.items() if k != "item"}
+        key.setdefault("pos", "back")
+        return key
+
+    def _item_add_batch_close(self):
+        """
+        Send the pending batch without waiting for the end of the time window.
+        """
+        batch = self._item_add_batch
+        if batch is not None:
+            batch.event_closed.set()
+
+    @contextlib.contextmanager
+    def batching(self, *, window=default_item_add_batching_window):
+        """
+        Context manager that enables coalescing of ``item_add`` requests. Concurrent ``item_add``
+        calls (from multiple threads or asyncio tasks) with identical parameters ``pos``, ``before_uid``,
+        ``after_uid``, ``user``, ``user_group`` and ``lock_key`` made within the time ``window``
+        from the first call are combined and sent to RE Manager in a single ``queue_item_add_batch``
+        request. Each call waits for the batch to be processed and returns the same response as
+        regular ``item_add`` would return. If the batch is rejected (e.g. one of the items does not
+        pass validation), the items are resubmitted individually, so that each caller receives its
+        own result. The items are inserted in the queue in the order of the calls. Requests with
+        integer values of ``pos`` are not combined.
+
+        The context manager may be used with both synchronous and asynchronous API. Coalescing
+        does not speed up sequential calls, which wait for completion of the previous request.
+
+        Parameters
+        ----------
+        window: float
+            Time window in seconds. Default: 0.05 s.
+
+        Examples
+        --------
+
+        .. code-block:: python
+
+            # Synchronous code (0MQ, HTTP)
+            with RM.batching(window=0.05):
+                with concurrent.futures.ThreadPoolExecutor(max_workers=20) as executor:
+                    responses = list(executor.map(RM.item_add, plans))
+
+            # Asynchronous code (0MQ, HTTP)
+            with RM.batching(window=0.05):
+                responses = await asyncio.gather(*[RM.item_add(_) for _ in plans])
+        """
+        if not isinstance(window, (int, float)) or isinstance(window, bool) or (window < 0):
+            raise ValueError(f"Parameter 'window' must be a non-negative number: window={window!r}")
+
+        window_prev, self._item_add_batching_window = self._item_add_batching_window, window
+        try:
+            yield
+        finally:
+            self._item_add_batching_window = window_prev
+            self._item_add_batch_close()
+
+    def _prefetch_methods(self, status, diff):
+        """
+        Returns the list of names of API that need to be called to prefetch the data with changed UIDs.
+        """
+        methods = []
+        for field, (method, uid_attr) in _prefetch_api_methods.items():
+            if (field in diff) and (status.get(field, None) != getattr(self, uid_attr)):
+                methods.append(method)
+        return methods
+
+    @property
+    def prefetch_enabled(self):
+        """
+        Enable/disable background prefetching of cached data (*boolean*, default: ``False``).
+        If enabled, RE Manager status is periodically polled and the queue, history, the list of runs
+        and lock info are loaded in the background as soon as the respective UIDs
+        (``plan_queue_uid``, ``plan_history_uid``, ``run_list_uid`` and ``lock_info_uid``)
+        are changed, so that ``queue_get``, ``history_get``, ``re_runs`` and ``lock_info`` API
+        return the cached data without waiting for the server. The data is prefetched by the
+        background thread (task) that calls status subscribers (see ``subscribe_status``).
+
+        Raises
+        ------
+        TypeError
+            Attempt to set to a value of non-boolean type.
+        """
+        return self._prefetch_enabled
+
+    @prefetch_enabled.setter
+    def prefetch_enabled(self, prefetch_enabled):
+        if not isinstance(prefetch_enabled, bool):
+            raise TypeError("The property may be set only to boolean values")
+        if prefetch_enabled != self._prefetch_enabled:
+            self._prefetch_enabled = prefetch_enabled
+            self._prefetch_set_subscription(prefetch_enabled)
+
+    def _prefetch_set_subscription(self, enable):
+        raise NotImplementedError()
+
+    def _persistent_cache_file(self, resource, *, user_group):
+        """
+        Returns the path to the file of the persistent cache. The file name is based on the server
+        address and, for the lists of allowed plans and devices, on the user group and authorization.
+        """
+        key = [resource, self._get_status_cache_key()]
+        if user_group is not None:
+            key.extend([user_group, self._get_status_cache_identity()])
+        key_hash = hashlib.sha256(repr(key).encode("utf-8")).hexdigest()[:32]
+        return os.path.join(self._persistent_cache_dir, f"{resource}-{key_hash}.json.gz")
+
+    def _persistent_cache_save(self, resource, response, *, uid, user_group=None):
+        """
+        Save the response to the persistent cache. Errors are ignored.
+        """
+        if not self._persistent_cache_dir:
+            return
+        try:
+            file_path = self._persistent_cache_file(resource, user_group=user_group)
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            # Write to a temporary file first, so that other processes never load an incomplete file
+            tmp_path = f"{file_path}.{secrets.token_hex(4)}.tmp"
+            with gzip.open(tmp_path, "wt", encoding="utf-8", compresslevel=1) as f:
+                json.dump({"uid": uid, "response": response}, f)
+            os.replace(tmp_path, file_path)
+        except Exception:
+            pass
+
+    def _persistent_cache_restore(self, resource, *, uid, user_group=None):
+        """
+        Load the response with matching UID from the persistent cache and process it as if it was
+        received from the server. Returns ``True`` if the data was loaded.
+        """
+        if not self._persistent_cache_dir:
+            return False
+        try:
+            file_path = self._persistent_cache_file(resource, user_group=user_group)
+            with gzip.open(file_path, "rt", encoding="utf-8") as f:
+                data = json.load(f)
+            if data["uid"] != uid:
+                return False
+            kwargs = {"user_group": user_group} if (user_group is not None) else {}
+            getattr(self, f"_process_response_{resource}")(data["response"], persist=False, **kwargs)
+        except Exception:
+            return False
+        return True
+
+    @property
+    def persistent_cache_dir(self):
+        """
+        Get/set the directory for the persistent cache (*str* or ``None``, default: ``None``).
+        The persistent cache is disabled if the directory is ``None``. If enabled, the lists of
+        existing and allowed plans and devices (returned by ``plans_existing``, ``devices_existing``,
+        ``plans_allowed`` and ``devices_allowed`` API) are saved to compressed JSON files each time
+        they are loaded from the server. If the respective UID in the status of RE Manager matches
+        the UID of the saved data, the data is loaded from disk instead of the server, which
+        reduces startup time for applications that need the lists. The files are separate for
+        each server address and, for the lists of allowed plans and devices, for each user group
+        and authorization key.
+        """
+        return self._persistent_cache_dir
+
+    @persistent_cache_dir.setter
+    def persistent_cache_dir(self, persistent_cache_dir):
+        if persistent_cache_dir is not None:
+            if not isinstance(persistent_cache_dir, (str, os.PathLike)):
+                raise TypeError(f"Invalid type of the cache directory path: {type(persistent_cache_dir)!r}")
+            persistent_cache_dir = os.path.expanduser(os.fspath(persistent_cache_dir))
+        self._persistent_cache_dir = persistent_cache_dir
+
+    @property
+    def readonly_responses(self):
+        """
+        Enable/disable read-only responses (*boolean*, default: ``False``). By default, the API
+        that return cached data (``status``, ``queue_get``, ``history_get``, ``plans_allowed``,
+        ``devices_allowed``, ``plans_existing``, ``devices_existing``, ``re_runs`` and ``lock_info``)
+        return deep copies of the data, which could be slow for large data sets (e.g. long history).
+        If read-only responses are enabled, the data is returned as read-only views (dictionaries
+        are represented as ``types.MappingProxyType`` and lists as tuples), which share memory with
+        the cache. Responses to requests that were sent to the server (cache misses) are not converted.
+
+        Raises
+        ------
+        TypeError
+            Attempt to set to a value of non-boolean type.
+        """
+        return self._readonly_responses
+
+    @readonly_responses.setter
+    def readonly_responses(self, readonly_responses):
+        if not isinstance(readonly_responses, bool):
+            raise TypeError("The property may be set only to boolean values")
+        self._readonly_responses = readonly_responses
+        self._readonly_views.clear()
+
     def _check_name(self, name, name_in_msg):
         if not isinstance(name, str):
             raise ValueError(f"{name_in_msg} {name!r} is not a string: type {type(name)!r}")
@@ -241,11 +821,278 @@ class API_Base:
         """
         self.user = getpass.getuser()
 
+    def _get_status_cache_key(self):
+        """
+        Returns the key used to share status cache between API instances or ``None`` if the cache
+        should not be shared. The function is overridden in the classes that implement communication.
+        """
+        return None
+
+    def _get_status_cache_identity(self):
+        """
+        Returns the authorization identity (hashable) used to separate status cached by
+        API instances with different authorization.
+        """
+        return None
+
+    def _release_status_cache(self):
+        """
+        Release the shared status cache. The function is called when the API is closed.
+        """
+        self._status_cache.remove_listener(self)
+        key, self._status_cache_key = self._status_cache_key, None
+        _shared_status_cache_release(key)
+
+    def _wake_status_engine(self):
+        """
+        Wake up the status engine. The function may be called from any thread. The function is
+        overridden in the classes that implement the status engine.
+        """
+        raise NotImplementedError()
+
+    def _status_cache_updated(self, identity):
+        """
+        Called by the shared status cache (possibly from other thread or event loop) when the status
+        was loaded by other API instance. The status is processed by the status engine if it is polling
+        the status, so the instance does not send its own request.
+        """
+        if identity == self._get_status_cache_identity():
+            self._status_cache_update_pending = True
+            self._wake_status_engine()
+
+    def _is_status_expired(self):
+        """
+        Returns ``True`` if the status needs to be reloaded: the status was never loaded, expired,
+        the shared cache was invalidated (possibly by other API instance) since the status was loaded
+        or the shared cache contains newer status loaded by other API instance.
+        """
+        if not self._status_timestamp or (self._status_generation != self._status_cache.generation):
+            return True
+        dt = ttime.time() - self._status_timestamp
+        if (dt < 0) or (dt > self._status_expiration_period):
+            return True
+        entry = self._status_cache.get(self._get_status_cache_identity(), max_age=self._status_expiration_period)
+        return (entry is not None) and (entry[2] > self._status_timestamp)
+
+    def _invalidate_status(self):
+        """
+        Invalidate local and shared status cache, so that status is reloaded from the server next time
+        it is requested.
+        """
+        self._status_timestamp = None
+        self._status_cache.invalidate()
+
     def _clear_status_timestamp(self):
         """
         Clearing status timestamp causes status to be reloaded from the server next time it is requested.
+        The function is called by API that are expected to change the state of RE Manager, so the status
+        is polled with the minimum period for a while.
         """
-        self._status_timestamp = None
+        self._invalidate_status()
+        self._status_polling_period_current = self._status_polling_period_min
+
+    def _adjust_status_polling_period(self, status_prev, status):
+        """
+        Adjust the status polling period based on the newly loaded status. The minimum polling
+        period is used while RE Manager is in transitional state or if the status was changed.
+        Otherwise the polling period is exponentially increased up to the maximum value.
+        """
+        if not isinstance(status, Mapping):
+            return
+        if (status.get("manager_state", None) in _transitional_manager_states) or (status != status_prev):
+            self._status_polling_period_current = self._status_polling_period_min
+        else:
+            self._status_polling_period_current = min(
+                self._status_polling_period_current * 2, self._status_polling_period
+            )
+
+    def _status_engine_timeout(self):
+        """
+        Returns the time (in seconds) until the next status poll or the nearest deadline of
+        a 'wait' operation or ``None`` if no 'wait' operations are pending, there are no status
+        subscribers and the status engine may sleep until it is explicitly woken up. The function
+        must be called with the lock that protects the list of 'wait' callbacks.
+        """
+        if not self._wait_cb:
+            self._wait_cb_deadlines.clear()
+        if not self._wait_cb and not self._status_subscribers:
+            self._status_next_poll_time = None
+            return None
+        t = ttime.time()
+        t_next = t + self._status_polling_period_current
+        # The next poll may be rescheduled earlier if the polling period was decreased
+        if (self._status_next_poll_time is None) or (self._status_next_poll_time > t_next):
+            self._status_next_poll_time = t_next
+        t_wakeup = self._status_next_poll_time
+        if self._wait_cb_deadlines:
+            t_wakeup = min(t_wakeup, self._wait_cb_deadlines[0][0])
+        return max(t_wakeup - t, 0)
+
+    def _wait_cb_add(self, wait_cb):
+        """
+        Register the callback for a 'wait' operation. The function must be called with the lock
+        that protects the list of 'wait' callbacks.
+        """
+        self._wait_cb[wait_cb] = None
+        self._wait_cb_new.append(wait_cb)
+        self._wait_cb_schedule(wait_cb)
+
+    def _wait_cb_schedule(self, wait_cb):
+        """
+        Push the current deadline of the callback to the heap. The function must be called with the lock
+        that protects the list of 'wait' callbacks.
+        """
+        wait_cb.deadline = wait_cb.get_deadline()
+        heapq.heappush(self._wait_cb_deadlines, (wait_cb.deadline, next(self._wait_cb_counter), wait_cb))
+
+    def _wait_cb_remove(self, wait_cb):
+        """
+        Remove the callback for a 'wait' operation if it is registered. The heap entries are discarded
+        lazily. The function must be called with the lock that protects the list of 'wait' callbacks.
+        """
+        self._wait_cb.pop(wait_cb, None)
+
+    def _wait_cb_process(self, *, status_loaded, status_changed):
+        """
+        Process callbacks for 'wait' operations. The conditions are checked only for the new callbacks
+        and, if the status was changed, for all pending callbacks. Timeouts are processed in the order
+        of deadlines. The function must be called with the lock that protects the list of
+        'wait' callbacks.
+
+        Parameters
+        ----------
+        status_loaded: boolean
+            Indicates if the status was loaded (or found not expired) during the current iteration.
+            Conditions are checked only using up-to-date status.
+        status_changed: boolean
+            Indicates if the loaded status differs from the previously loaded status.
+        """
+        if status_loaded:
+            wait_cbs = list(self._wait_cb) if status_changed else self._wait_cb_new
+            for wait_cb in wait_cbs:
+                if (wait_cb in self._wait_cb) and wait_cb.check_status(self._status_current):
+                    self._wait_cb_remove(wait_cb)
+            self._wait_cb_new = []
+
+        # Callbacks for the operations that were cancelled or had timeout modified
+        while self._wait_cb_recheck:
+            wait_cb = self._wait_cb_recheck.pop()
+            if wait_cb not in self._wait_cb:
+                continue
+            if wait_cb.check_timeout():
+                self._wait_cb_remove(wait_cb)
+            elif wait_cb.get_deadline() != wait_cb.deadline:
+                self._wait_cb_schedule(wait_cb)
+
+        # Callbacks with expired deadlines
+        t = ttime.time()
+        while self._wait_cb_deadlines and (self._wait_cb_deadlines[0][0] <= t):
+            deadline, _, wait_cb = heapq.heappop(self._wait_cb_deadlines)
+            if (wait_cb not in self._wait_cb) or (deadline != wait_cb.deadline):
+                continue
+            if wait_cb.check_timeout():
+                self._wait_cb_remove(wait_cb)
+            else:
+                # The timeout was extended
+                self._wait_cb_schedule(wait_cb)
+
+    def _status_engine_poll_due(self):
+        """
+        Returns ``True`` if the status needs to be polled for pending 'wait' operations or
+        status subscribers. The next
+        poll is scheduled once the status is processed, since the polling period depends on
+        the loaded status. The function must be called with the lock that protects the list of
+        'wait' callbacks.
+        """
+        if not self._wait_cb and not self._status_subscribers:
+            self._status_cache_update_pending = False
+            return False
+        # New 'wait' operations check the condition and new subscribers receive the status
+        #   without waiting for the next scheduled poll. The status loaded by other API instance
+        #   is processed immediately and the next poll is rescheduled.
+        if self._wait_cb_new or self._status_subscribers_new or self._status_cache_update_pending:
+            self._status_subscribers_new = False
+            self._status_cache_update_pending = False
+            self._status_next_poll_time = None
+            return True
+        if self._status_next_poll_time is None:
+            return False
+        if ttime.time() < self._status_next_poll_time:
+            return False
+        self._status_next_poll_time = None
+        return True
+
+    def _prepare_subscribe_status(self, *, callback, fields):
+        """
+        Check parameters of ``subscribe_status`` API. Returns the set of watched fields or ``None``.
+        """
+        if not callable(callback):
+            raise TypeError(f"Callback must be callable: type(callback)={type(callback)!r}")
+        if fields is not None:
+            if isinstance(fields, str):
+                fields = [fields]
+            if not isinstance(fields, Iterable):
+                raise TypeError(f"Parameter 'fields' must be iterable or None: type(fields)={type(fields)!r}")
+            fields = set(fields)
+            for field in fields:
+                if not isinstance(field, str):
+                    raise TypeError(f"Field names must be strings: field={field!r}")
+        return fields
+
+    def _status_subscriber_add(self, callback, fields):
+        """
+        Add a status subscriber (or replace the fields of the existing subscriber). The subscriber
+        receives the full status at the next iteration of the status engine. The function must be
+        called with the lock that protects the list of 'wait' callbacks.
+        """
+        self._status_subscribers[callback] = [fields, None]
+        self._status_subscribers_new = True
+
+    def _status_subscriber_remove(self, callback):
+        """
+        Remove a status subscriber. Returns ``True`` if the subscriber was found. The function must be
+        called with the lock that protects the list of 'wait' callbacks.
+        """
+        return self._status_subscribers.pop(callback, None) is not None
+
+    @staticmethod
+    def _status_diff(status_prev, status, fields):
+        """
+        Returns a dictionary of changed status fields: ``{<field>: (<previous value>, <new value>)}``.
+        Only the fields from the set ``fields`` are compared unless ``fields`` is ``None``. If
+        ``status_prev`` is ``None``, all the fields are considered changed.
+        """
+        status_prev = status_prev or {}
+        keys = fields if fields is not None else set(status_prev) | set(status)
+        diff = {}
+        for k in keys:
+            in_prev, in_current = (k in status_prev), (k in status)
+            if not in_prev and not in_current:
+                continue
+            if (in_prev != in_current) or (status_prev[k] != status[k]):
+                diff[k] = (status_prev.get(k, None), status.get(k, None))
+        return diff
+
+    def _status_subscribers_process(self):
+        """
+        Compare the current status with the status previously passed to each subscriber. Returns
+        the list of ``(callback, status, diff)`` tuples for the subscribers with changed watched fields.
+        The callbacks should be called by the caller without holding the lock. The function must be
+        called with the lock that protects the list of 'wait' callbacks.
+        """
+        status = self._status_current
+        if not self._status_subscribers or not isinstance(status, Mapping):
+            return []
+        notifications = []
+        for callback, subscription in self._status_subscribers.items():
+            fields, status_prev = subscription
+            if status is status_prev:
+                continue
+            diff = self._status_diff(status_prev, status, fields)
+            subscription[1] = status
+            if diff:
+                notifications.append((callback, copy.deepcopy(status), copy.deepcopy(diff)))
+        return notifications
 
     def _get_user_group_for_allowed_plans_devices(self, *, user_group):
         """
@@ -321,6 +1168,152 @@ class API_Base:
         self._add_lock_key(request_params, lock_key)
         return request_params
 
+    def _split_item_add_batch(self, request_params, *, chunk_size):
+        """
+        Split the batch in chunks for ``item_add_batch`` operation. Returns ``None`` if the batch
+        should be sent in a single request.
+        """
+        if chunk_size is None:
+            return None
+        if not isinstance(chunk_size, int) or isinstance(chunk_size, bool) or (chunk_size < 1):
+            raise ValueError(f"Parameter 'chunk_size' must be a positive integer: chunk_size={chunk_size!r}")
+        items = request_params["items"]
+        if len(items) <= chunk_size:
+            return None
+        return [items[n : n + chunk_size] for n in range(0, len(items), chunk_size)]
+
+    def _prepare_item_add_batch_chunk(self, request_params, *, items, after_uid):
+        """
+        Prepare parameters for adding a chunk of the batch. The first chunk is inserted at
+        the requested position, the following chunks are inserted after the last item of
+        the previous chunk.
+        """
+        request_params = request_params.copy()
+        request_params["items"] = items
+        if after_uid is not None:
+            request_params.pop("pos", None)
+            request_params.pop("before_uid", None)
+            request_params["after_uid"] = after_uid
+        return request_params
+
+    def _combine_item_add_batch_responses(self, responses, *, chunks):
+        """
+        Combine responses for the chunks of the batch into the response of ``item_add_batch``.
+        Processing of chunks stops once a chunk is rejected, so the items of the remaining chunks
+        are included in the response as not submitted.
+        """
+        success = all([_["success"] for _ in responses])
+        msg, items, results = "", [], []
+        for n, (response, chunk) in enumerate(zip(responses, chunks)):
+            items.extend(response.get("items", None) or chunk)
+            results.extend(
+                response.get("results", None) or [{"success": response["success"], "msg": ""}] * len(chunk)
+            )
+            if not response["success"]:
+                n_added = sum([len(_) for _ in chunks[:n]])
+                msg = (
+                    f"Chunk #{n + 1} of {len(chunks)} was rejected ({n_added} items were added "
+                    f"to the queue): {response['msg']}"
+                )
+        for chunk in chunks[len(responses) :]:
+            items.extend(chunk)
+            results.extend([{"success": False, "msg": "The item was not submitted"}] * len(chunk))
+        return {
+            "success": success,
+            "msg": msg,
+            "qsize": responses[-1]["qsize"],
+            "items": items,
+            "results": results,
+        }
+
+    def _prepare_queue_sync(self, *, current_items, desired_items, user, user_group, lock_key):
+        """
+        Compute the list of operations that transform the current queue into the desired queue.
+        Items of the desired queue with UIDs of existing items are matched with the existing items.
+        Items are removed, updated (if the parameters are changed), moved and added in this order.
+        Items that are already in the correct order (the longest common subsequence of the current
+        and the desired queue) are not moved. The remaining items are moved and added in groups
+        of consecutive items.
+        """
+        if not isinstance(desired_items, Iterable):
+            raise TypeError(f"Parameter 'desired_items' must be iterable: type={type(desired_items)!r}")
+
+        items = []
+        for n, item in enumerate(desired_items):
+            if not isinstance(item, BItem) and not isinstance(item, Mapping):
+                raise TypeError(
+                    f"Incorrect type {type(item)!r} if item #{n} ({item!r}). Expected type: 'BItem' or 'dict'"
+                )
+            items.append(item.to_dict() if isinstance(item, BItem) else _unfreeze(item))
+
+        current_uids = [_["item_uid"] for _ in current_items]
+        current_positions = {uid: n for n, uid in enumerate(current_uids)}
+        current_by_uid = {_["item_uid"]: _ for _ in current_items}
+
+        # UIDs of the desired items (None for new items)
+        desired_uids = [_.get("item_uid", None) for _ in items]
+        desired_uids = [_ if _ in current_positions else None for _ in desired_uids]
+        kept_uids = [_ for _ in desired_uids if _ is not None]
+        if len(set(kept_uids)) != len(kept_uids):
+            raise ValueError("The list of desired items contains repeated item UIDs")
+
+        common_params = {}
+        self._add_request_param(common_params, "user", user)
+        self._add_request_param(common_params, "user_group", user_group)
+        self._add_request_param(common_params, "lock_key", lock_key)
+
+        def item_content(item):
+            return {k: _unfreeze(item.get(k, None)) or None for k in _queue_sync_item_fields}
+
+        # 'item_remove_batch' and 'item_move_batch' do not accept user information
+        lock_params = {k: v for k, v in common_params.items() if k == "lock_key"}
+
+        operations = []
+
+        kept_uids_set = set(kept_uids)
+        removed_uids = [_ for _ in current_uids if _ not in kept_uids_set]
+        if removed_uids:
+            operations.append({"method": "item_remove_batch", "params": {"uids": removed_uids, **lock_params}})
+
+        for uid, item in zip(desired_uids, items):
+            if (uid is not None) and (item_content(item) != item_content(current_by_uid[uid])):
+                item = {k: v for k, v in item.items() if k not in ("user", "user_group")}
+                operations.append({"method": "item_update", "params": {"item": item, **common_params}})
+
+        # Items in the longest common subsequence remain in place
+        lis = _longest_increasing_subsequence([current_positions[_] for _ in kept_uids])
+        fixed_uids = {kept_uids[_] for _ in lis}
+
+        def find_groups(is_selected, values):
+            # Groups of consecutive selected elements and UIDs of the preceding item (None at the front)
+            groups, anchor_uid, group = [], None, None
+            for uid, value in values:
+                if is_selected(uid):
+                    if group is None:
+                        group = []
+                        groups.append((anchor_uid, group))
+                    group.append(value)
+                else:
+                    group = None
+                if uid is not None:
+                    anchor_uid = uid
+            return groups
+
+        # Groups of moved items are inserted after the preceding item of the desired queue
+        for anchor_uid, group in find_groups(lambda uid: uid not in fixed_uids, [(_, _) for _ in kept_uids]):
+            dest = {"after_uid": anchor_uid} if anchor_uid else {"pos_dest": "front"}
+            operations.append({"method": "item_move_batch", "params": {"uids": group, **dest, **lock_params}})
+
+        new_items = [
+            (uid, {k: v for k, v in item.items() if k not in ("item_uid", "user", "user_group")})
+            for uid, item in zip(desired_uids, items)
+        ]
+        for anchor_uid, group in find_groups(lambda uid: uid is None, new_items):
+            dest = {"after_uid": anchor_uid} if anchor_uid else {"pos": "front"}
+            operations.append({"method": "item_add_batch", "params": {"items": group, **dest, **common_params}})
+
+        return operations
+
     def _prepare_item_update(self, *, item, replace, user, user_group, lock_key):
         """
         Prepare parameters for ``item_update`` operation.
@@ -438,6 +1431,7 @@ class API_Base:
         """
         ``queue_get``: process response
         """
+        self._stats_cache_record("queue_get", hit=False)
         if response["success"] is True:
             self._current_plan_queue = copy.deepcopy(response["items"])
             self._current_running_item = copy.deepcopy(response["running_item"])
@@ -447,12 +1441,13 @@ class API_Base:
         """
         ``queue_get``: generate response based on cached data
         """
+        self._stats_cache_record("queue_get", hit=True)
         response = {
             "success": True,
             "msg": "",
             "plan_queue_uid": self._current_plan_queue_uid,
-            "running_item": copy.deepcopy(self._current_running_item),
-            "items": copy.deepcopy(self._current_plan_queue),
+            "running_item": self._copy_response_data("running_item", self._current_running_item),
+            "items": self._copy_response_data("plan_queue", self._current_plan_queue),
         }
         return response
 
@@ -460,6 +1455,7 @@ class API_Base:
         """
         ``history_get``: process response
         """
+        self._stats_cache_record("history_get", hit=False)
         if response["success"] is True:
             self._current_plan_history = copy.deepcopy(response["items"])
             self._current_plan_history_uid = copy.deepcopy(response["plan_history_uid"])
@@ -468,11 +1464,12 @@ class API_Base:
         """
         ``history_get``: generate response based on cached data
         """
+        self._stats_cache_record("history_get", hit=True)
         response = {
             "success": True,
             "msg": "",
             "plan_history_uid": self._current_plan_history_uid,
-            "items": copy.deepcopy(self._current_plan_history),
+            "items": self._copy_response_data("plan_history", self._current_plan_history),
         }
         return response
 
@@ -492,90 +1489,118 @@ class API_Base:
     def _invalidate_plans_allowed_cache(self):
         self._current_plans_allowed.clear()
 
-    def _process_response_plans_allowed(self, response, *, user_group):
+    def _process_response_plans_allowed(self, response, *, user_group, persist=True):
         """
         ``plans_allowed``: process response
         """
+        if persist:
+            self._stats_cache_record("plans_allowed", hit=False)
         if response["success"] is True:
             if response["plans_allowed_uid"] != self._current_plans_allowed_uid:
                 self._invalidate_plans_allowed_cache()
                 self._current_plans_allowed_uid = response["plans_allowed_uid"]
             self._current_plans_allowed[user_group] = copy.deepcopy(response["plans_allowed"])
+            if persist:
+                self._persistent_cache_save(
+                    "plans_allowed", response, uid=response["plans_allowed_uid"], user_group=user_group
+                )
 
     def _generate_response_plans_allowed(self, *, user_group):
         """
         ``plans_allowed``: generate response based on cached data
         """
+        self._stats_cache_record("plans_allowed", hit=True)
         response = {
             "success": True,
             "msg": "",
             "plans_allowed_uid": self._current_plans_allowed_uid,
-            "plans_allowed": copy.deepcopy(self._current_plans_allowed[user_group]),
+            "plans_allowed": self._copy_response_data(
+                ("plans_allowed", user_group), self._current_plans_allowed[user_group]
+            ),
         }
         return response
 
     def _invalidate_devices_allowed_cache(self):
         self._current_devices_allowed.clear()
 
-    def _process_response_devices_allowed(self, response, *, user_group):
+    def _process_response_devices_allowed(self, response, *, user_group, persist=True):
         """
         ``devices_allowed``: process response
         """
+        if persist:
+            self._stats_cache_record("devices_allowed", hit=False)
         if response["success"] is True:
             if response["devices_allowed_uid"] != self._current_devices_allowed_uid:
                 self._invalidate_devices_allowed_cache()
                 self._current_devices_allowed_uid = response["devices_allowed_uid"]
             self._current_devices_allowed[user_group] = copy.deepcopy(response["devices_allowed"])
+            if persist:
+                self._persistent_cache_save(
+                    "devices_allowed", response, uid=response["devices_allowed_uid"], user_group=user_group
+                )
 
     def _generate_response_devices_allowed(self, *, user_group):
         """
         ``devices_allowed``: generate response based on cached data
         """
+        self._stats_cache_record("devices_allowed", hit=True)
         response = {
             "success": True,
             "msg": "",
             "devices_allowed_uid": self._current_devices_allowed_uid,
-            "devices_allowed": copy.deepcopy(self._current_devices_allowed[user_group]),
+            "devices_allowed": self._copy_response_data(
+                ("devices_allowed", user_group), self._current_devices_allowed[user_group]
+            ),
         }
         return response
 
-    def _process_response_plans_existing(self, response):
+    def _process_response_plans_existing(self, response, *, persist=True):
         """
         ``plans_existing``: process response
         """
+        if persist:
+            self._stats_cache_record("plans_existing", hit=False)
         if response["success"] is True:
             self._current_plans_existing = copy.deepcopy(response["plans_existing"])
             self._current_plans_existing_uid = response["plans_existing_uid"]
+            if persist:
+                self._persistent_cache_save("plans_existing", response, uid=response["plans_existing_uid"])
 
     def _generate_response_plans_existing(self):
         """
         ``plans_existing``: generate response based on cached data
         """
+        self._stats_cache_record("plans_existing", hit=True)
         response = {
             "success": True,
             "msg": "",
             "plans_existing_uid": self._current_plans_existing_uid,
-            "plans_existing": copy.deepcopy(self._current_plans_existing),
+            "plans_existing": self._copy_response_data("plans_existing", self._current_plans_existing),
         }
         return response
 
-    def _process_response_devices_existing(self, response):
+    def _process_response_devices_existing(self, response, *, persist=True):
         """
         ``devices_existing``: process response
         """
+        if persist:
+            self._stats_cache_record("devices_existing", hit=False)
         if response["success"] is True:
             self._current_devices_existing = copy.deepcopy(response["devices_existing"])
             self._current_devices_existing_uid = response["devices_existing_uid"]
+            if persist:
+                self._persistent_cache_save("devices_existing", response, uid=response["devices_existing_uid"])
 
     def _generate_response_devices_existing(self):
         """
         ``devices_existing``: generate response based on cached data
         """
+        self._stats_cache_record("devices_existing", hit=True)
         response = {
             "success": True,
             "msg": "",
             "devices_existing_uid": self._current_devices_existing_uid,
-            "devices_existing": copy.deepcopy(self._current_devices_existing),
+            "devices_existing": self._copy_response_data("devices_existing", self._current_devices_existing),
         }
         return response
 
@@ -674,20 +1699,28 @@ class API_Base:
         """
         ``re_runs``: process response
         """
+        self._stats_cache_record("re_runs", hit=False)
         if response["success"] is True:
             self._current_run_list = copy.deepcopy(response["run_list"])
             self._current_run_list_uid = response["run_list_uid"]
-            response["run_list"] = self._select_re_runs_items(option=option)
+            response["run_list"] = self._select_re_runs_items(option=option, readonly=False)
         return response
 
-    def _select_re_runs_items(self, *, option):
+    def _select_re_runs_items(self, *, option, readonly):
         """
-        ``re_runs``: select runs from the full list based on the option.
+        ``re_runs``: select runs from the full list based on the option. Returns read-only views
+        of the cached runs if ``readonly`` is ``True``.
         """
-        if option == "open":
-            run_list = [_ for _ in self._current_run_list if _["is_open"]]
+        if readonly:
+            run_list = self._copy_response_data("run_list", self._current_run_list)
+            if option == "open":
+                run_list = tuple(_ for _ in run_list if _["is_open"])
+            elif option == "closed":
+                run_list = tuple(_ for _ in run_list if not _["is_open"])
+        elif option == "open":
+            run_list = [copy.deepcopy(_) for _ in self._current_run_list if _["is_open"]]
         elif option == "closed":
-            run_list = [_ for _ in self._current_run_list if not _["is_open"]]
+            run_list = [copy.deepcopy(_) for _ in self._current_run_list if not _["is_open"]]
         else:
             run_list = copy.deepcopy(self._current_run_list)
         return run_list
@@ -696,11 +1729,12 @@ class API_Base:
         """
         ``re_runs``: generate response based on cached data
         """
+        self._stats_cache_record("re_runs", hit=True)
         response = {
             "success": True,
             "msg": "",
             "run_list_uid": self._current_run_list_uid,
-            "run_list": self._select_re_runs_items(option=option),
+            "run_list": self._select_re_runs_items(option=option, readonly=self._readonly_responses),
         }
         return response
 
@@ -819,6 +1853,7 @@ class API_Base:
         """
         ``lock_info``: process response
         """
+        self._stats_cache_record("lock_info", hit=False)
         if response["success"] is True:
             self._current_lock_info = copy.deepcopy(response["lock_info"])
             self._current_lock_info_uid = copy.deepcopy(response["lock_info_uid"])
@@ -827,11 +1862,12 @@ class API_Base:
         """
         ``lock_info``: generate response based on cached data
         """
+        self._stats_cache_record("lock_info", hit=True)
         response = {
             "success": True,
             "msg": "",
             "lock_info_uid": self._current_lock_info_uid,
-            "lock_info": copy.deepcopy(self._current_lock_info),
+            "lock_info": self._copy_response_data("lock_info", self._current_lock_info),
         }
         return response
 
@@ -146,6 +146,18 @@ _doc_REManagerAPI_ZMQ = """
         the console monitor. Default: 10000.
     console_monitor_max_lines: int
         Maximum number of lines in the internal text buffer. Default: 1000.
+    console_monitor_overflow: str
+        Policy used by the console monitor if the message queue is full:
+        ``'drop_newest'`` (new messages are discarded), ``'drop_oldest'``
+        (the oldest messages are removed from the queue), ``'block'`` (wait
+        for ``console_monitor_overflow_timeout`` until a message is read from
+        the queue, then discard the new message) or ``'coalesce'`` (the text
+        of the new message is appended to the last message in the queue).
+        The text buffer receives all messages regardless of the policy.
+        The number of dropped and coalesced messages is returned by
+        ``RM.console_monitor.msg_queue_stats``. Default: ``'drop_newest'``.
+    console_monitor_overflow_timeout: float
+        Timeout used by ``'block'`` overflow policy. Default: 1.0 s.
     zmq_public_key: str or None
         Public key of RE Manager if the encryption is enabled. Set to ``None``
         if encryption is not enabled
@@ -160,8 +172,43 @@ _doc_REManagerAPI_ZMQ = """
         Expiration period for cached RE Manager status,
         default value: 0.5 seconds
     status_polling_period: float
-        Polling period for RE Manager status used by 'wait' operations,
-        default value: 1 second
+        Maximum polling period for RE Manager status used by 'wait' operations,
+        default value: 1 second. The polling period is adaptive: the status is
+        polled with the minimum period after API calls that change the state
+        of RE Manager, while the manager is in transitional state (e.g.
+        ``'creating_environment'``) or if the status is changing. Otherwise
+        the period is doubled after each poll until it reaches the maximum value.
+    status_polling_period_min: float
+        Minimum polling period for RE Manager status used by 'wait' operations,
+        default value: 0.1 second. Set the value equal to ``status_polling_period``
+        to poll the status with constant period.
+    zmq_n_connections: int
+        Number of connections to RE Manager used for sending requests. Requests sent
+        concurrently from multiple threads (or tasks) are using different connections and
+        are not waiting for completion of the previous requests at the client side.
+        RE Manager still processes the requests sequentially, taking requests from
+        each connection in turn, so larger number of connections may increase the time
+        it takes to process a control request. Default: 1.
+    zmq_priority_connection: boolean
+        If ``True``, then an additional connection is reserved for control requests
+        (``re_pause``, ``re_stop``, ``re_abort``, ``re_halt`` and ``queue_stop``), so that
+        the requests are not delayed by slow requests, such as ``history_get``, sent from
+        other threads (or tasks). The control requests are processed by RE Manager after
+        at most one pending request from each of the other connections. Default: ``False``.
+    request_policies: dict or None, optional
+        Custom timeout and retry policies for API methods. The dictionary maps method names
+        (e.g. ``'status'``) to policies. A policy is a dictionary, which may contain
+        the following parameters: ``timeout`` - request timeout in seconds (``None`` - use
+        the value of ``timeout_recv``), ``retries`` - the maximum number of times the request
+        is repeated after timeout or communication error, ``backoff`` - the base delay between
+        attempts in seconds (doubled after each attempt and randomized by +/-50%) and
+        ``idempotent`` - indicates that the request may be safely repeated. Requests that are
+        not idempotent are never repeated. The custom policies are merged with the default
+        policies: ``ping`` and requests for reading data (e.g. ``queue_get``, ``history_get``,
+        ``plans_allowed``) are repeated up to 2 times, ``status`` is not repeated (fails fast,
+        the status is periodically reloaded). The default policies do not set timeouts.
+        See the property ``request_policies`` for the complete list of policies.
+        Default: ``None``.
 
     Examples
     --------
@@ -219,6 +266,25 @@ _doc_REManagerAPI_HTTP = """
         Default: 10000.
     console_monitor_max_lines: int
         Maximum number of lines in the internal text buffer. Default: 1000.
+    console_monitor_streaming: boolean
+        Receive console output from the streaming endpoint of HTTP Server
+        (``/api/stream_console_output``) instead of polling the server every
+        ``console_monitor_poll_period``. The stream is reopened automatically
+        if the connection is closed, the messages published while the stream was
+        disconnected are loaded from the server buffer. The monitor falls back
+        to polling if the server does not support streaming. Default: ``False``.
+    console_monitor_overflow: str
+        Policy used by the console monitor if the message queue is full:
+        ``'drop_newest'`` (new messages are discarded), ``'drop_oldest'``
+        (the oldest messages are removed from the queue), ``'block'`` (wait
+        for ``console_monitor_overflow_timeout`` until a message is read from
+        the queue, then discard the new message) or ``'coalesce'`` (the text
+        of the new message is appended to the last message in the queue).
+        The text buffer receives all messages regardless of the policy.
+        The number of dropped and coalesced messages is returned by
+        ``RM.console_monitor.msg_queue_stats``. Default: ``'drop_newest'``.
+    console_monitor_overflow_timeout: float
+        Timeout used by ``'block'`` overflow policy. Default: 1.0 s.
     request_fail_exceptions: boolean
         If ``True`` (default) then API functions that communicate with
         RE Manager are raising the ``RequestFailError`` exception if
@@ -230,8 +296,59 @@ _doc_REManagerAPI_HTTP = """
         Expiration period for cached RE Manager status,
         default value: 0.5 seconds
     status_polling_period: float
-        Polling period for RE Manager status used by 'wait' operations,
-        default value: 1 second
+        Maximum polling period for RE Manager status used by 'wait' operations,
+        default value: 1 second. The polling period is adaptive: the status is
+        polled with the minimum period after API calls that change the state
+        of RE Manager, while the manager is in transitional state (e.g.
+        ``'creating_environment'``) or if the status is changing. Otherwise
+        the period is doubled after each poll until it reaches the maximum value.
+    status_polling_period_min: float
+        Minimum polling period for RE Manager status used by 'wait' operations,
+        default value: 0.1 second. Set the value equal to ``status_polling_period``
+        to poll the status with constant period.
+    json_codec: str or tuple(callable, callable), optional
+        Codec used to encode and decode JSON payloads of requests and responses:
+        ``'orjson'``, ``'msgspec'``, ``'json'`` (standard library) or ``'auto'`` to use
+        the fastest of the installed libraries. A custom codec may be passed as a tuple
+        of functions ``(encode, decode)``, where ``encode(obj)`` returns UTF-8 encoded
+        ``bytes`` and ``decode(content)`` accepts ``bytes``. Default: ``'auto'``.
+    http_max_connections: int or None, optional
+        Maximum number of concurrent connections to the server. Requests are waiting
+        for an available connection once the limit is reached. ``None`` removes the limit.
+        Increase the limit if the application sends many concurrent requests (e.g.
+        using asynchronous API). Default: 100.
+    http_max_keepalive_connections: int or None, optional
+        Maximum number of idle connections kept open for reuse. ``None`` removes the
+        limit. Default: 20.
+    http_keepalive_expiry: float or None, optional
+        Time in seconds after which idle connections are closed. ``None`` keeps
+        idle connections open indefinitely. Default: 5.0 s.
+    http2: boolean, optional
+        Enable HTTP/2 support. With HTTP/2, concurrent requests are multiplexed over
+        a single connection if supported by the server. Requires the ``h2`` package
+        (``pip install httpx[http2]``). Default: ``False``.
+    token_refresh_margin: float or None, optional
+        The session is refreshed in the background ``token_refresh_margin`` seconds before
+        the access token expires (or after a half of the remaining lifetime of the token if
+        the lifetime is shorter), so that requests are not rejected because the token expired.
+        The expiration time is taken from ``expires_in`` field of the response to ``login``
+        or ``session_refresh`` request or from ``exp`` claim of the access token (JWT).
+        If the session could not be refreshed in advance, it is refreshed after the request
+        fails with the expired token. ``None`` disables proactive refresh. Default: 30 s.
+    request_policies: dict or None, optional
+        Custom timeout and retry policies for API methods. The dictionary maps method names
+        (e.g. ``'status'``) to policies. A policy is a dictionary, which may contain
+        the following parameters: ``timeout`` - request timeout in seconds (``None`` - use
+        the value of ``timeout``), ``retries`` - the maximum number of times the request
+        is repeated after timeout or communication error, ``backoff`` - the base delay between
+        attempts in seconds (doubled after each attempt and randomized by +/-50%) and
+        ``idempotent`` - indicates that the request may be safely repeated. Requests that are
+        not idempotent are never repeated. The custom policies are merged with the default
+        policies: ``ping`` and requests for reading data (e.g. ``queue_get``, ``history_get``,
+        ``plans_allowed``) are repeated up to 2 times, ``status`` is not repeated (fails fast,
+        the status is periodically reloaded). The default policies do not set timeouts.
+        See the property ``request_policies`` for the complete list of policies.
+        Default: ``None``.
 
     Examples
     --------
@@ -355,6 +472,114 @@ _doc_close = """
         await RM.close()
 """
 
+_doc_add_request_hooks = """
+    Add hooks that are called before and after each request sent to RE Manager (including requests
+    sent internally by the API, e.g. status requests). Each hook is a plain (non-async) function,
+    which is called with keyword arguments. The pre-request hook is called as
+    ``pre_request(method=method, params=params)``, the post-request hook is called as
+    ``post_request(method=method, params=params, response=response, exception=exception, latency=latency)``,
+    where ``response`` is ``None`` if the request raised an exception, ``exception`` is ``None`` if
+    the request succeeded and ``latency`` is the duration of the request in seconds. The hooks
+    are called in the order they were added. Exceptions raised by the hooks are logged and
+    ignored. The hooks are called for every request and should return quickly.
+
+    Parameters
+    ----------
+    pre_request: callable or None
+        The hook called before each request. Default: ``None``.
+    post_request: callable or None
+        The hook called after each request. Default: ``None``.
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    TypeError
+        One of the hooks is not callable.
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        # Synchronous and asynchronous code (0MQ and HTTP)
+        def log_request(*, method, params, response, exception, latency):
+            print(f"{method}: {latency * 1000:.1f} ms")
+
+        RM.add_request_hooks(post_request=log_request)
+        ...
+        RM.remove_request_hooks(post_request=log_request)
+"""
+
+_doc_remove_request_hooks = """
+    Remove hooks added with ``add_request_hooks``.
+
+    Parameters
+    ----------
+    pre_request: callable or None
+        The pre-request hook to remove. Default: ``None``.
+    post_request: callable or None
+        The post-request hook to remove. Default: ``None``.
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    ValueError
+        The hook is not registered.
+"""
+
+_doc_stats = """
+    Returns the statistics collected since the API object was created or since the last call
+    to ``stats_reset``. The returned dictionary contains the following items:
+
+    - ``requests`` - statistics of requests sent to RE Manager by method name (the HTTP method and
+      the endpoint separated by space for custom REST API). Each entry includes the number of
+      requests (``count``), the number of requests that raised exceptions (``failed``),
+      the numbers of failed requests by exception class name (``errors``), the total and
+      the maximum latency in seconds (``latency_sum`` and ``latency_max``) and the latency
+      histogram (``latency_buckets``) represented as a list of tuples ``(upper_bound, count)``.
+      The bounds of the histogram buckets are fixed, the last bound is ``math.inf``.
+      The counts are not cumulative. The statistics may be exported in Prometheus format
+      using ``MetricsExporter``.
+
+    - ``cache`` - the numbers of cache hits and misses (``hits`` and ``misses``) by resource
+      (``status``, ``queue_get``, ``history_get``, ``plans_allowed``, ``devices_allowed``,
+      ``plans_existing``, ``devices_existing``, ``re_runs`` and ``lock_info``). The response
+      is generated from cached data in case of a hit and loaded from the server in case
+      of a miss. The data restored from the persistent cache is counted as a hit.
+
+    Collection of the statistics is always enabled and does not require communication with
+    the server. The API is not async in the asynchronous version of ``REManagerAPI``.
+
+    Returns
+    -------
+    dict
+        Dictionary with statistics.
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        # Synchronous and asynchronous code (0MQ and HTTP)
+        stats = RM.stats()
+        n_status_requests = stats["requests"]["status"]["count"]
+        n_queue_get_hits = stats["cache"]["queue_get"]["hits"]
+"""
+
+_doc_stats_reset = """
+    Reset the statistics returned by ``stats``.
+
+    Returns
+    -------
+    None
+"""
+
 _doc_api_status = """
     Load status of RE Manager.
 
@@ -365,7 +590,12 @@ _doc_api_status = """
         is not expired (``False``). Calling the API with ``"reload": True`` always
         initiates communication with the server. Note, that all API that are
         expected to change RE Manager status also invalidate local cache, so
-        explicitly reloading status is rarely required.
+        explicitly reloading status is rarely required. The cache is shared by
+        API instances connected to the same RE Manager (with the same authorization
+        for HTTP), so the status loaded by one instance may be reused by others.
+        Instances that poll the status (for 'wait' operations or status subscribers)
+        process the status loaded by other instances instead of sending their own
+        requests, so RE Manager receives a single stream of status requests.
 
     Returns
     -------
@@ -398,11 +628,78 @@ _doc_api_ping = """
     failed (e.g. timeout occurred). See documentation for ``status`` API.
 """
 
+_doc_api_subscribe_status = """
+    Subscribe to changes of RE Manager status. The status is periodically polled while
+    there are subscribers (the polling period is adjusted between ``status_polling_period_min``
+    and ``status_polling_period`` parameters of ``REManagerAPI``). The callback is called
+    each time the status is changed. If ``fields`` is specified, the callback is called only
+    if at least one of the listed status fields is changed. The callback receives the full
+    status at the first call after subscription.
+
+    The callback is called as ``callback(status, diff)``, where ``status`` is a copy of
+    the dictionary with RE Manager status and ``diff`` is a dictionary of changed fields
+    ``{<field name>: (<old value>, <new value>)}`` (only watched fields if ``fields``
+    is specified). The old value is ``None`` if the field did not exist. The callbacks are
+    called sequentially from a background thread (sync) or task (async), so they may call
+    other API, but should not block for long periods. Coroutine functions may be used as
+    callbacks with asynchronous API. Subscribing the same callback again replaces the list
+    of watched fields. Exceptions raised by the callbacks are logged and ignored.
+
+    Parameters
+    ----------
+    callback: callable
+        Function (or coroutine function for async API) that accepts two parameters:
+        ``status`` and ``diff``.
+    fields: str, iterable of str or None
+        Names of the watched status fields (e.g. ``"manager_state"``, ``"plan_queue_uid"``).
+        Changes of any field are reported if ``None``.
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    TypeError
+        Invalid type of a parameter.
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        def cb(status, diff):
+            if "plan_queue_uid" in diff:
+                print(f"The queue was changed. Items in the queue: {status['items_in_queue']}")
+
+        # Synchronous code (0MQ and HTTP)
+        RM.subscribe_status(cb, fields=["plan_queue_uid", "manager_state"])
+        RM.unsubscribe_status(cb)
+
+        # Asynchronous code (0MQ and HTTP)
+        await RM.subscribe_status(cb, fields=["plan_queue_uid", "manager_state"])
+        await RM.unsubscribe_status(cb)
+"""
+
+_doc_api_unsubscribe_status = """
+    Unsubscribe a callback from changes of RE Manager status. The call is ignored if the callback
+    is not subscribed. See the documentation for ``subscribe_status`` API.
+
+    Parameters
+    ----------
+    callback: callable
+        The callback passed to ``subscribe_status``.
+
+    Returns
+    -------
+    None
+"""
+
 _doc_api_wait_for_idle = """
     Wait for RE Manager to return to ``"idle"`` state. The function performs
     periodic polling of RE Manager status and returns when ``manager_state``
-    status flag is ``"idle"``. Polling period is determined by ``status_polling_period``
-    parameter of ``REManagerAPI``. The function raises ``WaitTimeoutError``
+    status flag is ``"idle"``. Polling period is adjusted between ``status_polling_period_min``
+    and ``status_polling_period`` parameters of ``REManagerAPI``. The function raises ``WaitTimeoutError``
     if timeout occurs or ``WaitCancelError`` if wait operation was cancelled by
     ``monitor.cancel()`` (see documentation on ``WaitMonitor`` class).
 
@@ -593,6 +890,20 @@ _doc_api_item_add_batch = """
         If the parameter is not ``None``, the key overrides the current lock key set by
         ``REManagerAPI.lock_key``. See documentation on ``REMangerAPI.lock()`` for
         more information. Default: ``None``.
+    chunk_size: int or None (optional)
+        Maximum number of items sent in a single request. If the parameter is not ``None``,
+        the batch is split into chunks, which are sent in separate requests. This reduces
+        request timeouts and memory usage at the server for very large batches. The first
+        chunk is inserted at the position specified by ``pos``, ``before_uid`` or ``after_uid``.
+        Each of the following chunks is inserted after the last item of the previous chunk,
+        so the order of items is preserved. The batch is no longer processed as a whole: if
+        one of the chunks is rejected, the previous chunks remain in the queue and the remaining
+        chunks are not submitted. Default: ``None``.
+    progress_callback: callable or None (optional)
+        The function ``progress_callback(n_added, n_total)`` is called each time a chunk is added
+        to the queue. ``n_added`` is the number of items added so far and ``n_total`` is the number
+        of items in the batch. The asynchronous API also accepts coroutine functions.
+        Default: ``None``.
 
     Returns
     -------
@@ -613,6 +924,11 @@ _doc_api_item_add_batch = """
           returns the copy of the list of submitted items (with assigned UIDs) or ``None``
           on the failure.
 
+        - ``results``: *list(dict)* - the list of results of processing of each item:
+          dictionaries with the keys ``success`` and ``msg``. If the batch is split into chunks
+          and one of the chunks is rejected, the items of the remaining chunks are reported as
+          not submitted.
+
     Raises
     ------
     RequestTimeoutError, RequestFailedError, HTTPRequestError, HTTPClientError, HTTPServerError
@@ -631,6 +947,12 @@ _doc_api_item_add_batch = """
 
         # Asynchronous code (0MQ, HTTP)
         await RM.item_add_batch([plan1, plan2])
+
+        # Add a very large batch in chunks (synchronous code)
+        def report_progress(n_added, n_total):
+            print(f"{n_added} of {n_total} items were added")
+
+        RM.item_add_batch(plans, chunk_size=1000, progress_callback=report_progress)
 """
 
 _doc_api_item_update = """
@@ -1232,6 +1554,74 @@ _doc_api_queue_clear = """
         await RM.queue_clear()
 """
 
+_doc_api_queue_sync = """
+    Synchronize the queue with the desired list of items using the minimum number
+    of requests. Items of the desired list that have ``item_uid`` of existing queue
+    items are matched with the existing items, the remaining items are treated as new
+    items. The queue items that are not in the desired list are removed (``item_remove_batch``),
+    the items with modified parameters are updated (``item_update``), the items that are
+    out of order are moved (``item_move_batch``) and the new items are added
+    (``item_add_batch``). The items that are already in the desired order (the longest
+    common subsequence of the current and the desired lists) are not moved. Consecutive
+    items are moved and added in batches. UIDs of the existing items are preserved.
+    The current queue is loaded using ``queue_get`` API. The currently running item
+    is not part of the queue and is not affected.
+
+    The operations are computed based on the current state of the queue and may fail
+    if the queue is modified by other clients while the operations are executed.
+
+    Parameters
+    ----------
+    desired_items: list(dict), list(BItem), list(BPlan) or list(BInst)
+        The desired list of queue items.
+    dry_run: boolean (optional)
+        Compute the list of operations without executing them. Default: ``False``.
+    user, user_group: str or None (optional)
+        User name and user group name used in the API requests that add or update items.
+        See ``REManagerAPI.item_add()`` for details. Default: ``None``.
+    lock_key: str or None (optional)
+        The lock key enables access to the API when RE Manager queue is locked.
+        If the parameter is not ``None``, the key overrides the current lock key set by
+        ``REManagerAPI.lock_key``. See documentation on ``REMangerAPI.lock()`` for
+        more information. Default: ``None``.
+
+    Returns
+    -------
+    response: dict
+
+        Dictionary keys:
+
+        - ``success``: *boolean* - success of the operation.
+
+        - ``msg``: *str* - error message in case one of the requests is rejected by
+          RE Manager. The remaining operations are not executed.
+
+        - ``operations``: *list(dict)* - the list of planned operations. Each operation
+          is represented by a dictionary with the keys ``method`` (name of the API,
+          e.g. ``'item_move_batch'``) and ``params`` (dictionary of API parameters).
+
+    Raises
+    ------
+    RequestTimeoutError, RequestFailedError, HTTPRequestError, HTTPClientError, HTTPServerError
+        All exceptions raised by ``send_request`` API.
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        # Synchronous code (0MQ, HTTP)
+        items = RM.queue_get()["items"]
+        desired_items = items[::-1] + [BPlan("count", ["det1"], num=5)]
+        response = RM.queue_sync(desired_items, dry_run=True)
+        for op in response["operations"]:
+            print(op["method"], op["params"])
+        RM.queue_sync(desired_items)
+
+        # Asynchronous code (0MQ, HTTP)
+        await RM.queue_sync(desired_items)
+"""
+
 
 _doc_api_queue_mode_set = """
     Set parameters that define the mode of plan queue execution. Only the parameters
@@ -2916,9 +3306,11 @@ _doc_api_session_refresh = """
 
         It is not necessary to refresh the session during normal operation. If the access token
         is valid, but expired, and the refresh token is valid, the client will refresh
-        the expired session automatically. Auto refresh will not work if the access
-        token is invalid or missing. If only refresh token is available, then explicitly
-        call ``REManagerAPI.session_refresh()`` API to obtain valid access token.
+        the expired session automatically. If the expiration time of the access token is
+        known, the session is refreshed shortly before the token expires (see
+        ``token_refresh_margin`` parameter of ``REManagerAPI``). Auto refresh will not work
+        if the access token is invalid or missing. If only refresh token is available, then
+        explicitly call ``REManagerAPI.session_refresh()`` API to obtain valid access token.
 
     Parameters
     ----------
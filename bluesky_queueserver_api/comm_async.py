@@ -1,6 +1,8 @@
+import asyncio
 import httpx
+import time as ttime
 
-from .comm_base import ReManagerAPI_ZMQ_Base, ReManagerAPI_HTTP_Base
+from .comm_base import ReManagerAPI_ZMQ_Base, ReManagerAPI_HTTP_Base, _zmq_priority_methods
 from bluesky_queueserver import ZMQCommSendAsync
 
 from .api_docstrings import _doc_send_request, _doc_close, _doc_api_login, _doc_api_session_refresh
@@ -14,6 +16,8 @@ class ReManagerComm_ZMQ_Async(ReManagerAPI_ZMQ_Base):
             poll_timeout=self._console_monitor_poll_timeout,
             max_msgs=self._console_monitor_max_msgs,
             max_lines=self._console_monitor_max_lines,
+            overflow=self._console_monitor_overflow,
+            overflow_timeout=self._console_monitor_overflow_timeout,
         )
 
     def _create_client(
@@ -32,18 +36,63 @@ class ReManagerComm_ZMQ_Async(ReManagerAPI_ZMQ_Base):
             server_public_key=zmq_public_key,
         )
 
+    def _init_client_pool(self):
+        self._clients_idle = asyncio.LifoQueue()
+        for client in self._clients:
+            self._clients_idle.put_nowait(client)
+
     async def send_request(self, *, method, params=None):
+        # Docstring is maintained separately
+        time_start = self._request_started(method=method, params=params)
+        try:
+            response = await self._send_request_with_retries(method=method, params=params)
+        except Exception as ex:
+            self._request_completed(method=method, params=params, time_start=time_start, exception=ex)
+            raise
+        self._request_completed(method=method, params=params, time_start=time_start, response=response)
+        return response
+
+    async def _send_request_with_retries(self, *, method, **kwargs):
+        """
+        Send the request. Idempotent requests are repeated after timeouts and communication
+        errors as defined by the request policy.
+        """
+        policy = self._get_request_policy(method)
+        if kwargs.get("timeout", None) is None:
+            kwargs["timeout"] = policy["timeout"]
+        n_attempt = 0
+        while True:
+            try:
+                return await self._send_request(method=method, **kwargs)
+            except Exception as ex:
+                delay = self._get_request_retry_delay(policy=policy, n_attempt=n_attempt, exception=ex)
+                if delay is None:
+                    raise
+            n_attempt += 1
+            await asyncio.sleep(delay)
+
+    async def _send_request(self, *, method, params=None, timeout=None):
+        if timeout in self._clients_timeout:
+            # The connection is created with the receive timeout set by the request policy
+            client, checked_out = self._clients_timeout[timeout], False
+        elif (self._client_priority is not None) and (method in _zmq_priority_methods):
+            client, checked_out = self._client_priority, False
+        else:
+            client, checked_out = await self._clients_idle.get(), True
         try:
-            response = await self._client.send_message(method=method, params=params)
+            response = await client.send_message(method=method, params=params)
         except Exception:
             self._process_comm_exception(method=method, params=params)
+        finally:
+            if checked_out:
+                self._clients_idle.put_nowait(client)
         self._check_response(request={"method": method, "params": params}, response=response)
 
         return response
 
     async def close(self):
         await self._console_monitor.disable_wait(timeout=self._console_monitor_poll_timeout * 10)
-        self._client.close()
+        self._close_clients()
 
 
 class ReManagerComm_HTTP_Async(ReManagerAPI_HTTP_Base):
@@ -53,11 +102,16 @@ class ReManagerComm_HTTP_Async(ReManagerAPI_HTTP_Base):
             poll_period=self._console_monitor_poll_period,
             max_msgs=self._console_monitor_max_msgs,
             max_lines=self._console_monitor_max_lines,
+            streaming=self._console_monitor_streaming,
+            overflow=self._console_monitor_overflow,
+            overflow_timeout=self._console_monitor_overflow_timeout,
         )
 
     def _create_client(self, http_server_uri, timeout):
         timeout = self._adjust_timeout(timeout)
-        return httpx.AsyncClient(base_url=http_server_uri, timeout=timeout)
+        return httpx.AsyncClient(
+            base_url=http_server_uri, timeout=timeout, limits=self._http_limits, http2=self._http2
+        )
 
     async def _simple_request(self, *, method, params=None, headers=None, data=None, timeout=None):
         """
@@ -67,13 +121,7 @@ class ReManagerComm_HTTP_Async(ReManagerAPI_HTTP_Base):
             client_response = None
             request_method, endpoint, payload = self._prepare_request(method=method, params=params)
             headers = self._prepare_headers()
-            kwargs = {"json": payload}
-            if headers:
-                kwargs.update({"headers": headers})
-            if data:
-                kwargs.update({"data": data})
-            if timeout is not None:
-                kwargs.update({"timeout": self._adjust_timeout(timeout)})
+            kwargs = self._prepare_request_kwargs(payload=payload, headers=headers, data=data, timeout=timeout)
             client_response = await self._client.request(request_method, endpoint, **kwargs)
             response = self._process_response(client_response=client_response)
 
@@ -88,8 +136,51 @@ class ReManagerComm_HTTP_Async(ReManagerAPI_HTTP_Base):
         self, *, method, params=None, headers=None, data=None, timeout=None, auto_refresh_session=True
     ):
         # Docstring is maintained separately
+        time_start = self._request_started(method=method, params=params)
+        try:
+            response = await self._send_request_with_retries(
+                method=method,
+                params=params,
+                headers=headers,
+                data=data,
+                timeout=timeout,
+                auto_refresh_session=auto_refresh_session,
+            )
+        except Exception as ex:
+            self._request_completed(method=method, params=params, time_start=time_start, exception=ex)
+            raise
+        self._request_completed(method=method, params=params, time_start=time_start, response=response)
+        return response
+
+    async def _send_request_with_retries(self, *, method, **kwargs):
+        """
+        Send the request. Idempotent requests are repeated after timeouts and communication
+        errors as defined by the request policy.
+        """
+        policy = self._get_request_policy(method)
+        if kwargs.get("timeout", None) is None:
+            kwargs["timeout"] = policy["timeout"]
+        n_attempt = 0
+        while True:
+            try:
+                return await self._send_request(method=method, **kwargs)
+            except Exception as ex:
+                delay = self._get_request_retry_delay(policy=policy, n_attempt=n_attempt, exception=ex)
+                if delay is None:
+                    raise
+            n_attempt += 1
+            await asyncio.sleep(delay)
+
+    async def _send_request(self, *, method, params, headers, data, timeout, auto_refresh_session):
+        """
+        Send the request and refresh the session if the access token expired.
+        """
+        if auto_refresh_session and self._is_token_refresh_due():
+            await self._refresh_token_proactively()
+
         refresh = False
         request_params = {"method": method, "params": params, "headers": headers, "data": data, "timeout": timeout}
+        auth_key, n_attempts = self._auth_key, self._session_refresh_attempts
         try:
             response = await self._simple_request(**request_params)
         except self.HTTPClientError as ex:
@@ -106,31 +197,83 @@ class ReManagerComm_HTTP_Async(ReManagerAPI_HTTP_Base):
                 raise
 
         if refresh:
-            try:
-                await self.session_refresh()
-            except Exception as ex:
-                print(f"Failed to refresh session: {ex}")
+            await self._refresh_session(auth_key=auth_key, n_attempts=n_attempts)
 
             # Try calling the API with the new token (or the old one if refresh failed).
             response = await self._simple_request(**request_params)
 
         return response
 
+    def _schedule_token_refresh(self):
+        task = self._token_refresh_task
+        self._token_refresh_task = None
+        if (task is not None) and not task.done():
+            try:
+                current_task = asyncio.current_task()
+            except RuntimeError:
+                current_task = None
+            # The task is not cancelled if the refresh is scheduled by the task itself
+            if task is not current_task:
+                task.cancel()
+        if self._token_refresh_at is not None:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                # No running loop: the session is refreshed before the next request
+                return
+            delay = max(self._token_refresh_at - ttime.time(), 0)
+            self._token_refresh_task = loop.create_task(self._refresh_token_background(delay))
+
+    async def _refresh_token_background(self, delay):
+        await asyncio.sleep(delay)
+        await self._refresh_token_proactively()
+
+    def _create_session_refresh_lock(self):
+        return asyncio.Lock()
+
+    async def _refresh_session(self, *, auth_key, n_attempts):
+        """
+        Refresh the session unless it was already refreshed by a concurrent request. The requests that
+        were sent with the same expired token wait for a single refresh and then use the new token.
+        """
+        async with self._session_refresh_lock:
+            if self._is_session_refresh_needed(auth_key=auth_key, n_attempts=n_attempts):
+                self._session_refresh_attempts += 1
+                try:
+                    await self.session_refresh()
+                except Exception as ex:
+                    # Do not attempt proactive refresh until the new token is set
+                    self._token_refresh_at = None
+                    print(f"Failed to refresh session: {ex}")
+
+    async def _refresh_token_proactively(self):
+        """
+        Refresh the session before the access token expires. If the refresh fails, the session
+        is refreshed after a request is rejected because the token expired.
+        """
+        if self._token_refresh_at is not None:
+            await self._refresh_session(auth_key=self._auth_key, n_attempts=self._session_refresh_attempts)
+
     async def close(self):
+        self._set_token_expiration(None)
         await self._console_monitor.disable_wait(timeout=self._console_monitor_poll_period * 10)
         await self._client.aclose()
 
     async def login(self, username=None, *, password=None, provider=None):
         # Docstring is maintained separately
         endpoint, data = self._prepare_login(username=username, password=password, provider=provider)
-        response = await self.send_request(method=("POST", endpoint), data=data, timeout=self._timeout_login)
+        response = await self.send_request(
+            method=("POST", endpoint), data=data, timeout=self._timeout_login, auto_refresh_session=False
+        )
         response = self._process_login_response(response=response)
         return response
 
     async def session_refresh(self, *, refresh_token=None):
         # Docstring is maintained separately
         refresh_token = self._prepare_refresh_session(refresh_token=refresh_token)
-        response = await self.send_request(method="session_refresh", params={"refresh_token": refresh_token})
+        response = await self.send_request(
+            method="session_refresh", params={"refresh_token": refresh_token}, auto_refresh_session=False
+        )
         response = self._process_login_response(response=response)
         return response
 
@@ -1,23 +1,50 @@
+import base64
 from bluesky_queueserver import CommTimeoutError
+import bisect
 from collections.abc import Mapping, Iterable
 import enum
 import getpass
 import httpx
+import json
+import logging
+import math
 import os
-
+import random
+import threading
+import time as ttime
+
+from .api_docstrings import (
+    _doc_add_request_hooks,
+    _doc_remove_request_hooks,
+    _doc_stats,
+    _doc_stats_reset,
+)
 from ._defaults import (
     default_allow_request_fail_exceptions,
     default_zmq_request_timeout_recv,
     default_zmq_request_timeout_send,
+    default_zmq_n_connections,
+    default_zmq_priority_connection,
     default_http_request_timeout,
     default_http_login_timeout,
     default_http_server_uri,
+    default_http_json_codec,
+    default_http_max_connections,
+    default_http_max_keepalive_connections,
+    default_http_keepalive_expiry,
+    default_http2,
+    default_http_token_refresh_margin,
     default_console_monitor_poll_timeout,
     default_console_monitor_poll_period,
     default_console_monitor_max_msgs,
     default_console_monitor_max_lines,
+    default_console_monitor_streaming,
+    default_console_monitor_overflow,
+    default_console_monitor_overflow_timeout,
 )
 
+logger = logging.getLogger(__name__)
+
 
 rest_api_method_map = {
     "ping": ("GET", "/api/ping"),
@@ -69,10 +96,98 @@ rest_api_method_map = {
 }
 
 
+# Control methods sent using the dedicated ZMQ connection (if enabled), so that they are
+#   not delayed by other requests sent from concurrent threads or tasks.
+_zmq_priority_methods = ("re_pause", "re_stop", "re_abort", "re_halt", "queue_stop")
+
+# Policies for processing new messages if the message queue of the console monitor is full
+_console_monitor_overflow_policies = ("drop_newest", "drop_oldest", "block", "coalesce")
+
+# Request policies. Each policy includes the request timeout in seconds ('timeout', the timeout passed
+#   to the constructor is used if the value is None), the maximum number of times the request is repeated
+#   after timeout or communication error ('retries'), the base delay in seconds before the request
+#   is repeated ('backoff', the delay is doubled after each attempt and randomized by +/-50%) and
+#   whether the request could be safely repeated ('idempotent'). Requests that change the state
+#   of RE Manager are not idempotent and never repeated. The policies are shared by 0MQ and HTTP
+#   API and keyed on the method names from 'rest_api_method_map'. The default policies do not set
+#   timeouts: the timeout configured by the user is not overridden unless the policy is customized.
+#   'status' is not repeated by default, so that the failure is reported quickly: the status is
+#   periodically reloaded by the status engine, which serves as the retry mechanism.
+_request_policy_default = {"timeout": None, "retries": 0, "backoff": 0.1, "idempotent": False}
+_request_policy_read = {"retries": 2, "idempotent": True}
+_request_policy_status = {"retries": 0, "idempotent": True}
+
+_request_policies = {
+    "ping": _request_policy_read,
+    "status": _request_policy_status,
+    "queue_get": _request_policy_read,
+    "queue_item_get": _request_policy_read,
+    "history_get": _request_policy_read,
+    "plans_allowed": _request_policy_read,
+    "devices_allowed": _request_policy_read,
+    "plans_existing": _request_policy_read,
+    "devices_existing": _request_policy_read,
+    "permissions_get": _request_policy_read,
+    "task_status": _request_policy_read,
+    "task_result": _request_policy_read,
+    "lock_info": _request_policy_read,
+}
+
+# Upper bounds (in seconds) of the buckets of request latency histograms. The last bucket
+#   (not listed) counts the requests with latency exceeding the largest bound.
+_request_latency_buckets = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class _RequestStats:
+    """
+    Counters for requests sent using the same method. The histogram is allocated once, recording
+    of a request only increments the counters.
+    """
+
+    __slots__ = ("count", "failed", "errors", "latency_sum", "latency_max", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.failed = 0
+        self.errors = {}  # Exception class name -> the number of failed requests
+        self.latency_sum = 0.0
+        self.latency_max = 0.0
+        self.buckets = [0] * (len(_request_latency_buckets) + 1)
+
+    def record(self, latency, exception):
+        self.count += 1
+        if exception is not None:
+            self.failed += 1
+            name = type(exception).__name__
+            self.errors[name] = self.errors.get(name, 0) + 1
+        self.latency_sum += latency
+        if latency > self.latency_max:
+            self.latency_max = latency
+        self.buckets[bisect.bisect_left(_request_latency_buckets, latency)] += 1
+
+    def to_dict(self):
+        bounds = _request_latency_buckets + (math.inf,)
+        return {
+            "count": self.count,
+            "failed": self.failed,
+            "errors": dict(self.errors),
+            "latency_sum": self.latency_sum,
+            "latency_max": self.latency_max,
+            "latency_buckets": list(zip(bounds, self.buckets)),
+        }
+
+
 class RequestParameterError(Exception):
     ...
 
 
+def _check_console_monitor_overflow(overflow):
+    if overflow not in _console_monitor_overflow_policies:
+        raise RequestParameterError(
+            f"Unsupported overflow policy: {overflow!r}. Supported policies: {_console_monitor_overflow_policies}"
+        )
+
+
 class HTTPRequestError(httpx.RequestError):
     ...
 
@@ -102,6 +217,10 @@ class RequestFailedError(Exception):
         super().__init__(msg)
 
 
+# Exceptions that may be caused by temporary communication problems. Idempotent requests are repeated.
+_request_retry_exceptions = (RequestTimeoutError, HTTPRequestError)
+
+
 class Protocols(enum.Enum):
     ZMQ = "ZMQ"
     HTTP = "HTTP"
@@ -113,6 +232,83 @@ class AuthorizationMethods(enum.Enum):
     TOKEN = "TOKEN"
 
 
+def _json_codec_orjson():
+    import orjson
+
+    return orjson.dumps, orjson.loads
+
+
+def _json_codec_msgspec():
+    import msgspec
+
+    encoder, decoder = msgspec.json.Encoder(), msgspec.json.Decoder()
+    return encoder.encode, decoder.decode
+
+
+def _json_codec_json():
+    def encode(obj):
+        # Same format as the default encoder in ``httpx``
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), allow_nan=False).encode("utf-8")
+
+    # ``json.loads`` accepts UTF-8 encoded bytes
+    return encode, json.loads
+
+
+# JSON codecs supported by HTTP API. The codecs are listed in the order of preference
+#   for automatic selection. Each codec is represented by a function that imports the
+#   library and returns the pair of functions ``encode(obj) -> bytes`` and ``decode(bytes)``.
+_json_codecs = {
+    "orjson": _json_codec_orjson,
+    "msgspec": _json_codec_msgspec,
+    "json": _json_codec_json,
+}
+
+
+def _jwt_expiration_time(token):
+    """
+    Returns the expiration time (``exp`` claim) of JWT or ``None`` if the token is not JWT
+    or contains no expiration time. The signature of the token is not verified.
+    """
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        return float(json.loads(base64.urlsafe_b64decode(payload))["exp"])
+    except Exception:
+        return None
+
+
+def _select_json_codec(json_codec):
+    """
+    Returns the name of the codec and the pair of encoding and decoding functions. The parameter
+    ``json_codec`` may be the name of the codec, ``'auto'`` to select the fastest installed library
+    or a tuple of custom ``encode`` and ``decode`` functions.
+    """
+    if isinstance(json_codec, str):
+        if json_codec == "auto":
+            for name, codec in _json_codecs.items():
+                try:
+                    return (name, *codec())
+                except ImportError:
+                    pass
+        if json_codec not in _json_codecs:
+            raise RequestParameterError(
+                f"Unknown JSON codec {json_codec!r}. Supported codecs: {['auto'] + list(_json_codecs)}"
+            )
+        try:
+            return (json_codec, *_json_codecs[json_codec]())
+        except ImportError as ex:
+            raise RequestParameterError(f"JSON codec {json_codec!r} is not available: {ex}") from ex
+    elif isinstance(json_codec, Iterable) and not isinstance(json_codec, Mapping):
+        codec = tuple(json_codec)
+        if len(codec) != 2 or not all([callable(_) for _ in codec]):
+            raise RequestParameterError(
+                f"Custom JSON codec must be a tuple of 2 callables (encode, decode): {json_codec!r}"
+            )
+        return ("custom", *codec)
+    else:
+        raise RequestParameterError(f"Invalid JSON codec: {json_codec!r}")
+
+
 class ReManagerAPI_Base:
 
     RequestParameterError = RequestParameterError
@@ -125,14 +321,24 @@ class ReManagerAPI_Base:
     Protocols = Protocols
     AuthorizationMethods = AuthorizationMethods
 
-    def __init__(self, *, request_fail_exceptions=True):
+    def __init__(self, *, request_fail_exceptions=True, request_policies=None):
         # Raise exceptions if request fails (success=False)
         self._request_fail_exceptions = request_fail_exceptions
         self._console_monitor = None
 
+        self._request_policies = self._init_request_policies(request_policies)
+
         self._protocol = None
         self._pass_user_info = True
 
+        # Instrumentation: request hooks, request statistics (method -> _RequestStats) and
+        #   the counters of cache hits and misses (cached resource -> [hits, misses]).
+        self._request_hooks_pre = []
+        self._request_hooks_post = []
+        self._stats_lock = threading.Lock()
+        self._stats_requests = {}
+        self._stats_cache = {}
+
     @property
     def request_fail_exceptions_enabled(self):
         """
@@ -158,6 +364,72 @@ class ReManagerAPI_Base:
             if not isinstance(response, Mapping) or not response.get("success", True):
                 raise self.RequestFailedError(request, response)
 
+    def _init_request_policies(self, request_policies):
+        """
+        Validate the custom policies and merge them with the default policies. The custom policy
+        for a method may contain only the parameters that are different from the default policy.
+        """
+        policies = {k: dict(_request_policy_default, **v) for k, v in _request_policies.items()}
+        if request_policies is None:
+            return policies
+        if not isinstance(request_policies, Mapping):
+            raise self.RequestParameterError(f"Request policies must be a dictionary: {request_policies!r}")
+
+        for method, policy in request_policies.items():
+            if method not in rest_api_method_map:
+                raise self.RequestParameterError(f"Request policy for unknown method {method!r}")
+            if not isinstance(policy, Mapping):
+                raise self.RequestParameterError(f"Request policy for {method!r} must be a dictionary: {policy!r}")
+            unknown_keys = set(policy) - set(_request_policy_default)
+            if unknown_keys:
+                raise self.RequestParameterError(
+                    f"Request policy for {method!r} contains unsupported parameters: {sorted(unknown_keys)}"
+                )
+
+            p = dict(policies.get(method, _request_policy_default), **policy)
+            timeout, retries, backoff, idempotent = p["timeout"], p["retries"], p["backoff"], p["idempotent"]
+            if (timeout is not None) and (not isinstance(timeout, (int, float)) or (timeout <= 0)):
+                raise self.RequestParameterError(f"Invalid timeout in the policy for {method!r}: {timeout!r}")
+            if not isinstance(retries, int) or (retries < 0):
+                raise self.RequestParameterError(f"Invalid number of retries for {method!r}: {retries!r}")
+            if not isinstance(backoff, (int, float)) or (backoff < 0):
+                raise self.RequestParameterError(f"Invalid backoff for {method!r}: {backoff!r}")
+            if not isinstance(idempotent, bool):
+                raise self.RequestParameterError(f"Invalid value of 'idempotent' for {method!r}: {idempotent!r}")
+            if retries and not idempotent:
+                raise self.RequestParameterError(f"Request {method!r} is not idempotent and can not be retried")
+            policies[method] = p
+
+        return policies
+
+    @property
+    def request_policies(self):
+        """
+        Policies for requests sent to RE Manager (*dict*, read-only). The dictionary maps method names
+        to the policies. The default policy is used for the methods that are not in the dictionary.
+        Custom policies may be passed to the constructor using ``request_policies`` parameter.
+        """
+        return {k: dict(v) for k, v in self._request_policies.items()}
+
+    def _get_request_policy(self, method):
+        if isinstance(method, str):
+            return self._request_policies.get(method, _request_policy_default)
+        # Custom HTTP requests (method is a tuple)
+        return _request_policy_default
+
+    def _get_request_retry_delay(self, *, policy, n_attempt, exception):
+        """
+        Returns the delay before the next attempt to send the failed request or ``None``
+        if the request should not be repeated.
+        """
+        if (
+            not policy["idempotent"]
+            or (n_attempt >= policy["retries"])
+            or not isinstance(exception, _request_retry_exceptions)
+        ):
+            return None
+        return policy["backoff"] * 2**n_attempt * random.uniform(0.5, 1.5)
+
     @property
     def console_monitor(self):
         """
@@ -172,6 +444,78 @@ class ReManagerAPI_Base:
     def _init_console_monitor(self):
         raise NotImplementedError()
 
+    def add_request_hooks(self, *, pre_request=None, post_request=None):
+        # Docstring is maintained separately
+        for hook in (pre_request, post_request):
+            if (hook is not None) and not callable(hook):
+                raise TypeError(f"Request hook must be callable: {hook!r}")
+        if pre_request is not None:
+            self._request_hooks_pre.append(pre_request)
+        if post_request is not None:
+            self._request_hooks_post.append(post_request)
+
+    def remove_request_hooks(self, *, pre_request=None, post_request=None):
+        # Docstring is maintained separately
+        for hook, hooks in ((pre_request, self._request_hooks_pre), (post_request, self._request_hooks_post)):
+            if hook is not None:
+                try:
+                    hooks.remove(hook)
+                except ValueError:
+                    raise ValueError(f"Request hook is not registered: {hook!r}") from None
+
+    def _request_started(self, *, method, params):
+        """
+        Call pre-request hooks and return the start time of the request.
+        """
+        for hook in self._request_hooks_pre:
+            try:
+                hook(method=method, params=params)
+            except Exception as ex:
+                logger.exception("Exception was raised by pre-request hook: %s", ex)
+        return ttime.perf_counter()
+
+    def _request_completed(self, *, method, params, time_start, response=None, exception=None):
+        """
+        Update request statistics and call post-request hooks.
+        """
+        latency = ttime.perf_counter() - time_start
+        key = method if isinstance(method, str) else " ".join(method)
+        with self._stats_lock:
+            stats = self._stats_requests.get(key)
+            if stats is None:
+                stats = self._stats_requests[key] = _RequestStats()
+            stats.record(latency, exception)
+        for hook in self._request_hooks_post:
+            try:
+                hook(method=method, params=params, response=response, exception=exception, latency=latency)
+            except Exception as ex:
+                logger.exception("Exception was raised by post-request hook: %s", ex)
+
+    def _stats_cache_record(self, resource, *, hit):
+        """
+        Count a hit (the response is generated from cached data) or a miss (the data is loaded
+        from the server) of the cache for the resource.
+        """
+        with self._stats_lock:
+            counters = self._stats_cache.get(resource)
+            if counters is None:
+                counters = self._stats_cache[resource] = [0, 0]
+            counters[0 if hit else 1] += 1
+
+    def stats(self):
+        # Docstring is maintained separately
+        with self._stats_lock:
+            return {
+                "requests": {k: v.to_dict() for k, v in self._stats_requests.items()},
+                "cache": {k: {"hits": v[0], "misses": v[1]} for k, v in self._stats_cache.items()},
+            }
+
+    def stats_reset(self):
+        # Docstring is maintained separately
+        with self._stats_lock:
+            self._stats_requests.clear()
+            self._stats_cache.clear()
+
     @property
     def protocol(self):
         """
@@ -194,28 +538,57 @@ class ReManagerAPI_ZMQ_Base(ReManagerAPI_Base):
         console_monitor_poll_timeout=default_console_monitor_poll_timeout,
         console_monitor_max_msgs=default_console_monitor_max_msgs,
         console_monitor_max_lines=default_console_monitor_max_lines,
+        console_monitor_overflow=default_console_monitor_overflow,
+        console_monitor_overflow_timeout=default_console_monitor_overflow_timeout,
         zmq_public_key=None,
         request_fail_exceptions=default_allow_request_fail_exceptions,
+        zmq_n_connections=default_zmq_n_connections,
+        zmq_priority_connection=default_zmq_priority_connection,
+        request_policies=None,
     ):
-        super().__init__(request_fail_exceptions=request_fail_exceptions)
+        super().__init__(request_fail_exceptions=request_fail_exceptions, request_policies=request_policies)
 
         self._protocol = self.Protocols.ZMQ
 
+        if not isinstance(zmq_n_connections, int) or (zmq_n_connections < 1):
+            raise self.RequestParameterError(
+                f"Number of ZMQ connections must be a positive integer: {zmq_n_connections!r}"
+            )
+        _check_console_monitor_overflow(console_monitor_overflow)
+
         zmq_control_addr = zmq_control_addr or os.environ.get("QSERVER_ZMQ_CONTROL_ADDRESS", None)
         zmq_info_addr = zmq_info_addr or os.environ.get("QSERVER_ZMQ_INFO_ADDRESS", None)
         zmq_public_key = zmq_public_key or os.environ.get("QSERVER_ZMQ_PUBLIC_KEY", None)
 
+        self._zmq_control_addr = zmq_control_addr
         self._zmq_info_addr = zmq_info_addr
+        self._timeout_recv = timeout_recv
         self._console_monitor_poll_timeout = console_monitor_poll_timeout
         self._console_monitor_max_msgs = console_monitor_max_msgs
         self._console_monitor_max_lines = console_monitor_max_lines
+        self._console_monitor_overflow = console_monitor_overflow
+        self._console_monitor_overflow_timeout = console_monitor_overflow_timeout
 
-        self._client = self._create_client(
+        client_params = dict(
             zmq_control_addr=zmq_control_addr,
             timeout_recv=timeout_recv,
             timeout_send=timeout_send,
             zmq_public_key=zmq_public_key,
         )
+        self._client = self._create_client(**client_params)
+        # Pool of connections: each request is sent using an idle connection. Control methods
+        #   are sent using the dedicated connection if 'zmq_priority_connection' is enabled.
+        self._clients = [self._client] + [
+            self._create_client(**client_params) for _ in range(zmq_n_connections - 1)
+        ]
+        self._client_priority = self._create_client(**client_params) if zmq_priority_connection else None
+        # Requests with timeouts set by the request policies are sent using dedicated connections
+        #   (one connection for each timeout value) created with the respective receive timeout.
+        policy_timeouts = {_["timeout"] for _ in self._request_policies.values()} - {None, timeout_recv}
+        self._clients_timeout = {
+            _: self._create_client(**dict(client_params, timeout_recv=_)) for _ in sorted(policy_timeouts)
+        }
+        self._init_client_pool()
 
         self._init_console_monitor()
 
@@ -229,12 +602,27 @@ class ReManagerAPI_ZMQ_Base(ReManagerAPI_Base):
     ):
         raise NotImplementedError()
 
+    def _init_client_pool(self):
+        raise NotImplementedError()
+
+    def _close_clients(self):
+        for client in self._clients:
+            client.close()
+        if self._client_priority is not None:
+            self._client_priority.close()
+        for client in self._clients_timeout.values():
+            client.close()
+
     def _process_comm_exception(self, *, method, params):
         try:
             raise
         except CommTimeoutError as ex:
             raise self.RequestTimeoutError(ex, {"method": method, "params": params}) from ex
 
+    def _get_status_cache_key(self):
+        # The default address is used by the client if 'zmq_control_addr' is None
+        return ("ZMQ", self._zmq_control_addr)
+
 
 class ReManagerAPI_HTTP_Base(ReManagerAPI_Base):
     def __init__(
@@ -247,11 +635,22 @@ class ReManagerAPI_HTTP_Base(ReManagerAPI_Base):
         console_monitor_poll_period=default_console_monitor_poll_period,
         console_monitor_max_msgs=default_console_monitor_max_msgs,
         console_monitor_max_lines=default_console_monitor_max_lines,
+        console_monitor_streaming=default_console_monitor_streaming,
+        console_monitor_overflow=default_console_monitor_overflow,
+        console_monitor_overflow_timeout=default_console_monitor_overflow_timeout,
         request_fail_exceptions=default_allow_request_fail_exceptions,
+        json_codec=default_http_json_codec,
+        http_max_connections=default_http_max_connections,
+        http_max_keepalive_connections=default_http_max_keepalive_connections,
+        http_keepalive_expiry=default_http_keepalive_expiry,
+        http2=default_http2,
+        token_refresh_margin=default_http_token_refresh_margin,
+        request_policies=None,
     ):
-        super().__init__(request_fail_exceptions=request_fail_exceptions)
+        super().__init__(request_fail_exceptions=request_fail_exceptions, request_policies=request_policies)
 
         self._protocol = self.Protocols.HTTP
+        _check_console_monitor_overflow(console_monitor_overflow)
         # Do not pass user info with request (e.g. user info is not required in REST API requests,
         #   because HTTP Server assigns user name and user group based on login information)
         self._pass_user_info = False
@@ -260,6 +659,25 @@ class ReManagerAPI_HTTP_Base(ReManagerAPI_Base):
         self._auth_method = AuthorizationMethods.NONE
         self._auth_key = None  # May be a token or an API key
 
+        if (token_refresh_margin is not None) and (
+            not isinstance(token_refresh_margin, (int, float)) or (token_refresh_margin < 0)
+        ):
+            raise self.RequestParameterError(
+                f"Token refresh margin must be a non-negative number or None: {token_refresh_margin!r}"
+            )
+        # Time (as returned by 'time.time()') when the access token expires and when it should be
+        #   refreshed. The token is refreshed in the background (timer thread or asyncio task) or
+        #   before the next request if the background refresh was not scheduled.
+        self._token_refresh_margin = token_refresh_margin
+        self._token_expires_at = None
+        self._token_refresh_at = None
+        self._token_refresh_task = None
+
+        # Session is refreshed by one request (or background task) at a time. Other requests
+        #   rejected because the token expired wait for the refresh and then use the new token.
+        self._session_refresh_lock = self._create_session_refresh_lock()
+        self._session_refresh_attempts = 0
+
         http_server_uri = http_server_uri or os.environ.get("QSERVER_HTTP_SERVER_URI")
         http_server_uri = http_server_uri or default_http_server_uri
 
@@ -271,13 +689,27 @@ class ReManagerAPI_HTTP_Base(ReManagerAPI_Base):
         self._console_monitor_poll_period = console_monitor_poll_period
         self._console_monitor_max_msgs = console_monitor_max_msgs
         self._console_monitor_max_lines = console_monitor_max_lines
+        self._console_monitor_overflow = console_monitor_overflow
+        self._console_monitor_overflow_timeout = console_monitor_overflow_timeout
+        self._console_monitor_streaming = bool(console_monitor_streaming)
 
         self._rest_api_method_map = rest_api_method_map
 
+        self._json_codec, self._json_encode, self._json_decode = _select_json_codec(json_codec)
+
         self._http_auth_provider = self._preprocess_endpoint_name(
             http_auth_provider, msg="Authentication provider path"
         )
 
+        # Parameters of the connection pool. The value of None sets no limit.
+        self._http_limits = httpx.Limits(
+            max_connections=http_max_connections,
+            max_keepalive_connections=http_max_keepalive_connections,
+            keepalive_expiry=http_keepalive_expiry,
+        )
+        self._http2 = bool(http2)
+
+        self._http_server_uri = http_server_uri
         self._client = self._create_client(http_server_uri=http_server_uri, timeout=self._timeout)
 
         self._init_console_monitor()
@@ -285,6 +717,13 @@ class ReManagerAPI_HTTP_Base(ReManagerAPI_Base):
     def _create_client(self, http_server_uri, timeout):
         raise NotImplementedError()
 
+    def _get_status_cache_key(self):
+        return ("HTTP", self._http_server_uri)
+
+    def _get_status_cache_identity(self):
+        # Status may be cached only for users with the same authorization
+        return (self._auth_method, self._auth_key)
+
     def _adjust_timeout(self, timeout):
         """
         Adjust timeout value. In ``httpx``, the timeout is disabled if timeout is None.
@@ -337,9 +776,27 @@ class ReManagerAPI_HTTP_Base(ReManagerAPI_Base):
         payload = params or {}
         return request_method, endpoint, payload
 
+    def _prepare_request_kwargs(self, *, payload, headers, data, timeout):
+        """
+        Prepare keyword arguments for ``httpx`` request. JSON payload is encoded using
+        the selected codec unless form data is sent.
+        """
+        kwargs = {}
+        if data:
+            kwargs.update({"data": data})
+        else:
+            kwargs.update({"content": self._json_encode(payload)})
+            headers = {**(headers or {}), "Content-Type": "application/json"}
+        if headers:
+            kwargs.update({"headers": headers})
+        if timeout is not None:
+            kwargs.update({"timeout": self._adjust_timeout(timeout)})
+        return kwargs
+
     def _process_response(self, *, client_response):
         client_response.raise_for_status()
-        response = client_response.json()
+        # Decode directly from bytes (avoid creating intermediate string)
+        response = self._json_decode(client_response.content)
         return response
 
     def _process_comm_exception(self, *, method, params, client_response):
@@ -369,6 +826,21 @@ class ReManagerAPI_HTTP_Base(ReManagerAPI_Base):
             else:
                 raise self.HTTPServerError(exc, **common_params) from exc
 
+    @property
+    def json_codec(self):
+        """
+        Returns the name of the codec used to encode and decode JSON payloads of HTTP requests
+        and responses (``'orjson'``, ``'msgspec'``, ``'json'`` or ``'custom'``). The codec is selected
+        using the ``json_codec`` parameter of the constructor. By default, the fastest of the installed
+        libraries is used.
+
+        Returns
+        -------
+        str
+            Name of the JSON codec.
+        """
+        return self._json_codec
+
     @property
     def auth_method(self):
         """
@@ -446,6 +918,48 @@ class ReManagerAPI_HTTP_Base(ReManagerAPI_Base):
             self._auth_method = self.AuthorizationMethods.NONE
             self._auth_key = None
 
+        self._set_token_expiration(_jwt_expiration_time(token) if token else None)
+
+    def _set_token_expiration(self, expires_at):
+        """
+        Set expiration time of the access token and schedule the refresh. The token is refreshed
+        ``token_refresh_margin`` seconds before it expires (or after a half of the remaining lifetime
+        if the lifetime is short). The refresh is not scheduled if proactive refresh is disabled,
+        the expiration time is unknown or the refresh token is not set.
+        """
+        self._token_expires_at = expires_at
+        self._token_refresh_at = None
+        if (
+            (self._token_refresh_margin is not None)
+            and (expires_at is not None)
+            and (self._auth_method == self.AuthorizationMethods.TOKEN)
+            and (self._auth_key[1] is not None)
+        ):
+            ttl = max(expires_at - ttime.time(), 0)
+            self._token_refresh_at = expires_at - min(self._token_refresh_margin, ttl / 2)
+        self._schedule_token_refresh()
+
+    def _create_session_refresh_lock(self):
+        raise NotImplementedError()
+
+    def _is_session_refresh_needed(self, *, auth_key, n_attempts):
+        """
+        Called with ``self._session_refresh_lock`` acquired. Returns ``False`` if the authorization
+        key was changed (e.g. the session was refreshed) or the session refresh was attempted
+        after the request was sent using ``auth_key``.
+        """
+        return (self._auth_key is auth_key) and (self._session_refresh_attempts == n_attempts)
+
+    def _schedule_token_refresh(self):
+        """
+        Start the background refresh of the access token at ``self._token_refresh_at``
+        and cancel the previously scheduled refresh.
+        """
+        raise NotImplementedError()
+
+    def _is_token_refresh_due(self):
+        return (self._token_refresh_at is not None) and (ttime.time() >= self._token_refresh_at)
+
     def _prepare_login(self, *, username, password, provider):
         # Interactively ask for username and password if they were not passed as parameters
         if username is None:
@@ -486,6 +1000,10 @@ class ReManagerAPI_HTTP_Base(ReManagerAPI_Base):
         access_token = response.get("access_token", None)
         refresh_token = response.get("refresh_token", None)
         self.set_authorization_key(token=access_token, refresh_token=refresh_token)
+        # Lifetime of the token reported by the server takes precedence over 'exp' claim
+        expires_in = response.get("expires_in", None)
+        if access_token and isinstance(expires_in, (int, float)):
+            self._set_token_expiration(ttime.time() + expires_in)
         return response
 
     def _prepare_refresh_session(self, *, refresh_token):
@@ -506,3 +1024,9 @@ class ReManagerAPI_HTTP_Base(ReManagerAPI_Base):
             raise self.RequestParameterError("'refresh_token' is not set")
 
         return refresh_token
+
+
+ReManagerAPI_Base.add_request_hooks.__doc__ = _doc_add_request_hooks
+ReManagerAPI_Base.remove_request_hooks.__doc__ = _doc_remove_request_hooks
+ReManagerAPI_Base.stats.__doc__ = _doc_stats
+ReManagerAPI_Base.stats_reset.__doc__ = _doc_stats_reset
@@ -1,15 +1,28 @@
 import asyncio
+import collections
+import itertools
+import json
 import queue
+import re
+import socket
 import threading
 import time as ttime
 import uuid
 
+import httpx
 from bluesky_queueserver import ReceiveConsoleOutput, ReceiveConsoleOutputAsync
 
-from .comm_base import RequestTimeoutError
+from .comm_base import RequestTimeoutError, _check_console_monitor_overflow
 
 _console_monitor_http_method = "GET"
 _console_monitor_http_endpoint = "/api/console_output_update"
+_console_monitor_http_stream_endpoint = "/api/stream_console_output"
+
+# HTTP status codes returned by servers that do not support streaming of console output
+_console_monitor_http_stream_unsupported = (404, 405, 501)
+
+# Maximum size of incomplete data in the buffer of the stream decoder
+_console_monitor_stream_buffer_max = 16 * 1024 * 1024
 
 _doc_ConsoleMonitor_ZMQ = """
     Console Monitor API (0MQ). The class implements a monitor for console output
@@ -25,13 +38,22 @@ _doc_ConsoleMonitor_ZMQ = """
         Timeout used for polling 0MQ socket. The value does not influence performance.
         It may take longer to stop the background thread or task, if the value is too large.
     max_msgs: int
-        Maximum number of messages in the buffer. New messages are ignored if the buffer
-        is full. This could happen only if console monitoring is enabled, but messages
-        are not read from the buffer. Setting the value to 0 disables collection of messages
-        in the buffer.
+        Maximum number of messages in the buffer. The buffer may be full only if console
+        monitoring is enabled, but messages are not read from the buffer. New messages are
+        processed according to ``overflow`` policy if the buffer is full. Setting the value
+        to 0 disables collection of messages in the buffer.
     max_lines: int
         Maximum number of lines in the text buffer. Setting the value to 0 disables processing
         of text messages and generation of text output.
+    overflow: str
+        Policy for processing new messages if the buffer is full: ``'drop_newest'`` (default,
+        new messages are ignored), ``'drop_oldest'`` (the oldest messages are removed from the
+        buffer), ``'block'`` (wait until a message is read from the buffer, the new message is
+        ignored if the buffer is still full after ``overflow_timeout``) or ``'coalesce'`` (the text
+        of the new message is appended to the last message in the buffer). The text buffer
+        receives all messages regardless of the policy.
+    overflow_timeout: float
+        Timeout used by ``'block'`` policy. Messages are not received while the monitor is waiting.
 """
 
 _doc_ConsoleMonitor_HTTP = """
@@ -45,15 +67,28 @@ _doc_ConsoleMonitor_HTTP = """
         Reference to the parent class (or any class). The class must expose the attribute
         ``_client`` that references configured ``httpx`` client.
     poll_period: float
-        Period between consecutive requests to HTTP server.
+        Period between consecutive requests to HTTP server. If streaming is enabled,
+        the delay before reopening the stream after the connection is closed.
     max_msgs: int
-        Maximum number of messages in the buffer. New messages are ignored if the buffer
-        is full. This could happen only if console monitoring is enabled, but messages
-        are not read from the buffer. Setting the value to 0 disables collection of messages
-        in the buffer.
+        Maximum number of messages in the buffer. The buffer may be full only if console
+        monitoring is enabled, but messages are not read from the buffer. New messages are
+        processed according to ``overflow`` policy if the buffer is full. Setting the value
+        to 0 disables collection of messages in the buffer.
     max_lines: int
         Maximum number of lines in the text buffer. Setting the value to 0 disables processing
         of text messages and generation of text output.
+    streaming: boolean
+        Receive messages from the streaming endpoint of HTTP server instead of polling the server.
+        The monitor falls back to polling if streaming is not supported by the server.
+    overflow: str
+        Policy for processing new messages if the buffer is full: ``'drop_newest'`` (default,
+        new messages are ignored), ``'drop_oldest'`` (the oldest messages are removed from the
+        buffer), ``'block'`` (wait until a message is read from the buffer, the new message is
+        ignored if the buffer is still full after ``overflow_timeout``) or ``'coalesce'`` (the text
+        of the new message is appended to the last message in the buffer). The text buffer
+        receives all messages regardless of the policy.
+    overflow_timeout: float
+        Timeout used by ``'block'`` policy. Messages are not received while the monitor is waiting.
 """
 
 _doc_ConsoleMonitor_enabled = """
@@ -255,6 +290,40 @@ _doc_ConsoleMonitor_text_uid = """
             asyncio.sleep(0.1)
 """
 
+_doc_ConsoleMonitor_msg_queue_size = """
+    Returns the number of messages in the queue, i.e. the messages that were received, but not
+    yet read with ``next_msg()``. The size of the queue is limited by ``console_monitor_max_msgs``
+    parameter of ``REManagerAPI``. New messages are processed according to ``console_monitor_overflow``
+    policy while the queue is full.
+
+    Examples
+    --------
+    Synchronous and asynchronous API
+
+    .. code-block:: python
+
+        n_msgs = RM.console_monitor.msg_queue_size
+"""
+
+_doc_ConsoleMonitor_msg_queue_stats = """
+    Returns the statistics of the message queue: the number of messages dropped (``'dropped'``)
+    or coalesced with the last message (``'coalesced'``) because the queue was full and the maximum
+    number of messages in the queue (``'max_size'``). The values may be used to select the size
+    of the queue (``console_monitor_max_msgs``). The statistics are reset when the monitor is enabled
+    or cleared.
+
+    Examples
+    --------
+    Synchronous and asynchronous API
+
+    .. code-block:: python
+
+        stats = RM.console_monitor.msg_queue_stats
+        print(f"Dropped messages: {stats['dropped']}")
+        print(f"Coalesced messages: {stats['coalesced']}")
+        print(f"Maximum queue size: {stats['max_size']}")
+"""
+
 _doc_ConsoleMonitor_text_max_lines = """
     Get/set the maximum size of the text buffer. The new buffer size is
     applied to the existing buffer, removing extra messages if necessary.
@@ -331,6 +400,188 @@ _doc_ConsoleMonitor_text = """
         RM.console_monitor.disable()
 """
 
+_doc_ConsoleMonitor_text_since = """
+    Returns the changes of the text since the version with UID ``text_uid``. The function
+    is intended for applications (e.g. GUI) that display the text and need to update
+    the displayed text without reloading the full text each time the buffer is modified.
+    The changes are returned as a dictionary:
+
+    - ``text_uid`` - UID of the current text, pass it to the next call;
+
+    - ``lines_removed`` - the number of lines to remove from the beginning of the old text;
+
+    - ``first_changed_line`` - the index of the first changed line (after the lines
+      are removed from the beginning of the old text);
+
+    - ``lines`` - the list of lines that replace the old text starting from
+      ``first_changed_line``.
+
+    If ``text_uid`` is unknown (e.g. the buffer was cleared or the UID is too old),
+    the full text is returned (``lines_removed`` and ``first_changed_line`` are ``0``).
+    The text consists of lines joined with ``\\n`` (the same as the text returned by ``text()``).
+
+    Parameters
+    ----------
+    text_uid: str or None
+        UID of the old text (``text_uid`` returned by the previous call of the function,
+        the value of ``text_uid`` property at the time when the text was loaded or ``None``).
+
+    Returns
+    -------
+    dict
+        Dictionary with the changes of the text.
+
+    Examples
+    --------
+    Synchronous API
+
+    .. code-block:: python
+
+        RM.console_monitor.enable()
+
+        lines, text_uid = [], None
+        while True:
+            if RM.console_monitor.text_uid != text_uid:
+                changes = RM.console_monitor.text_since(text_uid)
+                text_uid = changes["text_uid"]
+                del lines[: changes["lines_removed"]]
+                lines[changes["first_changed_line"] :] = changes["lines"]
+                text = "\\n".join(lines)  # The same as 'RM.console_monitor.text()'
+            ttime.sleep(0.1)
+
+    Asynchronous API
+
+    .. code-block:: python
+
+        RM.console_monitor.enable()
+
+        lines, text_uid = [], None
+        while True:
+            if RM.console_monitor.text_uid != text_uid:
+                changes = await RM.console_monitor.text_since(text_uid)
+                text_uid = changes["text_uid"]
+                del lines[: changes["lines_removed"]]
+                lines[changes["first_changed_line"] :] = changes["lines"]
+                text = "\\n".join(lines)  # The same as 'await RM.console_monitor.text()'
+            await asyncio.sleep(0.1)
+"""
+
+
+# The maximum number of text UIDs that could be passed to 'text_since()'
+_text_history_max_size = 10000
+
+# New line, carriage return and 'one line up' (ESC [#A) sequences
+_text_control_sequences = re.compile("\n|\r|" + re.escape("\x1B\x5B\x41"))
+
+
+def _text_line_insert(line, pos, substr):
+    """
+    Write ``substr`` to ``line`` starting at position ``pos`` (overwriting existing characters,
+    the line is extended with spaces if needed). Returns the new line and the new position.
+    """
+    line_len = len(line)
+    if pos == line_len:
+        line += substr
+    elif pos > line_len:
+        line += " " * (pos - line_len) + substr
+    else:
+        line = line[:pos] + substr + line[pos + len(substr) :]
+    return line, pos + len(substr)
+
+
+def _text_remove_lines(text, n_lines, *, n_remove, from_end):
+    """
+    Remove ``n_remove`` lines from the beginning or the end of ``text`` that contains
+    ``n_lines`` lines joined with ``\\n``.
+    """
+    if n_remove <= 0:
+        return text
+    if n_remove >= n_lines:
+        return ""
+    if from_end:
+        n = len(text)
+        for _ in range(n_remove):
+            n = text.rfind("\n", 0, n)
+        return text[:n]
+    n = -1
+    for _ in range(n_remove):
+        n = text.find("\n", n + 1)
+    return text[n + 1 :]
+
+
+_stream_whitespace = re.compile(r"\s*")
+
+
+class _ConsoleOutputStreamDecoder:
+    """
+    Decoder for the stream of JSON-encoded console output messages. The messages may be
+    separated by whitespace (e.g. newline-delimited JSON) or follow each other without
+    separators. A message may be split between multiple chunks of the stream.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._decoder = json.JSONDecoder()
+
+    def decode(self, text):
+        """
+        Process the next chunk of the stream and return the list of decoded messages.
+        """
+        buffer = self._buffer + text
+        msgs, n = [], 0
+        while True:
+            n = _stream_whitespace.match(buffer, n).end()
+            if n >= len(buffer):
+                break
+            try:
+                msg, n = self._decoder.raw_decode(buffer, n)
+            except json.JSONDecodeError:
+                # The message is incomplete
+                break
+            msgs.append(msg)
+
+        self._buffer = buffer[n:]
+        if len(self._buffer) > _console_monitor_stream_buffer_max:
+            raise ValueError("Failed to decode the stream of console output messages")
+        return msgs
+
+
+def _skip_received_msgs(msgs, last_msg):
+    """
+    Remove the messages that were already received from the list ``msgs`` of messages loaded
+    from the server buffer. ``last_msg`` is the last received message. The messages loaded
+    after reconnecting to the stream may include messages received from the stream.
+    """
+    if msgs and (last_msg is not None):
+        for n in range(len(msgs) - 1, -1, -1):
+            if msgs[n] == last_msg:
+                return msgs[n + 1 :]
+    return msgs
+
+
+def _skip_stream_overlap(msgs, msgs_loaded):
+    """
+    Remove the messages received from the stream that were already loaded from the server buffer.
+    The messages published after the stream was opened, but before the messages were loaded from
+    the buffer, are received twice. Returns the list of new messages and the list of loaded messages
+    that may still be received from the stream (empty list if no more messages are expected).
+    """
+    n_skip = 0
+    for msg in msgs:
+        if msg not in msgs_loaded:
+            return msgs[n_skip:], []
+        msgs_loaded = msgs_loaded[msgs_loaded.index(msg) + 1 :]
+        n_skip += 1
+    return [], msgs_loaded
+
+
+def _coalesce_msgs(msg, msg_new):
+    """
+    Append the text of the message ``msg_new`` to the message ``msg``. The timestamp of
+    the first message is kept.
+    """
+    return dict(msg, msg=msg.get("msg", "") + msg_new.get("msg", ""))
+
 
 class _ConsoleMonitor:
     def __init__(self, *, max_lines):
@@ -340,42 +591,146 @@ class _ConsoleMonitor:
         self._buffers_modified_event = threading.Event()
 
         self._text = {}
-        self._set_new_text_uid()
-
-        self._text_buffer = []
+        self._text_buffer = collections.deque()
+        # History of text UIDs: items are lists [text_uid, n_lines_removed, modified_from], where
+        #   'modified_from' is the first line modified after the UID was replaced (absolute index).
+        self._text_history = collections.deque()
+        self._text_history_index = {}  # text_uid -> sequential number of the history item
+        self._text_history_count = 0
         self._text_clear()
         self._text_max_lines = max(max_lines, 0)
 
+    def _text_buffer_lines(self, n_start, n_end):
+        """
+        Returns the list of lines ``n_start:n_end`` of the text buffer. The lines are selected starting
+        from the nearest end of the buffer ('deque' is accessed efficiently only at both ends).
+        """
+        buffer = self._text_buffer
+        n_buffer = len(buffer)
+        if n_end <= n_start:
+            return []
+        if n_start >= n_buffer - n_end:
+            lines = list(itertools.islice(reversed(buffer), n_buffer - n_end, n_buffer - n_start))
+            lines.reverse()
+            return lines
+        return list(itertools.islice(buffer, n_start, n_end))
+
+    def _text_n_lines(self):
+        """
+        The number of lines of text. An empty string at the end of the buffer is not counted.
+        """
+        buffer = self._text_buffer
+        return len(buffer) - (1 if (buffer and buffer[-1] == "") else 0)
+
+    def _text_render(self):
+        """
+        Returns full text. The joined text of the lines preceding the current line (the lines that
+        are unlikely to be modified) is cached and extended as new lines are added, so only the lines
+        starting from the current line are joined for each new version of the text.
+        """
+        n_first = self._text_lines_removed
+        n_text_lines = self._text_n_lines()
+        prefix, p_first, p_end = self._text_prefix, self._text_prefix_first, self._text_prefix_end
+
+        # Remove the lines modified since the prefix was generated (e.g. after moving one line up)
+        if (self._text_modified_from is not None) and (self._text_modified_from < p_end):
+            n_end = max(self._text_modified_from, p_first)
+            prefix = _text_remove_lines(prefix, p_end - p_first, n_remove=p_end - n_end, from_end=True)
+            p_end = n_end
+        self._text_modified_from = None
+
+        # Remove the lines that were removed from the buffer
+        if p_end <= n_first:
+            prefix, p_first, p_end = "", n_first, n_first
+        elif p_first < n_first:
+            prefix = _text_remove_lines(prefix, p_end - p_first, n_remove=n_first - p_first, from_end=False)
+            p_first = n_first
+
+        # Extend the prefix up to the current line
+        n_final = n_first + min(self._text_line, n_text_lines)
+        if n_final > p_end:
+            lines = self._text_buffer_lines(p_end - n_first, n_final - n_first)
+            prefix = "\n".join([prefix] + lines) if (p_end > p_first) else "\n".join(lines)
+            p_end = n_final
+
+        self._text_prefix, self._text_prefix_first, self._text_prefix_end = prefix, p_first, p_end
+
+        lines = self._text_buffer_lines(p_end - n_first, n_text_lines)
+        if p_end > p_first:
+            return "\n".join([prefix] + lines) if lines else prefix
+        return "\n".join(lines)
+
     def _text_generate(self, nlines):
-        n_text_buffer = len(self._text_buffer)
-        nlines = max(nlines, 0) if (nlines is not None) else n_text_buffer
+        n_text_lines = self._text_n_lines()
+        nlines = min(max(nlines, 0), n_text_lines) if (nlines is not None) else n_text_lines
 
-        if self._text_buffer and self._text_buffer[-1] == "":
-            nlines = min(nlines, n_text_buffer - 1)
-            if nlines not in self._text:
-                text = "\n".join(self._text_buffer[-nlines - 1 : -1])
-                self._text[nlines] = text
+        if nlines not in self._text:
+            if nlines == n_text_lines:
+                self._text[nlines] = self._text_render()
             else:
-                text = self._text[nlines]
+                self._text[nlines] = "\n".join(self._text_buffer_lines(n_text_lines - nlines, n_text_lines))
+        return self._text[nlines]
+
+    def _text_generate_since(self, text_uid):
+        n_first = self._text_lines_removed
+        n_text_lines = self._text_n_lines()
+
+        seq = self._text_history_index.get(text_uid, None)
+        if seq is None:
+            # Unknown or expired UID: return full text
+            n_removed, n_line = 0, 0
         else:
-            nlines = min(nlines, n_text_buffer)
-            if nlines not in self._text:
-                text = "\n".join(self._text_buffer[-nlines:])
-                self._text[nlines] = text
-            else:
-                text = self._text[nlines]
-        return text
+            history = self._text_history
+            n_history = len(history)
+            n_item = seq - (self._text_history_count - n_history)
+            modified_from = n_first + n_text_lines
+            for n in range(n_history - 2, n_item - 1, -1):
+                modified_from = min(modified_from, history[n][2])
+            n_removed = n_first - history[n_item][1]
+            n_line = min(max(modified_from - n_first, 0), n_text_lines)
+
+        return {
+            "text_uid": self._text_uid,
+            "lines_removed": n_removed,
+            "first_changed_line": n_line,
+            "lines": self._text_buffer_lines(n_line, n_text_lines),
+        }
+
+    def _set_new_text_uid(self, *, modified_from=None):
+        """
+        Set new text UID after the text buffer is modified. ``modified_from`` is the absolute index of
+        the first modified line, ``None`` if no existing lines were modified (e.g. lines were removed).
+        """
+        if modified_from is None:
+            modified_from = self._text_lines_removed + len(self._text_buffer)
+        elif (self._text_modified_from is None) or (modified_from < self._text_modified_from):
+            self._text_modified_from = modified_from
+
+        # The cached text is no longer valid
+        self._text.clear()
 
-    def _set_new_text_uid(self):
+        history = self._text_history
+        if history:
+            history[-1][2] = modified_from
         self._text_uid = str(uuid.uuid4())
+        history.append([self._text_uid, self._text_lines_removed, None])
+        self._text_history_index[self._text_uid] = self._text_history_count
+        self._text_history_count += 1
+        if len(history) > _text_history_max_size:
+            del self._text_history_index[history.popleft()[0]]
 
     def _text_clear(self):
-        self._text.clear()
-        self._set_new_text_uid()
-
         self._text_line = 0
         self._text_pos = 0
         self._text_buffer.clear()
+        self._text_lines_removed = 0  # The number of lines removed from the beginning of the buffer
+
+        self._text_prefix, self._text_prefix_first, self._text_prefix_end = "", 0, 0
+        self._text_modified_from = None
+
+        self._text_history.clear()
+        self._text_history_index.clear()
+        self._set_new_text_uid()
 
     def _add_msg_to_text_buffer(self, response):
         # Setting max number of lines to 0 disables text processing
@@ -384,56 +739,51 @@ class _ConsoleMonitor:
 
         msg = response["msg"]
 
-        pattern_new_line = "\n"
-        pattern_cr = "\r"
-        pattern_up_one_line = "\x1B\x5B\x41"  # ESC [#A
-
-        patterns = {"new_line": pattern_new_line, "cr": pattern_cr, "one_line_up": pattern_up_one_line}
-
-        while msg:
-            indices = {k: msg.find(v) for k, v in patterns.items()}
-            indices_nonzero = [_ for _ in indices.values() if (_ >= 0)]
-            next_ind = min(indices_nonzero) if indices_nonzero else len(msg)
-
+        if msg:
             # The following algorithm requires that there is at least one line in the list.
             if not self._text_buffer:
-                self._text_buffer = [""]
+                self._text_buffer.append("")
                 self._text_line = 0
                 self._text_pos = 0
 
-            if next_ind != 0:
-                # Add a line to the current line and position
-                substr = msg[:next_ind]
-                msg = msg[next_ind:]
-
-                # Extend the current line with spaces if needed
-                line_len = len(self._text_buffer[self._text_line])
-                if line_len < self._text_pos:
-                    self._text_buffer[self._text_line] += " " * (self._text_pos - line_len)
-
-                line = self._text_buffer[self._text_line]
-                self._text_buffer[self._text_line] = (
-                    line[: self._text_pos] + substr + line[self._text_pos + len(substr) :]
-                )
-                self._text_pos = self._text_pos + len(substr)
-
-            elif indices["new_line"] == 0:
-                self._text_line += 1
-                if self._text_line >= len(self._text_buffer):
-                    self._text_buffer.insert(self._text_line, "")
-                self._text_pos = 0
-                msg = msg[len(patterns["new_line"]) :]
-
-            elif indices["cr"] == 0:
-                self._text_pos = 0
-                msg = msg[len(patterns["cr"]) :]
-
-            elif indices["one_line_up"] == 0:
-                if self._text_line:
-                    self._text_line -= 1
-                msg = msg[len(patterns["one_line_up"]) :]
-
-        self._set_new_text_uid()
+            # The message is processed in a single pass. The current line is kept in a local
+            #   variable and written to the buffer only when the cursor moves to a different line.
+            buffer = self._text_buffer
+            n_line, pos = self._text_line, self._text_pos
+            n_line_min = n_line
+            line = buffer[n_line]
+            n_start = 0
+
+            for m in _text_control_sequences.finditer(msg):
+                n_end = m.start()
+                if n_end > n_start:
+                    line, pos = _text_line_insert(line, pos, msg[n_start:n_end])
+                n_start = m.end()
+
+                seq = m.group()
+                if seq == "\n":
+                    buffer[n_line] = line
+                    n_line += 1
+                    if n_line >= len(buffer):
+                        buffer.append("")
+                    line, pos = buffer[n_line], 0
+                elif seq == "\r":
+                    pos = 0
+                elif n_line:  # One line up
+                    buffer[n_line] = line
+                    n_line -= 1
+                    n_line_min = min(n_line_min, n_line)
+                    line = buffer[n_line]
+
+            if n_start < len(msg):
+                line, pos = _text_line_insert(line, pos, msg[n_start:])
+
+            buffer[n_line] = line
+            self._text_line, self._text_pos = n_line, pos
+
+            self._set_new_text_uid(modified_from=self._text_lines_removed + n_line_min)
+        else:
+            self._set_new_text_uid()
 
     def _adjust_text_buffer_size(self):
         if self._text_buffer and self._text_buffer[-1] == "":
@@ -447,8 +797,9 @@ class _ConsoleMonitor:
             n_remove = len(self._text_buffer) - max_lines
             # In majority of cases only 1 (or a few) elements are removed
             for _ in range(n_remove):
-                self._text_buffer.pop(0)
+                self._text_buffer.popleft()
             self._text_line = max(self._text_line - n_remove, 0)
+            self._text_lines_removed += n_remove
 
         self._set_new_text_uid()
 
@@ -461,11 +812,33 @@ class _ConsoleMonitor:
     def _monitor_enable(self):
         raise NotImplementedError()
 
+    def _msg_queue_stats_clear(self):
+        self._msg_queue_n_dropped = 0
+        self._msg_queue_n_coalesced = 0
+        self._msg_queue_size_max = 0
+
+    def _msg_queue_stats_update(self):
+        self._msg_queue_size_max = max(self._msg_queue_size_max, self._msg_queue.qsize())
+
     @property
     def text_uid(self):
         # Docstring is maintained separately
         return self._text_uid
 
+    @property
+    def msg_queue_size(self):
+        # Docstring is maintained separately
+        return self._msg_queue.qsize()
+
+    @property
+    def msg_queue_stats(self):
+        # Docstring is maintained separately
+        return {
+            "dropped": self._msg_queue_n_dropped,
+            "coalesced": self._msg_queue_n_coalesced,
+            "max_size": self._msg_queue_size_max,
+        }
+
     @property
     def text_max_lines(self):
         # Docstring is maintained separately
@@ -495,15 +868,20 @@ class _ConsoleMonitor:
     def clear(self):
         # Docstring is maintained separately
         self._clear()
+        self._msg_queue_stats_clear()
 
     def __del__(self):
         self.disable()
 
 
 class _ConsoleMonitor_Threads(_ConsoleMonitor):
-    def __init__(self, *, max_msgs, max_lines):
+    def __init__(self, *, max_msgs, max_lines, overflow, overflow_timeout):
+        _check_console_monitor_overflow(overflow)
         self._msg_queue_max = max(max_msgs, 0)
         self._msg_queue = queue.Queue(maxsize=max_msgs)
+        self._msg_queue_overflow = overflow
+        self._msg_queue_overflow_timeout = overflow_timeout
+        self._msg_queue_stats_clear()
 
         self._monitor_enabled = False
         self._monitor_thread = None  # Thread or asyncio task
@@ -523,8 +901,37 @@ class _ConsoleMonitor_Threads(_ConsoleMonitor):
         self._monitor_thread.start()
 
     def _add_msg_to_queue(self, msg):
-        if self._msg_queue_max:
-            self._msg_queue.put_nowait(msg)
+        # Messages are added to the queue only by the monitor thread, so the queue can not
+        #   become full again after the oldest message is removed.
+        if not self._msg_queue_max:
+            return
+        overflow = self._msg_queue_overflow
+        try:
+            if overflow == "block":
+                self._msg_queue.put(msg, timeout=self._msg_queue_overflow_timeout)
+            else:
+                self._msg_queue.put_nowait(msg)
+        except queue.Full:
+            if overflow == "drop_oldest":
+                try:
+                    self._msg_queue.get_nowait()
+                    self._msg_queue_n_dropped += 1
+                except queue.Empty:
+                    pass
+                self._msg_queue.put_nowait(msg)
+            elif overflow == "coalesce":
+                with self._msg_queue.mutex:
+                    msgs = self._msg_queue.queue
+                    if msgs:
+                        msgs[-1] = _coalesce_msgs(msgs[-1], msg)
+                        self._msg_queue_n_coalesced += 1
+                        msg = None
+                if msg is not None:
+                    # All messages were read from the queue
+                    self._msg_queue.put_nowait(msg)
+            else:
+                self._msg_queue_n_dropped += 1
+        self._msg_queue_stats_update()
 
     def disable_wait(self, *, timeout=2):
         # Docstring is maintained separately
@@ -546,14 +953,30 @@ class _ConsoleMonitor_Threads(_ConsoleMonitor):
             text = self._text_generate(nlines=nlines)
         return text
 
+    def text_since(self, text_uid):
+        # Docstring is maintained separately
+        with self._text_buffer_lock:
+            return self._text_generate_since(text_uid)
+
 
 class ConsoleMonitor_ZMQ_Threads(_ConsoleMonitor_Threads):
     # Docstring is maintained separately
 
-    def __init__(self, *, zmq_info_addr, poll_timeout, max_msgs, max_lines):
+    def __init__(
+        self,
+        *,
+        zmq_info_addr,
+        poll_timeout,
+        max_msgs,
+        max_lines,
+        overflow="drop_newest",
+        overflow_timeout=1.0,
+    ):
         self._zmq_subscribe_addr = zmq_info_addr
         self._monitor_poll_timeout = poll_timeout
-        super().__init__(max_msgs=max_msgs, max_lines=max_lines)
+        super().__init__(
+            max_msgs=max_msgs, max_lines=max_lines, overflow=overflow, overflow_timeout=overflow_timeout
+        )
 
     def _monitor_init(self):
         self._rco = ReceiveConsoleOutput(
@@ -578,17 +1001,16 @@ class ConsoleMonitor_ZMQ_Threads(_ConsoleMonitor_Threads):
             try:
                 msg = self._rco.recv()
 
+                # The text buffer is not locked while the message is added to the queue
+                #   ('block' overflow policy)
+                self._add_msg_to_queue(msg)
                 with self._text_buffer_lock:
-                    self._add_msg_to_queue(msg)
                     self._add_msg_to_text_buffer(msg)
                     self._adjust_text_buffer_size()
 
             except TimeoutError:
                 # No published messages are detected
                 pass
-            except queue.Full:
-                # Queue is full, ignore the new messages
-                pass
 
     def _clear(self):
         self._msg_queue.queue.clear()
@@ -598,17 +1020,125 @@ class ConsoleMonitor_ZMQ_Threads(_ConsoleMonitor_Threads):
 class ConsoleMonitor_HTTP_Threads(_ConsoleMonitor_Threads):
     # Docstring is maintained separately
 
-    def __init__(self, *, parent, poll_period, max_msgs, max_lines):
+    def __init__(
+        self,
+        *,
+        parent,
+        poll_period,
+        max_msgs,
+        max_lines,
+        streaming=False,
+        overflow="drop_newest",
+        overflow_timeout=1.0,
+    ):
         # The parent class is must have ``_client`` attribute with
         #   active httpx client.
         self._parent = parent  # Reference to the parent class
         self._monitor_poll_period = poll_period
+        self._monitor_streaming = streaming
+        self._monitor_streaming_active = False
         self._console_output_last_msg_uid = ""
-        super().__init__(max_msgs=max_msgs, max_lines=max_lines)
+        self._console_output_last_msg = None
+        self._stream_response = None
+        super().__init__(
+            max_msgs=max_msgs, max_lines=max_lines, overflow=overflow, overflow_timeout=overflow_timeout
+        )
 
     def _monitor_init(self):
         ...
 
+    def _create_stream_client(self):
+        # The stream is received using a separate client (HTTP/1.1) with disabled read timeout.
+        #   The stream is interrupted by closing the socket of the connection.
+        timeout = httpx.Timeout(self._parent._timeout, read=None)
+        return httpx.Client(base_url=self._parent._http_server_uri, timeout=timeout)
+
+    def _load_msgs(self):
+        """
+        Load the messages accumulated by the server since the last message with ``last_msg_uid``.
+        """
+        headers = self._parent._prepare_headers()
+        kwargs = {"json": {"last_msg_uid": self._console_output_last_msg_uid}}
+        if headers:
+            kwargs.update({"headers": headers})
+        client_response = self._parent._client.request(
+            _console_monitor_http_method, _console_monitor_http_endpoint, **kwargs
+        )
+        client_response.raise_for_status()
+        response = client_response.json()
+        console_output_msgs = response.get("console_output_msgs", [])
+        self._console_output_last_msg_uid = response.get("last_msg_uid", "")
+        return console_output_msgs
+
+    def _add_msgs(self, msgs):
+        if msgs:
+            self._console_output_last_msg = msgs[-1]
+        for m in msgs:
+            self._add_msg_to_queue(m)
+        with self._text_buffer_lock:
+            for m in msgs:
+                self._add_msg_to_text_buffer(m)
+            self._adjust_text_buffer_size()
+
+    def _receive_msgs_poll(self):
+        try:
+            # Messages may have already been received from the stream before falling back to polling
+            self._add_msgs(_skip_received_msgs(self._load_msgs(), self._console_output_last_msg))
+            ttime.sleep(self._monitor_poll_period)
+        except Exception:
+            # Ignore communication errors. More detailed processing may be added later.
+            pass
+
+    def _receive_msgs_stream(self):
+        try:
+            with self._create_stream_client() as client:
+                headers = self._parent._prepare_headers()
+                kwargs = {"headers": headers} if headers else {}
+                with client.stream(
+                    _console_monitor_http_method, _console_monitor_http_stream_endpoint, **kwargs
+                ) as r:
+                    if r.status_code in _console_monitor_http_stream_unsupported:
+                        # Streaming is not supported by the server
+                        self._monitor_streaming_active = False
+                        return
+                    r.raise_for_status()
+
+                    self._stream_response = r
+                    if not self._monitor_enabled:
+                        return
+
+                    # Load the messages published while the stream was disconnected
+                    msgs_loaded = _skip_received_msgs(self._load_msgs(), self._console_output_last_msg)
+                    self._add_msgs(msgs_loaded)
+
+                    decoder = _ConsoleOutputStreamDecoder()
+                    for text in r.iter_text():
+                        msgs = decoder.decode(text)
+                        if msgs_loaded:
+                            msgs, msgs_loaded = _skip_stream_overlap(msgs, msgs_loaded)
+                        self._add_msgs(msgs)
+        except Exception:
+            # The stream is reopened after communication errors.
+            pass
+        finally:
+            self._stream_response = None
+
+        if self._monitor_enabled:
+            ttime.sleep(self._monitor_poll_period)
+
+    def _stream_interrupt(self):
+        """
+        Interrupt the stream by shutting down the socket (closing the response from a different
+        thread does not interrupt reading of the stream).
+        """
+        response = self._stream_response
+        if response is not None:
+            try:
+                network_stream = response.extensions["network_stream"]
+                network_stream.get_extra_info("socket").shutdown(socket.SHUT_RDWR)
+            except Exception:
+                pass
+
     def _thread_receive_msgs(self):
         with self._monitor_thread_lock:
             if not self._monitor_thread_running.is_set():
@@ -616,49 +1146,38 @@ class ConsoleMonitor_HTTP_Threads(_ConsoleMonitor_Threads):
             self._monitor_thread_running.clear()
             self.clear()
             self._console_output_last_msg_uid = ""
+            self._monitor_streaming_active = self._monitor_streaming
 
         while True:
             with self._monitor_thread_lock:
                 if not self._monitor_enabled:
                     self._monitor_thread_running.set()
                     break
-            try:
-                headers = self._parent._prepare_headers()
-                kwargs = {"json": {"last_msg_uid": self._console_output_last_msg_uid}}
-                if headers:
-                    kwargs.update({"headers": headers})
-                client_response = self._parent._client.request(
-                    _console_monitor_http_method, _console_monitor_http_endpoint, **kwargs
-                )
-                client_response.raise_for_status()
-                response = client_response.json()
-                console_output_msgs = response.get("console_output_msgs", [])
-                self._console_output_last_msg_uid = response.get("last_msg_uid", "")
-
-                with self._text_buffer_lock:
-                    for m in console_output_msgs:
-                        self._add_msg_to_queue(m)
-                        self._add_msg_to_text_buffer(m)
-                    self._adjust_text_buffer_size()
+            if self._monitor_streaming_active:
+                self._receive_msgs_stream()
+            else:
+                self._receive_msgs_poll()
 
-                ttime.sleep(self._monitor_poll_period)
-            except queue.Full:
-                # Queue is full, ignore the new messages
-                pass
-            except Exception:
-                # Ignore communication errors. More detailed processing may be added later.
-                pass
+    def disable(self):
+        # Docstring is maintained separately
+        super().disable()
+        self._stream_interrupt()
 
     def _clear(self):
         self._console_output_last_msg_uid = ""
+        self._console_output_last_msg = None
         self._msg_queue.queue.clear()
         self._text_clear()
 
 
 class _ConsoleMonitor_Async(_ConsoleMonitor):
-    def __init__(self, *, max_msgs, max_lines):
+    def __init__(self, *, max_msgs, max_lines, overflow, overflow_timeout):
+        _check_console_monitor_overflow(overflow)
         self._msg_queue_max = max_msgs
         self._msg_queue = asyncio.Queue(maxsize=max_msgs)
+        self._msg_queue_overflow = overflow
+        self._msg_queue_overflow_timeout = overflow_timeout
+        self._msg_queue_stats_clear()
 
         self._monitor_task = None  # Thread or asyncio task
         self._monitor_task_running = asyncio.Event()
@@ -669,9 +1188,28 @@ class _ConsoleMonitor_Async(_ConsoleMonitor):
 
         super().__init__(max_lines=max_lines)
 
-    def _add_msg_to_queue(self, msg):
-        if self._msg_queue_max:
-            self._msg_queue.put_nowait(msg)
+    async def _add_msg_to_queue(self, msg):
+        if not self._msg_queue_max:
+            return
+        overflow = self._msg_queue_overflow
+        try:
+            if overflow == "block":
+                await asyncio.wait_for(self._msg_queue.put(msg), timeout=self._msg_queue_overflow_timeout)
+            else:
+                self._msg_queue.put_nowait(msg)
+        except (asyncio.QueueFull, asyncio.TimeoutError):
+            if overflow == "drop_oldest":
+                self._msg_queue.get_nowait()
+                self._msg_queue_n_dropped += 1
+                self._msg_queue.put_nowait(msg)
+            elif overflow == "coalesce":
+                # 'asyncio.Queue' provides no public API for replacing the last item
+                msgs = self._msg_queue._queue
+                msgs[-1] = _coalesce_msgs(msgs[-1], msg)
+                self._msg_queue_n_coalesced += 1
+            else:
+                self._msg_queue_n_dropped += 1
+        self._msg_queue_stats_update()
 
     def _monitor_enable(self):
         self._monitor_task = asyncio.create_task(self._task_receive_msgs())
@@ -698,14 +1236,30 @@ class _ConsoleMonitor_Async(_ConsoleMonitor):
             text = self._text_generate(nlines=nlines)
         return text
 
+    async def text_since(self, text_uid):
+        # Docstring is maintained separately
+        async with self._text_buffer_lock:
+            return self._text_generate_since(text_uid)
+
 
 class ConsoleMonitor_ZMQ_Async(_ConsoleMonitor_Async):
     # Docstring is maintained separately
 
-    def __init__(self, *, zmq_info_addr, poll_timeout, max_msgs, max_lines):
+    def __init__(
+        self,
+        *,
+        zmq_info_addr,
+        poll_timeout,
+        max_msgs,
+        max_lines,
+        overflow="drop_newest",
+        overflow_timeout=1.0,
+    ):
         self._zmq_subscribe_addr = zmq_info_addr
         self._monitor_poll_timeout = poll_timeout
-        super().__init__(max_msgs=max_msgs, max_lines=max_lines)
+        super().__init__(
+            max_msgs=max_msgs, max_lines=max_lines, overflow=overflow, overflow_timeout=overflow_timeout
+        )
 
     def _monitor_init(self):
         self._rco = ReceiveConsoleOutputAsync(
@@ -731,17 +1285,16 @@ class ConsoleMonitor_ZMQ_Async(_ConsoleMonitor_Async):
             try:
                 msg = await self._rco.recv()
 
+                # The text buffer is not locked while the message is added to the queue
+                #   ('block' overflow policy)
+                await self._add_msg_to_queue(msg)
                 async with self._text_buffer_lock:
-                    self._add_msg_to_queue(msg)
                     self._add_msg_to_text_buffer(msg)
                     self._adjust_text_buffer_size()
 
             except TimeoutError:
                 # No published messages are detected
                 pass
-            except asyncio.QueueFull:
-                # Queue is full, ignore the new messages
-                pass
 
     def _clear(self):
         self._text_clear()
@@ -755,17 +1308,110 @@ class ConsoleMonitor_ZMQ_Async(_ConsoleMonitor_Async):
 class ConsoleMonitor_HTTP_Async(_ConsoleMonitor_Async):
     # Docstring is maintained separately
 
-    def __init__(self, *, parent, poll_period, max_msgs, max_lines):
+    def __init__(
+        self,
+        *,
+        parent,
+        poll_period,
+        max_msgs,
+        max_lines,
+        streaming=False,
+        overflow="drop_newest",
+        overflow_timeout=1.0,
+    ):
         # The parent class is must have ``_client`` attribute with
         #   active httpx client.
         self._parent = parent  # Reference to the parent class
         self._monitor_poll_period = poll_period
+        self._monitor_streaming = streaming
+        self._monitor_streaming_active = False
         self._console_output_last_msg_uid = ""
-        super().__init__(max_msgs=max_msgs, max_lines=max_lines)
+        self._console_output_last_msg = None
+        super().__init__(
+            max_msgs=max_msgs, max_lines=max_lines, overflow=overflow, overflow_timeout=overflow_timeout
+        )
 
     def _monitor_init(self):
         ...
 
+    async def _load_msgs(self):
+        """
+        Load the messages accumulated by the server since the last message with ``last_msg_uid``.
+        """
+        headers = self._parent._prepare_headers()
+        kwargs = {"json": {"last_msg_uid": self._console_output_last_msg_uid}}
+        if headers:
+            kwargs.update({"headers": headers})
+        client_response = await self._parent._client.request(
+            _console_monitor_http_method, _console_monitor_http_endpoint, **kwargs
+        )
+        client_response.raise_for_status()
+        response = client_response.json()
+        console_output_msgs = response.get("console_output_msgs", [])
+        self._console_output_last_msg_uid = response.get("last_msg_uid", "")
+        return console_output_msgs
+
+    async def _add_msgs(self, msgs):
+        if msgs:
+            self._console_output_last_msg = msgs[-1]
+        for m in msgs:
+            await self._add_msg_to_queue(m)
+        async with self._text_buffer_lock:
+            for m in msgs:
+                self._add_msg_to_text_buffer(m)
+            self._adjust_text_buffer_size()
+
+    async def _receive_msgs_poll(self):
+        try:
+            # Messages may have already been received from the stream before falling back to polling
+            msgs = _skip_received_msgs(await self._load_msgs(), self._console_output_last_msg)
+            await self._add_msgs(msgs)
+            await asyncio.sleep(self._monitor_poll_period)
+        except Exception:
+            # Ignore communication errors. More detailed processing may be added later.
+            pass
+
+    async def _receive_stream(self):
+        # The read timeout is disabled: no data is sent while there is no console output.
+        timeout = httpx.Timeout(self._parent._timeout, read=None)
+        headers = self._parent._prepare_headers()
+        kwargs = {"headers": headers} if headers else {}
+        async with self._parent._client.stream(
+            _console_monitor_http_method, _console_monitor_http_stream_endpoint, timeout=timeout, **kwargs
+        ) as r:
+            if r.status_code in _console_monitor_http_stream_unsupported:
+                # Streaming is not supported by the server
+                self._monitor_streaming_active = False
+                return
+            r.raise_for_status()
+
+            # Load the messages published while the stream was disconnected
+            msgs_loaded = _skip_received_msgs(await self._load_msgs(), self._console_output_last_msg)
+            await self._add_msgs(msgs_loaded)
+
+            decoder = _ConsoleOutputStreamDecoder()
+            async for text in r.aiter_text():
+                msgs = decoder.decode(text)
+                if msgs_loaded:
+                    msgs, msgs_loaded = _skip_stream_overlap(msgs, msgs_loaded)
+                await self._add_msgs(msgs)
+
+    async def _receive_msgs_stream(self):
+        # The stream is received in a separate task, which is cancelled when the monitor is disabled.
+        task = asyncio.create_task(self._receive_stream())
+        while not task.done():
+            await asyncio.wait({task}, timeout=self._monitor_poll_period)
+            if not self._monitor_enabled:
+                task.cancel()
+        try:
+            await task
+        except (asyncio.CancelledError, Exception):
+            # The stream is reopened after communication errors.
+            pass
+
+        if self._monitor_enabled:
+            await asyncio.sleep(self._monitor_poll_period)
+
     async def _task_receive_msgs(self):
         async with self._monitor_task_lock:
             if not self._monitor_task_running.is_set():
@@ -773,45 +1419,23 @@ class ConsoleMonitor_HTTP_Async(_ConsoleMonitor_Async):
             self._monitor_task_running.clear()
             self.clear()
             self._console_output_last_msg_uid = ""
+            self._monitor_streaming_active = self._monitor_streaming
 
         while True:
             async with self._monitor_task_lock:
                 if not self._monitor_enabled:
                     self._monitor_task_running.set()
                     break
-
-            try:
-                headers = self._parent._prepare_headers()
-                kwargs = {"json": {"last_msg_uid": self._console_output_last_msg_uid}}
-                if headers:
-                    kwargs.update({"headers": headers})
-
-                client_response = await self._parent._client.request(
-                    _console_monitor_http_method, _console_monitor_http_endpoint, **kwargs
-                )
-                client_response.raise_for_status()
-                response = client_response.json()
-                console_output_msgs = response.get("console_output_msgs", [])
-                self._console_output_last_msg_uid = response.get("last_msg_uid", "")
-
-                async with self._text_buffer_lock:
-                    for m in console_output_msgs:
-                        self._add_msg_to_queue(m)
-                        self._add_msg_to_text_buffer(m)
-                    self._adjust_text_buffer_size()
-
-                await asyncio.sleep(self._monitor_poll_period)
-            except asyncio.QueueFull:
-                # Queue is full, ignore the new messages
-                pass
-            except Exception:
-                # Ignore communication errors. More detailed processing may be added later.
-                pass
+            if self._monitor_streaming_active:
+                await self._receive_msgs_stream()
+            else:
+                await self._receive_msgs_poll()
 
     def _clear(self):
         self._text_clear()
         try:
             self._console_output_last_msg_uid = ""
+            self._console_output_last_msg = None
             while True:
                 self._msg_queue.get_nowait()
         except asyncio.QueueEmpty:
@@ -824,10 +1448,13 @@ _ConsoleMonitor.disable.__doc__ = _doc_ConsoleMonitor_disable
 _ConsoleMonitor.clear.__doc__ = _doc_ConsoleMonitor_clear
 _ConsoleMonitor.text_uid.__doc__ = _doc_ConsoleMonitor_text_uid
 _ConsoleMonitor.text_max_lines.__doc__ = _doc_ConsoleMonitor_text_max_lines
+_ConsoleMonitor.msg_queue_size.__doc__ = _doc_ConsoleMonitor_msg_queue_size
+_ConsoleMonitor.msg_queue_stats.__doc__ = _doc_ConsoleMonitor_msg_queue_stats
 
 _ConsoleMonitor_Threads.disable_wait.__doc__ = _doc_ConsoleMonitor_disable_wait
 _ConsoleMonitor_Threads.next_msg.__doc__ = _doc_ConsoleMonitor_next_msg
 _ConsoleMonitor_Threads.text.__doc__ = _doc_ConsoleMonitor_text
+_ConsoleMonitor_Threads.text_since.__doc__ = _doc_ConsoleMonitor_text_since
 
 ConsoleMonitor_ZMQ_Threads.__doc__ = _doc_ConsoleMonitor_ZMQ
 ConsoleMonitor_HTTP_Threads.__doc__ = _doc_ConsoleMonitor_HTTP
@@ -835,6 +1462,7 @@ ConsoleMonitor_HTTP_Threads.__doc__ = _doc_ConsoleMonitor_HTTP
 _ConsoleMonitor_Async.disable_wait.__doc__ = _doc_ConsoleMonitor_disable_wait
 _ConsoleMonitor_Async.next_msg.__doc__ = _doc_ConsoleMonitor_next_msg
 _ConsoleMonitor_Async.text.__doc__ = _doc_ConsoleMonitor_text
+_ConsoleMonitor_Async.text_since.__doc__ = _doc_ConsoleMonitor_text_since
 
 ConsoleMonitor_ZMQ_Async.__doc__ = _doc_ConsoleMonitor_ZMQ
 ConsoleMonitor_HTTP_Async.__doc__ = _doc_ConsoleMonitor_HTTP
@@ -5,14 +5,24 @@ from .._defaults import (
     default_allow_request_fail_exceptions,
     default_http_request_timeout,
     default_http_login_timeout,
+    default_http_json_codec,
+    default_http_max_connections,
+    default_http_max_keepalive_connections,
+    default_http_keepalive_expiry,
+    default_http2,
+    default_http_token_refresh_margin,
     default_status_expiration_period,
     default_status_polling_period,
+    default_status_polling_period_min,
     default_console_monitor_poll_period,
     default_console_monitor_max_msgs,
     default_console_monitor_max_lines,
+    default_console_monitor_streaming,
+    default_console_monitor_overflow,
+    default_console_monitor_overflow_timeout,
 )
 
-from ..api_docstrings import _doc_REManagerAPI_HTTP
+from ..api_docstrings import _doc_REManagerAPI_HTTP, _doc_close
 
 
 class REManagerAPI(ReManagerComm_HTTP_Async, API_Async_Mixin):
@@ -26,9 +36,20 @@ class REManagerAPI(ReManagerComm_HTTP_Async, API_Async_Mixin):
         console_monitor_poll_period=default_console_monitor_poll_period,
         console_monitor_max_msgs=default_console_monitor_max_msgs,
         console_monitor_max_lines=default_console_monitor_max_lines,
+        console_monitor_streaming=default_console_monitor_streaming,
+        console_monitor_overflow=default_console_monitor_overflow,
+        console_monitor_overflow_timeout=default_console_monitor_overflow_timeout,
         request_fail_exceptions=default_allow_request_fail_exceptions,
         status_expiration_period=default_status_expiration_period,
         status_polling_period=default_status_polling_period,
+        status_polling_period_min=default_status_polling_period_min,
+        json_codec=default_http_json_codec,
+        http_max_connections=default_http_max_connections,
+        http_max_keepalive_connections=default_http_max_keepalive_connections,
+        http_keepalive_expiry=default_http_keepalive_expiry,
+        http2=default_http2,
+        token_refresh_margin=default_http_token_refresh_margin,
+        request_policies=None,
     ):
         ReManagerComm_HTTP_Async.__init__(
             self,
@@ -39,13 +60,30 @@ class REManagerAPI(ReManagerComm_HTTP_Async, API_Async_Mixin):
             console_monitor_poll_period=console_monitor_poll_period,
             console_monitor_max_msgs=console_monitor_max_msgs,
             console_monitor_max_lines=console_monitor_max_lines,
+            console_monitor_streaming=console_monitor_streaming,
+            console_monitor_overflow=console_monitor_overflow,
+            console_monitor_overflow_timeout=console_monitor_overflow_timeout,
             request_fail_exceptions=request_fail_exceptions,
+            json_codec=json_codec,
+            http_max_connections=http_max_connections,
+            http_max_keepalive_connections=http_max_keepalive_connections,
+            http_keepalive_expiry=http_keepalive_expiry,
+            http2=http2,
+            token_refresh_margin=token_refresh_margin,
+            request_policies=request_policies,
         )
         API_Async_Mixin.__init__(
             self,
             status_expiration_period=status_expiration_period,
             status_polling_period=status_polling_period,
+            status_polling_period_min=status_polling_period_min,
         )
 
+    async def close(self):
+        # Docstring is maintained separately
+        self._close_api()
+        await ReManagerComm_HTTP_Async.close(self)
+
 
 REManagerAPI.__doc__ = _doc_REManagerAPI_HTTP
+REManagerAPI.close.__doc__ = _doc_close
@@ -0,0 +1,258 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import math
+import os
+import threading
+
+from ._defaults import default_metrics_prefix, default_metrics_server_addr, default_metrics_server_port
+
+
+def _escape_label_value(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape_label_value(v)}"' for k, v in labels.items()) + "}"
+
+
+def _format_value(value):
+    if isinstance(value, float):
+        if math.isinf(value):
+            return "+Inf" if value > 0 else "-Inf"
+        return repr(value)
+    return str(int(value))
+
+
+class MetricsExporter:
+    """
+    Exports statistics collected by ``REManagerAPI`` (see ``REManagerAPI.stats()``) in Prometheus
+    text exposition format. The metrics include the numbers of requests and errors (by exception
+    class), request latency histograms, cache hits and misses, the current status polling period
+    and the number of messages in the console monitor queue. The rate of status polling
+    is the rate of ``<prefix>_requests_total{method="status"}`` counter. The metrics may be
+    rendered as text (``generate()``), written to a file for the textfile collector of
+    Prometheus Node Exporter (``write_textfile()``) or served from a local HTTP endpoint
+    (``start_server()``). The exporter works with synchronous and asynchronous versions of
+    ``REManagerAPI`` and does not send requests to RE Manager.
+
+    Parameters
+    ----------
+    RM: REManagerAPI
+        Instance of ``REManagerAPI`` (0MQ or HTTP, synchronous or asynchronous).
+    labels: dict or None
+        Labels added to each metric, e.g. ``{"client": "gui"}``. Default: ``None``.
+    prefix: str
+        Prefix of the metric names. Default: ``'qserver_api'``.
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        from bluesky_queueserver_api import MetricsExporter
+        from bluesky_queueserver_api.zmq import REManagerAPI
+
+        RM = REManagerAPI()
+        exporter = MetricsExporter(RM, labels={"client": "gui"})
+
+        # Metrics are available at http://127.0.0.1:9610/metrics
+        exporter.start_server()
+
+        # Alternatively, periodically write the metrics to a file
+        exporter.write_textfile("/var/lib/node_exporter/textfile/qserver_api.prom")
+
+        exporter.stop_server()
+        RM.close()
+    """
+
+    def __init__(self, RM, *, labels=None, prefix=default_metrics_prefix):
+        self._RM = RM
+        self._labels = dict(labels or {})
+        self._prefix = prefix
+        self._server = None
+        self._server_thread = None
+
+    def _metric(self, lines, name, mtype, doc, samples):
+        """
+        Append the metric to the list of lines. ``samples`` is a list of tuples
+        ``(suffix, labels, value)``.
+        """
+        name = f"{self._prefix}_{name}"
+        lines.append(f"# HELP {name} {doc}")
+        lines.append(f"# TYPE {name} {mtype}")
+        for suffix, labels, value in samples:
+            labels = dict(self._labels, **labels)
+            lines.append(f"{name}{suffix}{_format_labels(labels)} {_format_value(value)}")
+
+    def generate(self):
+        """
+        Generate metrics in Prometheus text exposition format.
+
+        Returns
+        -------
+        str
+            Text with metrics.
+        """
+        RM = self._RM
+        stats = RM.stats()
+        requests, cache = stats["requests"], stats["cache"]
+        lines = []
+
+        self._metric(
+            lines,
+            "requests_total",
+            "counter",
+            "The number of requests sent to RE Manager.",
+            [("", {"method": k}, v["count"]) for k, v in requests.items()],
+        )
+        self._metric(
+            lines,
+            "request_errors_total",
+            "counter",
+            "The number of failed requests by exception class.",
+            [
+                ("", {"method": k, "exception": ex_name}, n)
+                for k, v in requests.items()
+                for ex_name, n in v["errors"].items()
+            ],
+        )
+
+        samples = []
+        for k, v in requests.items():
+            n_total = 0
+            for bound, n in v["latency_buckets"]:
+                n_total += n  # Prometheus buckets are cumulative
+                samples.append(("_bucket", {"method": k, "le": _format_value(float(bound))}, n_total))
+            samples.append(("_sum", {"method": k}, float(v["latency_sum"])))
+            samples.append(("_count", {"method": k}, v["count"]))
+        self._metric(lines, "request_latency_seconds", "histogram", "Latency of requests in seconds.", samples)
+
+        self._metric(
+            lines,
+            "cache_hits_total",
+            "counter",
+            "The number of responses generated from cached data.",
+            [("", {"resource": k}, v["hits"]) for k, v in cache.items()],
+        )
+        self._metric(
+            lines,
+            "cache_misses_total",
+            "counter",
+            "The number of responses loaded from the server.",
+            [("", {"resource": k}, v["misses"]) for k, v in cache.items()],
+        )
+
+        polling_period = getattr(RM, "_status_polling_period_current", None)
+        if polling_period is not None:
+            self._metric(
+                lines,
+                "status_polling_period_seconds",
+                "gauge",
+                "Current period of polling RE Manager status while 'wait' operations are pending.",
+                [("", {}, float(polling_period))],
+            )
+
+        console_monitor = RM.console_monitor
+        if console_monitor is not None:
+            self._metric(
+                lines,
+                "console_monitor_queue_size",
+                "gauge",
+                "The number of console output messages in the queue of the console monitor.",
+                [("", {}, console_monitor.msg_queue_size)],
+            )
+
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path):
+        """
+        Write metrics to a file. The file is replaced atomically, so it could be used with
+        the textfile collector of Prometheus Node Exporter (the file name must have
+        the extension ``.prom``).
+
+        Parameters
+        ----------
+        path: str or os.PathLike
+            Path to the file.
+
+        Returns
+        -------
+        None
+        """
+        path = os.fspath(path)
+        path_tmp = f"{path}.{os.getpid()}.tmp"
+        with open(path_tmp, "w", encoding="utf-8") as f:
+            f.write(self.generate())
+        os.replace(path_tmp, path)
+
+    @property
+    def server_address(self):
+        """
+        The tuple ``(addr, port)`` of the running metrics server or ``None`` if the server
+        is not running. The port is useful if the server was started with ``port=0``.
+        """
+        return self._server.server_address[:2] if self._server else None
+
+    def start_server(self, *, addr=default_metrics_server_addr, port=default_metrics_server_port):
+        """
+        Start a local HTTP server in a background thread. The metrics are served
+        at the ``/metrics`` endpoint.
+
+        Parameters
+        ----------
+        addr: str
+            The address the server is listening on. Default: ``'127.0.0.1'``.
+        port: int
+            The port number. The port is selected automatically if the value is ``0``.
+            Default: ``9610``.
+
+        Returns
+        -------
+        None
+
+        Raises
+        ------
+        RuntimeError
+            The server is already running.
+        """
+        if self._server is not None:
+            raise RuntimeError("Metrics server is already running")
+
+        exporter = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                content = exporter.generate().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((addr, port), _Handler)
+        self._server.daemon_threads = True
+        self._server_thread = threading.Thread(
+            target=self._server.serve_forever, name="QS API - Metrics server", daemon=True
+        )
+        self._server_thread.start()
+
+    def stop_server(self):
+        """
+        Stop the metrics server. The call is ignored if the server is not running.
+
+        Returns
+        -------
+        None
+        """
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server_thread.join()
+            self._server, self._server_thread = None, None
@@ -0,0 +1,18 @@
+import pytest
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "benchmark: performance benchmark, skipped unless selected with '-m benchmark'"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    # Benchmarks are slow and their results depend on the system, so they are run only on request,
+    #   e.g. 'pytest -m benchmark -s' (the results are printed).
+    if "benchmark" in (config.getoption("markexpr") or ""):
+        return
+    skip_benchmark = pytest.mark.skip(reason="Benchmark: select with '-m benchmark' to run")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip_benchmark)
@@ -1,5 +1,6 @@
 import asyncio
 import getpass
+import logging
 import pytest
 import re
 import threading
@@ -155,6 +156,654 @@ def test_status_02(re_manager, fastapi_server, protocol, library, reload):  # no
         asyncio.run(testing())
 
 
+# fmt: off
+@pytest.mark.parametrize("library", ["THREADS", "ASYNC"])
+@pytest.mark.parametrize("protocol", ["ZMQ", "HTTP"])
+# fmt: on
+def test_status_03(re_manager, fastapi_server, protocol, library):  # noqa: F811
+    """
+    ``status``: check that the status engine is event-driven. The background thread (task) should
+    not wake up if status is not requested and no 'wait' operations are pending. While 'wait'
+    operations are pending, the status should be polled with the expected period.
+    """
+    rm_api_class = _select_re_manager_api(protocol, library)
+    polling_period = 0.2
+
+    def condition(status):
+        return False
+
+    if not _is_async(library):
+        RM = instantiate_re_api_class(
+            rm_api_class, status_polling_period=polling_period, status_polling_period_min=polling_period
+        )
+
+        ttime.sleep(1)
+        assert RM._status_engine_iterations == 0
+
+        RM.status()
+        n_iterations = RM._status_engine_iterations
+        assert 1 <= n_iterations <= 2
+
+        ttime.sleep(1)
+        assert RM._status_engine_iterations == n_iterations
+
+        with pytest.raises(RM.WaitTimeoutError):
+            RM._wait_for_condition(condition=condition, timeout=1, monitor=None)
+        assert 4 <= RM._status_engine_iterations - n_iterations <= 10
+
+        n_iterations = RM._status_engine_iterations
+        ttime.sleep(1)
+        assert RM._status_engine_iterations == n_iterations
+
+        RM.close()
+    else:
+
+        async def testing():
+            RM = instantiate_re_api_class(
+                rm_api_class, status_polling_period=polling_period, status_polling_period_min=polling_period
+            )
+
+            await asyncio.sleep(1)
+            assert RM._status_engine_iterations == 0
+
+            await RM.status()
+            n_iterations = RM._status_engine_iterations
+            assert 1 <= n_iterations <= 2
+
+            await asyncio.sleep(1)
+            assert RM._status_engine_iterations == n_iterations
+
+            with pytest.raises(RM.WaitTimeoutError):
+                await RM._wait_for_condition(condition=condition, timeout=1, monitor=None)
+            assert 4 <= RM._status_engine_iterations - n_iterations <= 10
+
+            n_iterations = RM._status_engine_iterations
+            await asyncio.sleep(1)
+            assert RM._status_engine_iterations == n_iterations
+
+            await RM.close()
+
+        asyncio.run(testing())
+
+
+# fmt: off
+@pytest.mark.parametrize("library", ["THREADS", "ASYNC"])
+@pytest.mark.parametrize("protocol", ["ZMQ", "HTTP"])
+# fmt: on
+def test_status_04(re_manager, fastapi_server, protocol, library):  # noqa: F811
+    """
+    ``status``: adaptive polling period. The polling period is set to the minimum value by API
+    that change the state of RE Manager and exponentially increased up to the maximum value
+    while the status is not changing. The minimum polling period is used while the queue is running.
+    """
+    rm_api_class = _select_re_manager_api(protocol, library)
+    period_min, period_max = 0.1, 0.4
+    params = {"status_polling_period": period_max, "status_polling_period_min": period_min}
+
+    def condition(status):
+        return False
+
+    if not _is_async(library):
+        RM = instantiate_re_api_class(rm_api_class, **params)
+        assert RM._status_polling_period_current == period_max
+
+        RM.environment_open()
+        assert RM._status_polling_period_current == period_min
+        RM.wait_for_idle(timeout=30)
+
+        with pytest.raises(RM.WaitTimeoutError):
+            RM._wait_for_condition(condition=condition, timeout=2, monitor=None)
+        assert RM._status_polling_period_current == period_max
+
+        # The minimum polling period is used while the queue is running
+        RM.item_add(BPlan("count", ["det1", "det2"], num=5, delay=1))
+        RM.queue_start()
+        with pytest.raises(RM.WaitTimeoutError):
+            RM._wait_for_condition(condition=condition, timeout=2, monitor=None)
+        assert RM.status()["manager_state"] == "executing_queue"
+        assert RM._status_polling_period_current == period_min
+        RM.wait_for_idle(timeout=30)
+
+        RM.environment_close()
+        assert RM._status_polling_period_current == period_min
+        RM.wait_for_idle(timeout=30)
+
+        RM.close()
+    else:
+
+        async def testing():
+            RM = instantiate_re_api_class(rm_api_class, **params)
+            assert RM._status_polling_period_current == period_max
+
+            await RM.environment_open()
+            assert RM._status_polling_period_current == period_min
+            await RM.wait_for_idle(timeout=30)
+
+            with pytest.raises(RM.WaitTimeoutError):
+                await RM._wait_for_condition(condition=condition, timeout=2, monitor=None)
+            assert RM._status_polling_period_current == period_max
+
+            # The minimum polling period is used while the queue is running
+            await RM.item_add(BPlan("count", ["det1", "det2"], num=5, delay=1))
+            await RM.queue_start()
+            with pytest.raises(RM.WaitTimeoutError):
+                await RM._wait_for_condition(condition=condition, timeout=2, monitor=None)
+            assert (await RM.status())["manager_state"] == "executing_queue"
+            assert RM._status_polling_period_current == period_min
+            await RM.wait_for_idle(timeout=30)
+
+            await RM.environment_close()
+            assert RM._status_polling_period_current == period_min
+            await RM.wait_for_idle(timeout=30)
+
+            await RM.close()
+
+        asyncio.run(testing())
+
+
+# fmt: off
+@pytest.mark.parametrize("library", ["THREADS", "ASYNC"])
+@pytest.mark.parametrize("protocol", ["ZMQ", "HTTP"])
+# fmt: on
+def test_status_05(re_manager, fastapi_server, protocol, library):  # noqa: F811
+    """
+    ``_wait_for_condition``: multiple concurrent 'wait' operations. Timeouts should occur at
+    the deadlines independently of the status polling period. Cancelled operations and
+    operations with modified timeout should be completed without waiting for the next poll.
+    """
+    rm_api_class = _select_re_manager_api(protocol, library)
+    polling_period = 10
+    params = {"status_polling_period": polling_period, "status_polling_period_min": polling_period}
+    timeouts = [0.5 + 0.1 * n for n in range(10)]
+
+    def condition(status):
+        return False
+
+    def check_elapsed(elapsed, timeout):
+        assert timeout <= elapsed < timeout + 0.5
+
+    if not _is_async(library):
+        RM = instantiate_re_api_class(rm_api_class, **params)
+        RM.status()
+
+        results = [None] * len(timeouts)
+
+        def wait(n):
+            t0 = ttime.time()
+            try:
+                RM._wait_for_condition(condition=condition, timeout=timeouts[n], monitor=None)
+            except RM.WaitTimeoutError:
+                results[n] = ttime.time() - t0
+
+        threads = [threading.Thread(target=wait, args=(n,)) for n in range(len(timeouts))]
+        for th in threads:
+            th.start()
+        for th in threads:
+            th.join()
+        for elapsed, timeout in zip(results, timeouts):
+            check_elapsed(elapsed, timeout)
+        assert not RM._wait_cb
+
+        # Cancel the operation
+        monitor = WaitMonitor()
+        threading.Timer(0.5, monitor.cancel).start()
+        t0 = ttime.time()
+        with pytest.raises(RM.WaitCancelError):
+            RM._wait_for_condition(condition=condition, timeout=30, monitor=monitor)
+        check_elapsed(ttime.time() - t0, 0.5)
+
+        # Reduce timeout while waiting
+        monitor = WaitMonitor()
+        threading.Timer(0.2, monitor.set_timeout, args=(0.5,)).start()
+        t0 = ttime.time()
+        with pytest.raises(RM.WaitTimeoutError):
+            RM._wait_for_condition(condition=condition, timeout=30, monitor=monitor)
+        check_elapsed(ttime.time() - t0, 0.5)
+
+        RM.close()
+    else:
+
+        async def testing():
+            RM = instantiate_re_api_class(rm_api_class, **params)
+            await RM.status()
+
+            async def wait(timeout):
+                t0 = ttime.time()
+                try:
+                    await RM._wait_for_condition(condition=condition, timeout=timeout, monitor=None)
+                except RM.WaitTimeoutError:
+                    return ttime.time() - t0
+
+            results = await asyncio.gather(*[wait(_) for _ in timeouts])
+            for elapsed, timeout in zip(results, timeouts):
+                check_elapsed(elapsed, timeout)
+            assert not RM._wait_cb
+
+            loop = asyncio.get_running_loop()
+
+            # Cancel the operation
+            monitor = WaitMonitor()
+            loop.call_later(0.5, monitor.cancel)
+            t0 = ttime.time()
+            with pytest.raises(RM.WaitCancelError):
+                await RM._wait_for_condition(condition=condition, timeout=30, monitor=monitor)
+            check_elapsed(ttime.time() - t0, 0.5)
+
+            # Reduce timeout while waiting
+            monitor = WaitMonitor()
+            loop.call_later(0.2, monitor.set_timeout, 0.5)
+            t0 = ttime.time()
+            with pytest.raises(RM.WaitTimeoutError):
+                await RM._wait_for_condition(condition=condition, timeout=30, monitor=monitor)
+            check_elapsed(ttime.time() - t0, 0.5)
+
+            await RM.close()
+
+        asyncio.run(testing())
+
+
+# fmt: off
+@pytest.mark.parametrize("library", ["THREADS", "ASYNC"])
+@pytest.mark.parametrize("protocol", ["ZMQ", "HTTP"])
+# fmt: on
+def test_status_06(re_manager, fastapi_server, protocol, library):  # noqa: F811
+    """
+    ``status``: status cache is shared by API instances connected to the same RE Manager. The shared
+    cache is released when the last instance is closed.
+    """
+    from bluesky_queueserver_api.api_base import _shared_status_caches
+
+    rm_api_class = _select_re_manager_api(protocol, library)
+    n_requests = {}
+
+    def count_status_requests(RM, name):
+        n_requests[name] = 0
+        send_request = RM.send_request
+
+        if not _is_async(library):
+
+            def send_request_counted(*, method, **kwargs):
+                if method == "status":
+                    n_requests[name] += 1
+                return send_request(method=method, **kwargs)
+
+        else:
+
+            async def send_request_counted(*, method, **kwargs):
+                if method == "status":
+                    n_requests[name] += 1
+                return await send_request(method=method, **kwargs)
+
+        RM.send_request = send_request_counted
+
+    if not _is_async(library):
+        RM1 = instantiate_re_api_class(rm_api_class)
+        RM2 = instantiate_re_api_class(rm_api_class)
+        count_status_requests(RM1, "RM1")
+        count_status_requests(RM2, "RM2")
+        key = RM1._status_cache_key
+        assert _shared_status_caches[key].ref_count == 2
+
+        RM1.status()
+        RM2.status()
+        assert n_requests == {"RM1": 1, "RM2": 0}
+
+        # The cache is invalidated by API that change the state of RE Manager
+        RM1.item_add(BPlan("count", ["det1"]))
+        assert RM2.status()["items_in_queue"] == 1
+        assert n_requests == {"RM1": 1, "RM2": 1}
+        RM1.queue_clear()
+
+        RM1.close()
+        assert _shared_status_caches[key].ref_count == 1
+        RM2.close()
+        assert key not in _shared_status_caches
+    else:
+
+        async def testing():
+            RM1 = instantiate_re_api_class(rm_api_class)
+            RM2 = instantiate_re_api_class(rm_api_class)
+            count_status_requests(RM1, "RM1")
+            count_status_requests(RM2, "RM2")
+            key = RM1._status_cache_key
+            assert _shared_status_caches[key].ref_count == 2
+
+            await RM1.status()
+            await RM2.status()
+            assert n_requests == {"RM1": 1, "RM2": 0}
+
+            # The cache is invalidated by API that change the state of RE Manager
+            await RM1.item_add(BPlan("count", ["det1"]))
+            assert (await RM2.status())["items_in_queue"] == 1
+            assert n_requests == {"RM1": 1, "RM2": 1}
+            await RM1.queue_clear()
+
+            await RM1.close()
+            assert _shared_status_caches[key].ref_count == 1
+            await RM2.close()
+            assert key not in _shared_status_caches
+
+        asyncio.run(testing())
+
+
+# fmt: off
+@pytest.mark.parametrize("library", ["THREADS", "ASYNC"])
+@pytest.mark.parametrize("protocol", ["ZMQ", "HTTP"])
+# fmt: on
+def test_status_07(re_manager, fastapi_server, protocol, library):  # noqa: F811
+    """
+    ``status``: API instances connected to the same RE Manager share a single stream of status polls.
+    The status loaded by one instance is processed by the other instances, which do not send
+    their own requests.
+    """
+    rm_api_class = _select_re_manager_api(protocol, library)
+    n_requests = {}
+    n_calls = {"RM1": 0, "RM2": 0}
+    # Short expiration period: the instances can not reuse the status if they are polling independently
+    params = {"status_polling_period": 1.0, "status_polling_period_min": 1.0, "status_expiration_period": 0.1}
+    t_polling = 3.5
+
+    def count_status_requests(RM, name):
+        n_requests[name] = 0
+        send_request = RM.send_request
+
+        if not _is_async(library):
+
+            def send_request_counted(*, method, **kwargs):
+                if method == "status":
+                    n_requests[name] += 1
+                return send_request(method=method, **kwargs)
+
+        else:
+
+            async def send_request_counted(*, method, **kwargs):
+                if method == "status":
+                    n_requests[name] += 1
+                return await send_request(method=method, **kwargs)
+
+        RM.send_request = send_request_counted
+
+    def cb1(status, diff):
+        n_calls["RM1"] += 1
+
+    def cb2(status, diff):
+        n_calls["RM2"] += 1
+
+    if not _is_async(library):
+        RM1 = instantiate_re_api_class(rm_api_class, **params)
+        RM2 = instantiate_re_api_class(rm_api_class, **params)
+        count_status_requests(RM1, "RM1")
+        count_status_requests(RM2, "RM2")
+
+        # Polls of the instances are not synchronized
+        RM1.subscribe_status(cb1)
+        ttime.sleep(0.5)
+        RM2.subscribe_status(cb2)
+        ttime.sleep(t_polling)
+
+        # Each instance would send at least 4 requests if the instances were polling independently
+        assert sum(n_requests.values()) <= 5, n_requests
+        assert n_calls["RM1"] >= 1 and n_calls["RM2"] >= 1
+
+        RM1.close()
+        RM2.close()
+    else:
+
+        async def testing():
+            RM1 = instantiate_re_api_class(rm_api_class, **params)
+            RM2 = instantiate_re_api_class(rm_api_class, **params)
+            count_status_requests(RM1, "RM1")
+            count_status_requests(RM2, "RM2")
+
+            # Polls of the instances are not synchronized
+            await RM1.subscribe_status(cb1)
+            await asyncio.sleep(0.5)
+            await RM2.subscribe_status(cb2)
+            await asyncio.sleep(t_polling)
+
+            # Each instance would send at least 4 requests if the instances were polling independently
+            assert sum(n_requests.values()) <= 5, n_requests
+            assert n_calls["RM1"] >= 1 and n_calls["RM2"] >= 1
+
+            await RM1.close()
+            await RM2.close()
+
+        asyncio.run(testing())
+
+
+# fmt: off
+@pytest.mark.parametrize("library", ["THREADS", "ASYNC"])
+@pytest.mark.parametrize("protocol", ["ZMQ", "HTTP"])
+# fmt: on
+def test_subscribe_status_01(re_manager, fastapi_server, protocol, library):  # noqa: F811
+    """
+    ``subscribe_status``, ``unsubscribe_status``: basic test. Check that subscribers are called
+    only when the watched fields are changed.
+    """
+    rm_api_class = _select_re_manager_api(protocol, library)
+    params = {"status_polling_period": 0.2, "status_polling_period_min": 0.1}
+    item = BPlan("count", ["det1", "det2"], num=1, delay=0)
+
+    diffs_all, diffs_queue = [], []
+
+    def cb_all(status, diff):
+        assert isinstance(status, dict)
+        diffs_all.append(diff)
+
+    def cb_queue(status, diff):
+        assert status["plan_queue_uid"] == diff["plan_queue_uid"][1]
+        diffs_queue.append(diff)
+
+    def check_subscriptions():
+        assert len(diffs_all) >= 3
+        assert "manager_state" in diffs_all[0]
+        assert all(diffs_all)
+
+        assert len(diffs_queue) == 2
+        assert all(list(_) == ["plan_queue_uid"] for _ in diffs_queue)
+        assert diffs_queue[0]["plan_queue_uid"][0] is None
+        assert diffs_queue[1]["plan_queue_uid"][0] == diffs_queue[0]["plan_queue_uid"][1]
+
+    if not _is_async(library):
+        RM = instantiate_re_api_class(rm_api_class, **params)
+
+        with pytest.raises(TypeError, match="Callback must be callable"):
+            RM.subscribe_status(10)
+        with pytest.raises(TypeError, match="Field names must be strings"):
+            RM.subscribe_status(cb_all, fields=[10])
+
+        RM.subscribe_status(cb_all)
+        RM.subscribe_status(cb_queue, fields="plan_queue_uid")
+        ttime.sleep(1)
+
+        RM.item_add(item)
+        RM.environment_open()
+        RM.wait_for_idle(timeout=30)
+        ttime.sleep(1)
+        check_subscriptions()
+
+        RM.unsubscribe_status(cb_all)
+        RM.unsubscribe_status(cb_queue)
+        n_all = len(diffs_all)
+        RM.environment_close()
+        RM.wait_for_idle(timeout=30)
+        RM.item_remove()
+        ttime.sleep(1)
+        assert len(diffs_all) == n_all
+        assert len(diffs_queue) == 2
+
+        RM.close()
+    else:
+
+        async def testing():
+            RM = instantiate_re_api_class(rm_api_class, **params)
+
+            with pytest.raises(TypeError, match="Callback must be callable"):
+                await RM.subscribe_status(10)
+            with pytest.raises(TypeError, match="Field names must be strings"):
+                await RM.subscribe_status(cb_all, fields=[10])
+
+            async def cb_queue_async(status, diff):
+                cb_queue(status, diff)
+
+            await RM.subscribe_status(cb_all)
+            await RM.subscribe_status(cb_queue_async, fields="plan_queue_uid")
+            await asyncio.sleep(1)
+
+            await RM.item_add(item)
+            await RM.environment_open()
+            await RM.wait_for_idle(timeout=30)
+            await asyncio.sleep(1)
+            check_subscriptions()
+
+            await RM.unsubscribe_status(cb_all)
+            await RM.unsubscribe_status(cb_queue_async)
+            n_all = len(diffs_all)
+            await RM.environment_close()
+            await RM.wait_for_idle(timeout=30)
+            await RM.item_remove()
+            await asyncio.sleep(1)
+            assert len(diffs_all) == n_all
+            assert len(diffs_queue) == 2
+
+            await RM.close()
+
+        asyncio.run(testing())
+
+
+# fmt: off
+@pytest.mark.parametrize("library", ["THREADS", "ASYNC"])
+@pytest.mark.parametrize("protocol", ["ZMQ", "HTTP"])
+# fmt: on
+def test_subscribe_status_02(re_manager, fastapi_server, protocol, library, caplog):  # noqa: F811
+    """
+    ``subscribe_status``: exceptions raised by callbacks are logged and do not prevent
+    other callbacks from being called.
+    """
+    rm_api_class = _select_re_manager_api(protocol, library)
+    params = {"status_polling_period": 0.2, "status_polling_period_min": 0.1}
+    statuses = []
+
+    def cb_failing(status, diff):
+        raise RuntimeError("Callback failed")
+
+    def cb(status, diff):
+        statuses.append(status)
+
+    def check_log():
+        assert len(statuses) >= 1
+        records = [_ for _ in caplog.records if "status subscriber callback" in _.getMessage()]
+        assert len(records) >= 1
+        assert records[0].levelname == "ERROR"
+        assert "Callback failed" in records[0].getMessage()
+
+    caplog.set_level(logging.ERROR)
+
+    if not _is_async(library):
+        RM = instantiate_re_api_class(rm_api_class, **params)
+
+        RM.subscribe_status(cb_failing)
+        RM.subscribe_status(cb)
+        ttime.sleep(1)
+        check_log()
+
+        RM.close()
+    else:
+
+        async def testing():
+            RM = instantiate_re_api_class(rm_api_class, **params)
+
+            await RM.subscribe_status(cb_failing)
+            await RM.subscribe_status(cb)
+            await asyncio.sleep(1)
+            check_log()
+
+            await RM.close()
+
+        asyncio.run(testing())
+
+
+# fmt: off
+@pytest.mark.parametrize("library", ["THREADS", "ASYNC"])
+@pytest.mark.parametrize("protocol", ["ZMQ", "HTTP"])
+# fmt: on
+def test_stats_01(re_manager, fastapi_server, protocol, library):  # noqa: F811
+    """
+    ``add_request_hooks``, ``remove_request_hooks``, ``stats``, ``stats_reset``: basic test.
+    """
+    rm_api_class = _select_re_manager_api(protocol, library)
+    methods_pre, methods_post = [], []
+
+    def pre_request(*, method, params):
+        methods_pre.append(method)
+
+    def post_request(*, method, params, response, exception, latency):
+        methods_post.append((method, response is not None, exception is not None))
+
+    def check_stats(stats):
+        requests = stats["requests"]
+        assert requests["queue_get"]["count"] == 1
+        assert requests["queue_get"]["failed"] == 0
+        assert requests["queue_item_get"]["count"] == 1
+        assert requests["queue_item_get"]["failed"] == 1
+        assert sum(_[1] for _ in requests["queue_get"]["latency_buckets"]) == 1
+        assert 0 < requests["queue_get"]["latency_sum"] == requests["queue_get"]["latency_max"]
+        assert stats["cache"]["queue_get"] == {"hits": 2, "misses": 1}
+        assert sum(stats["cache"]["status"].values()) >= 1
+
+        assert "queue_get" in methods_pre
+        assert ("queue_get", True, False) in methods_post
+        assert ("queue_item_get", False, True) in methods_post
+        assert len(methods_pre) == len(methods_post)
+
+    if not _is_async(library):
+        RM = instantiate_re_api_class(rm_api_class)
+        RM.stats_reset()
+        RM.add_request_hooks(pre_request=pre_request, post_request=post_request)
+
+        for _ in range(3):
+            RM.queue_get()
+        with pytest.raises(RM.RequestFailedError):
+            RM.item_get(uid="nonexisting-uid")
+        check_stats(RM.stats())
+
+        RM.remove_request_hooks(pre_request=pre_request, post_request=post_request)
+        RM.stats_reset()
+        assert RM.stats() == {"requests": {}, "cache": {}}
+
+        n_calls = len(methods_pre)
+        RM.queue_get(reload=True)
+        assert len(methods_pre) == n_calls
+        assert RM.stats()["requests"]["status"]["count"] == 1
+
+        RM.close()
+    else:
+
+        async def testing():
+            RM = instantiate_re_api_class(rm_api_class)
+            RM.stats_reset()
+            RM.add_request_hooks(pre_request=pre_request, post_request=post_request)
+
+            for _ in range(3):
+                await RM.queue_get()
+            with pytest.raises(RM.RequestFailedError):
+                await RM.item_get(uid="nonexisting-uid")
+            check_stats(RM.stats())
+
+            RM.remove_request_hooks(pre_request=pre_request, post_request=post_request)
+            RM.stats_reset()
+            assert RM.stats() == {"requests": {}, "cache": {}}
+
+            n_calls = len(methods_pre)
+            await RM.queue_get(reload=True)
+            assert len(methods_pre) == n_calls
+            assert RM.stats()["requests"]["status"]["count"] == 1
+
+            await RM.close()
+
+        asyncio.run(testing())
+
+
 # fmt: off
 @pytest.mark.parametrize("destroy", [False, True])
 @pytest.mark.parametrize("library", ["THREADS", "ASYNC"])
@@ -910,64 +1559,313 @@ def test_item_add_batch_02(re_manager, fastapi_server, protocol, library):  # no
             resp4 = await RM.item_get(pos=1)
             assert resp4["item"]["kwargs"]["num"] == 4
 
-            check_resp(await RM.item_add_batch([item5], after_uid=resp3["item"]["item_uid"]))
-            resp5 = await RM.item_get(pos=3)
-            assert resp5["item"]["kwargs"]["num"] == 5
+            check_resp(await RM.item_add_batch([item5], after_uid=resp3["item"]["item_uid"]))
+            resp5 = await RM.item_get(pos=3)
+            assert resp5["item"]["kwargs"]["num"] == 5
+            await RM.close()
+
+        asyncio.run(testing())
+
+
+# fmt: off
+@pytest.mark.parametrize("library", ["THREADS", "ASYNC"])
+@pytest.mark.parametrize("protocol", ["ZMQ", "HTTP"])
+# fmt: on
+def test_item_add_batch_03(re_manager, fastapi_server, protocol, library):  # noqa: F811
+    """
+    ``item_add_batch``: test that 'user' and 'user_group' parameters override defaults
+    """
+    rm_api_class = _select_re_manager_api(protocol, library)
+    item = BPlan("count", ["det1", "det2"], num=10, delay=1)
+
+    user, user_group = "some user", "test_user"
+
+    def check_resp(resp):
+        assert resp["success"] is True
+        assert resp["msg"] == ""
+
+    def check_status(status, items_in_queue):
+        assert status["items_in_queue"] == items_in_queue
+
+    if not _is_async(library):
+        RM = instantiate_re_api_class(rm_api_class)
+        check_status(RM.status(), 0)
+        resp = RM.item_add_batch([item], user=user, user_group=user_group)
+        check_resp(resp)
+        if protocol != "HTTP":
+            assert resp["items"][0]["user"] == user
+            assert resp["items"][0]["user_group"] == user_group
+        else:
+            assert resp["items"][0]["user"] != user
+            assert resp["items"][0]["user_group"] != user_group
+        check_status(RM.status(), 1)
+        RM.close()
+    else:
+
+        async def testing():
+            RM = instantiate_re_api_class(rm_api_class)
+            check_status(await RM.status(), 0)
+            resp = await RM.item_add_batch([item], user=user, user_group=user_group)
+            check_resp(resp)
+            if protocol != "HTTP":
+                assert resp["items"][0]["user"] == user
+                assert resp["items"][0]["user_group"] == user_group
+            else:
+                assert resp["items"][0]["user"] != user
+                assert resp["items"][0]["user_group"] != user_group
+            check_status(await RM.status(), 1)
+            await RM.close()
+
+        asyncio.run(testing())
+
+
+# fmt: off
+@pytest.mark.parametrize("library", ["THREADS", "ASYNC"])
+@pytest.mark.parametrize("protocol", ["ZMQ", "HTTP"])
+# fmt: on
+def test_item_add_batch_04(re_manager, fastapi_server, protocol, library):  # noqa: F811
+    """
+    ``item_add_batch``: the batch is split into chunks. The order of items is preserved,
+    the progress is reported using the callback.
+    """
+    rm_api_class = _select_re_manager_api(protocol, library)
+    n_items, chunk_size = 25, 10
+    items = [BPlan("count", ["det1", "det2"], num=_, delay=1) for _ in range(n_items)]
+    items_invalid = items[:15] + [BPlan("nonexistent_plan")] + items[16:]
+    item_existing = BPlan("count", ["det1"], num=100, delay=1)
+    progress = []
+
+    def check_resp(resp, items_expected):
+        assert resp["success"] is True
+        assert resp["msg"] == ""
+        assert [_["kwargs"]["num"] for _ in resp["items"]] == [_.kwargs["num"] for _ in items_expected]
+        assert len(resp["results"]) == len(items_expected)
+        assert all([_["success"] for _ in resp["results"]])
+
+    def check_failed_resp(resp):
+        assert resp["success"] is False
+        assert "Chunk #2 of 3 was rejected (10 items were added to the queue)" in resp["msg"]
+        assert len(resp["items"]) == n_items
+        assert [_["success"] for _ in resp["results"]][:10] == [True] * 10
+        assert resp["results"][-1] == {"success": False, "msg": "The item was not submitted"}
+
+    if not _is_async(library):
+        RM = instantiate_re_api_class(rm_api_class)
+
+        for chunk_size_invalid in (0, -1, 2.5, "10", True):
+            with pytest.raises(ValueError, match="must be a positive integer"):
+                RM.item_add_batch(items, chunk_size=chunk_size_invalid)
+
+        RM.item_add(item_existing)
+        resp = RM.item_add_batch(
+            items, pos="front", chunk_size=chunk_size, progress_callback=lambda *args: progress.append(args)
+        )
+        check_resp(resp, items)
+        assert progress == [(10, 25), (20, 25), (25, 25)]
+        queue = RM.queue_get()["items"]
+        assert [_["kwargs"]["num"] for _ in queue] == list(range(n_items)) + [100]
+        assert [_["item_uid"] for _ in queue[:n_items]] == [_["item_uid"] for _ in resp["items"]]
+
+        # Batch that fits in a single chunk
+        progress.clear()
+        resp = RM.item_add_batch(
+            items[:5], chunk_size=chunk_size, progress_callback=lambda *args: progress.append(args)
+        )
+        check_resp(resp, items[:5])
+        assert progress == [(5, 5)]
+
+        RM.queue_clear()
+        with pytest.raises(RM.RequestFailedError, match="Chunk #2 of 3 was rejected") as ex:
+            RM.item_add_batch(items_invalid, chunk_size=chunk_size)
+        check_failed_resp(ex.value.response)
+        assert RM.status(reload=True)["items_in_queue"] == 10
+
+        RM.queue_clear()
+        RM.close()
+
+        RM = instantiate_re_api_class(rm_api_class, request_fail_exceptions=False)
+        check_failed_resp(RM.item_add_batch(items_invalid, chunk_size=chunk_size))
+        RM.queue_clear()
+        RM.close()
+    else:
+
+        async def testing():
+            RM = instantiate_re_api_class(rm_api_class)
+
+            async def progress_cb(*args):
+                progress.append(args)
+
+            await RM.item_add(item_existing)
+            resp = await RM.item_add_batch(
+                items, pos="front", chunk_size=chunk_size, progress_callback=progress_cb
+            )
+            check_resp(resp, items)
+            assert progress == [(10, 25), (20, 25), (25, 25)]
+            queue = (await RM.queue_get())["items"]
+            assert [_["kwargs"]["num"] for _ in queue] == list(range(n_items)) + [100]
+
+            await RM.queue_clear()
+            with pytest.raises(RM.RequestFailedError, match="Chunk #2 of 3 was rejected") as ex:
+                await RM.item_add_batch(items_invalid, chunk_size=chunk_size)
+            check_failed_resp(ex.value.response)
+            assert (await RM.status(reload=True))["items_in_queue"] == 10
+
+            await RM.queue_clear()
+            await RM.close()
+
+        asyncio.run(testing())
+
+
+# fmt: off
+@pytest.mark.parametrize("library", ["THREADS", "ASYNC"])
+@pytest.mark.parametrize("protocol", ["ZMQ", "HTTP"])
+# fmt: on
+def test_item_add_batching_01(re_manager, fastapi_server, protocol, library):  # noqa: F811
+    """
+    ``batching``: concurrent ``item_add`` calls are combined in a single ``queue_item_add_batch`` request.
+    If the batch is rejected, the items are submitted individually.
+    """
+    rm_api_class = _select_re_manager_api(protocol, library)
+    n_items = 10
+    items = [BPlan("count", ["det1", "det2"], num=_, delay=1) for _ in range(n_items)]
+    items_invalid = items[:-1] + [BPlan("nonexistent_plan")]
+    n_requests = {"queue_item_add": 0, "queue_item_add_batch": 0}
+
+    def count_requests(RM):
+        send_request = RM.send_request
+
+        if not _is_async(library):
+
+            def send_request_counted(*, method, **kwargs):
+                if method in n_requests:
+                    n_requests[method] += 1
+                return send_request(method=method, **kwargs)
+
+        else:
+
+            async def send_request_counted(*, method, **kwargs):
+                if method in n_requests:
+                    n_requests[method] += 1
+                return await send_request(method=method, **kwargs)
+
+        RM.send_request = send_request_counted
+
+    def check_responses(responses, n_success):
+        assert len(responses) == n_items
+        assert sum([_["success"] for _ in responses]) == n_success
+        for resp in responses:
+            if resp["success"]:
+                assert resp["msg"] == ""
+                assert resp["item"]["item_uid"]
+            else:
+                assert "nonexistent_plan" in resp["msg"]
+        assert len(set([_["item"]["item_uid"] for _ in responses if _["success"]])) == n_success
+
+    if not _is_async(library):
+        RM = instantiate_re_api_class(rm_api_class, request_fail_exceptions=False)
+        count_requests(RM)
+
+        with pytest.raises(ValueError, match="must be a non-negative number"):
+            with RM.batching(window=-1):
+                pass
+
+        def add_items(items):
+            responses = [None] * len(items)
+
+            def add_item(n):
+                responses[n] = RM.item_add(items[n])
+
+            threads = [threading.Thread(target=add_item, args=(_,)) for _ in range(len(items))]
+            for th in threads:
+                th.start()
+            for th in threads:
+                th.join()
+            return responses
+
+        with RM.batching(window=0.5):
+            check_responses(add_items(items), n_items)
+        assert n_requests == {"queue_item_add": 0, "queue_item_add_batch": 1}
+        assert RM.status(reload=True)["items_in_queue"] == n_items
+
+        with RM.batching(window=0.5):
+            check_responses(add_items(items_invalid), n_items - 1)
+        assert n_requests == {"queue_item_add": n_items, "queue_item_add_batch": 2}
+        assert RM.status(reload=True)["items_in_queue"] == 2 * n_items - 1
+
+        # Batching is disabled outside the context
+        RM.item_add(items[0])
+        assert n_requests == {"queue_item_add": n_items + 1, "queue_item_add_batch": 2}
+
+        RM.queue_clear()
+        RM.close()
+    else:
+
+        async def testing():
+            RM = instantiate_re_api_class(rm_api_class, request_fail_exceptions=False)
+            count_requests(RM)
+
+            with RM.batching(window=0.5):
+                check_responses(await asyncio.gather(*[RM.item_add(_) for _ in items]), n_items)
+            assert n_requests == {"queue_item_add": 0, "queue_item_add_batch": 1}
+            queue = (await RM.queue_get())["items"]
+            assert [_["kwargs"]["num"] for _ in queue] == list(range(n_items))
+
+            with RM.batching(window=0.5):
+                check_responses(await asyncio.gather(*[RM.item_add(_) for _ in items_invalid]), n_items - 1)
+            assert n_requests == {"queue_item_add": n_items, "queue_item_add_batch": 2}
+
+            # The items are inserted in the same order as by sequential calls
+            await RM.queue_clear()
+            with RM.batching(window=0.5):
+                await asyncio.gather(*[RM.item_add(_, pos="front") for _ in items[:3]])
+            queue = (await RM.queue_get())["items"]
+            assert [_["kwargs"]["num"] for _ in queue] == [2, 1, 0]
+            assert n_requests == {"queue_item_add": n_items, "queue_item_add_batch": 3}
+
+            await RM.queue_clear()
             await RM.close()
 
         asyncio.run(testing())
 
 
 # fmt: off
-@pytest.mark.parametrize("library", ["THREADS", "ASYNC"])
 @pytest.mark.parametrize("protocol", ["ZMQ", "HTTP"])
 # fmt: on
-def test_item_add_batch_03(re_manager, fastapi_server, protocol, library):  # noqa: F811
+def test_item_add_batching_02(re_manager, fastapi_server, protocol):  # noqa: F811
     """
-    ``item_add_batch``: test that 'user' and 'user_group' parameters override defaults
+    ``batching`` (async API): the first caller, which sends the batch, is cancelled while waiting
+    for other items. The callers that joined the batch are not blocked, the next ``item_add`` call
+    starts a new batch.
     """
-    rm_api_class = _select_re_manager_api(protocol, library)
-    item = BPlan("count", ["det1", "det2"], num=10, delay=1)
+    rm_api_class = _select_re_manager_api(protocol, "ASYNC")
+    items = [BPlan("count", ["det1", "det2"], num=_, delay=1) for _ in range(3)]
 
-    user, user_group = "some user", "test_user"
+    async def testing():
+        RM = instantiate_re_api_class(rm_api_class)
 
-    def check_resp(resp):
-        assert resp["success"] is True
-        assert resp["msg"] == ""
+        with RM.batching(window=1):
+            task_sender = asyncio.create_task(RM.item_add(items[0]))
+            await asyncio.sleep(0.2)
+            task_joined = asyncio.create_task(RM.item_add(items[1]))
+            await asyncio.sleep(0.2)
+            task_sender.cancel()
 
-    def check_status(status, items_in_queue):
-        assert status["items_in_queue"] == items_in_queue
+            results = await asyncio.wait_for(
+                asyncio.gather(task_sender, task_joined, return_exceptions=True), timeout=5
+            )
+            assert all(isinstance(_, asyncio.CancelledError) for _ in results), results
+            assert RM._item_add_batch is None
 
-    if not _is_async(library):
-        RM = instantiate_re_api_class(rm_api_class)
-        check_status(RM.status(), 0)
-        resp = RM.item_add_batch([item], user=user, user_group=user_group)
-        check_resp(resp)
-        if protocol != "HTTP":
-            assert resp["items"][0]["user"] == user
-            assert resp["items"][0]["user_group"] == user_group
-        else:
-            assert resp["items"][0]["user"] != user
-            assert resp["items"][0]["user_group"] != user_group
-        check_status(RM.status(), 1)
-        RM.close()
-    else:
+            resp = await asyncio.wait_for(RM.item_add(items[2]), timeout=5)
+            assert resp["success"] is True
 
-        async def testing():
-            RM = instantiate_re_api_class(rm_api_class)
-            check_status(await RM.status(), 0)
-            resp = await RM.item_add_batch([item], user=user, user_group=user_group)
-            check_resp(resp)
-            if protocol != "HTTP":
-                assert resp["items"][0]["user"] == user
-                assert resp["items"][0]["user_group"] == user_group
-            else:
-                assert resp["items"][0]["user"] != user
-                assert resp["items"][0]["user_group"] != user_group
-            check_status(await RM.status(), 1)
-            await RM.close()
+        queue = (await RM.queue_get())["items"]
+        assert [_["kwargs"]["num"] for _ in queue] == [2]
 
-        asyncio.run(testing())
+        await RM.queue_clear()
+        await RM.close()
+
+    asyncio.run(testing())
 
 
 # fmt: off
@@ -1372,6 +2270,155 @@ def test_queue_clear_01(re_manager, fastapi_server, protocol, library):  # noqa:
         asyncio.run(testing())
 
 
+# fmt: off
+@pytest.mark.parametrize("library", ["THREADS", "ASYNC"])
+@pytest.mark.parametrize("protocol", ["ZMQ", "HTTP"])
+# fmt: on
+def test_queue_sync_01(re_manager, fastapi_server, protocol, library):  # noqa: F811
+    """
+    ``queue_sync``: basic test. Items are removed, updated, moved and added, UIDs of
+    existing items are preserved.
+    """
+    rm_api_class = _select_re_manager_api(protocol, library)
+    items = [BPlan("count", ["det1", "det2"], num=_, delay=1) for _ in range(6)]
+
+    def make_desired_items(queue):
+        item_modified = dict(queue[0])
+        item_modified["kwargs"] = {"num": 10, "delay": 1}
+        item_new = BPlan("count", ["det1"], num=20)
+        return [item_modified, item_new, queue[1], queue[3], queue[5], queue[4]]
+
+    def check_dry_run(resp, queue):
+        assert resp["success"] is True
+        methods = [_["method"] for _ in resp["operations"]]
+        assert methods == ["item_remove_batch", "item_update", "item_move_batch", "item_add_batch"]
+        assert resp["operations"][0]["params"]["uids"] == [queue[2]["item_uid"]]
+        # Only one item is moved
+        assert resp["operations"][2]["params"] == {
+            "uids": [queue[5]["item_uid"]],
+            "after_uid": queue[3]["item_uid"],
+        }
+        assert resp["operations"][3]["params"]["after_uid"] == queue[0]["item_uid"]
+
+    def check_queue(queue, queue_before):
+        assert [_["kwargs"]["num"] for _ in queue] == [10, 20, 1, 3, 5, 4]
+        uids_before = [_["item_uid"] for _ in queue_before]
+        assert [_["item_uid"] for _ in queue if _["kwargs"]["num"] != 20] == [
+            uids_before[_] for _ in (0, 1, 3, 5, 4)
+        ]
+
+    if not _is_async(library):
+        RM = instantiate_re_api_class(rm_api_class)
+        RM.item_add_batch(items)
+        queue = RM.queue_get()["items"]
+        desired_items = make_desired_items(queue)
+
+        resp = RM.queue_sync(desired_items, dry_run=True)
+        check_dry_run(resp, queue)
+        assert RM.queue_get()["items"] == queue
+
+        resp = RM.queue_sync(desired_items)
+        assert resp["success"] is True
+        check_queue(RM.queue_get()["items"], queue)
+
+        # The queue is already synchronized
+        resp = RM.queue_sync(RM.queue_get()["items"])
+        assert resp["operations"] == []
+
+        with pytest.raises(ValueError, match="repeated item UIDs"):
+            RM.queue_sync([queue[0], queue[0]])
+        with pytest.raises(TypeError, match="Incorrect type"):
+            RM.queue_sync([10])
+
+        RM.queue_clear()
+        RM.close()
+    else:
+
+        async def testing():
+            RM = instantiate_re_api_class(rm_api_class)
+            await RM.item_add_batch(items)
+            queue = (await RM.queue_get())["items"]
+            desired_items = make_desired_items(queue)
+
+            resp = await RM.queue_sync(desired_items, dry_run=True)
+            check_dry_run(resp, queue)
+            assert (await RM.queue_get())["items"] == queue
+
+            resp = await RM.queue_sync(desired_items)
+            assert resp["success"] is True
+            check_queue((await RM.queue_get())["items"], queue)
+
+            resp = await RM.queue_sync((await RM.queue_get())["items"])
+            assert resp["operations"] == []
+
+            await RM.queue_clear()
+            await RM.close()
+
+        asyncio.run(testing())
+
+
+# fmt: off
+@pytest.mark.parametrize("library", ["THREADS", "ASYNC"])
+@pytest.mark.parametrize("protocol", ["ZMQ", "HTTP"])
+# fmt: on
+def test_queue_sync_02(re_manager, fastapi_server, protocol, library):  # noqa: F811
+    """
+    ``queue_sync``: ``user`` and ``user_group`` are passed only to the operations that accept
+    user information. Items are removed, updated, moved and added.
+    """
+    rm_api_class = _select_re_manager_api(protocol, library)
+    items = [BPlan("count", ["det1", "det2"], num=_, delay=1) for _ in range(4)]
+    user, user_group = "Queue sync user", "admin"
+
+    def make_desired_items(queue):
+        item_modified = dict(queue[0])
+        item_modified["kwargs"] = {"num": 10, "delay": 1}
+        item_new = BPlan("count", ["det1"], num=20)
+        return [item_modified, queue[3], queue[1], item_new]
+
+    def check_resp(resp):
+        assert resp["success"] is True, resp["msg"]
+        methods = [_["method"] for _ in resp["operations"]]
+        assert methods == ["item_remove_batch", "item_update", "item_move_batch", "item_add_batch"]
+        for op in resp["operations"]:
+            has_user_info = op["method"] in ("item_update", "item_add_batch")
+            assert ("user" in op["params"]) == has_user_info
+            assert ("user_group" in op["params"]) == has_user_info
+
+    def check_queue(queue):
+        assert [_["kwargs"]["num"] for _ in queue] == [10, 3, 1, 20]
+        if protocol == "ZMQ":
+            # HTTP Server sets user name based on login information
+            assert queue[-1]["user"] == user
+
+    if not _is_async(library):
+        RM = instantiate_re_api_class(rm_api_class)
+        RM.item_add_batch(items)
+        queue = RM.queue_get()["items"]
+
+        resp = RM.queue_sync(make_desired_items(queue), user=user, user_group=user_group)
+        check_resp(resp)
+        check_queue(RM.queue_get()["items"])
+
+        RM.queue_clear()
+        RM.close()
+    else:
+
+        async def testing():
+            RM = instantiate_re_api_class(rm_api_class)
+            await RM.item_add_batch(items)
+            queue = (await RM.queue_get())["items"]
+
+            resp = await RM.queue_sync(make_desired_items(queue), user=user, user_group=user_group)
+            check_resp(resp)
+            check_queue((await RM.queue_get())["items"])
+
+            await RM.queue_clear()
+            await RM.close()
+
+        asyncio.run(testing())
+
+
 # fmt: off
 @pytest.mark.parametrize("library", ["THREADS", "ASYNC"])
 @pytest.mark.parametrize("protocol", ["ZMQ", "HTTP"])
@@ -1495,10 +2542,308 @@ def test_queue_get_01(re_manager, fastapi_server, protocol, library):  # noqa: F
             assert response1["running_item"] == {}
             assert len(response1["items"]) == 1
 
-            # The queue has not changed, but the response generated based on cached data must match
-            response2 = await RM.queue_get()
-            assert response2 == response1
+            # The queue has not changed, but the response generated based on cached data must match
+            response2 = await RM.queue_get()
+            assert response2 == response1
+
+            await RM.close()
+
+        asyncio.run(testing())
+
+
+# fmt: off
+@pytest.mark.parametrize("library", ["THREADS", "ASYNC"])
+@pytest.mark.parametrize("protocol", ["ZMQ", "HTTP"])
+# fmt: on
+def test_queue_get_02(re_manager, fastapi_server, protocol, library):  # noqa: F811
+    """
+    ``queue_get``, ``status``: read-only responses
+    """
+    rm_api_class = _select_re_manager_api(protocol, library)
+    item = BPlan("count", ["det1", "det2"], num=10, delay=1)
+
+    def check_readonly(response, n_items):
+        assert isinstance(response["items"], tuple)
+        assert len(response["items"]) == n_items
+        with pytest.raises(TypeError):
+            response["items"][0]["name"] = "abc"
+
+    if not _is_async(library):
+        RM = instantiate_re_api_class(rm_api_class)
+        with pytest.raises(TypeError, match="may be set only to boolean values"):
+            RM.readonly_responses = 1
+        RM.readonly_responses = True
+        assert RM.readonly_responses is True
+
+        status = RM.status()
+        with pytest.raises(TypeError):
+            status["manager_state"] = "abc"
+
+        RM.item_add(item)
+        RM.queue_get()
+        response1 = RM.queue_get()
+        check_readonly(response1, 1)
+        # The same view is returned while the queue is not changed
+        response2 = RM.queue_get()
+        assert response2["items"] is response1["items"]
+
+        RM.readonly_responses = False
+        response3 = RM.queue_get()
+        assert isinstance(response3["items"], list)
+        assert response3["items"][0]["name"] == response1["items"][0]["name"]
+
+        RM.queue_clear()
+        RM.close()
+    else:
+
+        async def testing():
+            RM = instantiate_re_api_class(rm_api_class)
+            with pytest.raises(TypeError, match="may be set only to boolean values"):
+                RM.readonly_responses = 1
+            RM.readonly_responses = True
+            assert RM.readonly_responses is True
+
+            status = await RM.status()
+            with pytest.raises(TypeError):
+                status["manager_state"] = "abc"
+
+            await RM.item_add(item)
+            await RM.queue_get()
+            response1 = await RM.queue_get()
+            check_readonly(response1, 1)
+            # The same view is returned while the queue is not changed
+            response2 = await RM.queue_get()
+            assert response2["items"] is response1["items"]
+
+            RM.readonly_responses = False
+            response3 = await RM.queue_get()
+            assert isinstance(response3["items"], list)
+            assert response3["items"][0]["name"] == response1["items"][0]["name"]
+
+            await RM.queue_clear()
+            await RM.close()
+
+        asyncio.run(testing())
+
+
+# fmt: off
+@pytest.mark.parametrize("library", ["THREADS", "ASYNC"])
+@pytest.mark.parametrize("protocol", ["ZMQ", "HTTP"])
+# fmt: on
+def test_queue_get_03(re_manager, fastapi_server, protocol, library):  # noqa: F811
+    """
+    ``queue_get``, ``history_get``, ``plans_allowed``, ``devices_existing``, ``re_runs``: concurrent
+    calls after the cached data is changed result in a single request per resource.
+    """
+    rm_api_class = _select_re_manager_api(protocol, library)
+    item = BPlan("count", ["det1", "det2"], num=10, delay=1)
+    methods = ("queue_get", "history_get", "plans_allowed", "devices_existing", "re_runs")
+    n_callers = 20
+    n_requests = {_: 0 for _ in methods}
+
+    def count_requests(RM):
+        send_request = RM.send_request
+
+        if not _is_async(library):
+
+            def send_request_counted(*, method, **kwargs):
+                if method in n_requests:
+                    n_requests[method] += 1
+                return send_request(method=method, **kwargs)
+
+        else:
+
+            async def send_request_counted(*, method, **kwargs):
+                if method in n_requests:
+                    n_requests[method] += 1
+                return await send_request(method=method, **kwargs)
+
+        RM.send_request = send_request_counted
+
+    if not _is_async(library):
+        RM = instantiate_re_api_class(rm_api_class)
+        count_requests(RM)
+        RM.item_add(item)
+        RM.status()
+
+        results = {_: [] for _ in methods}
+
+        def call_api(method):
+            results[method].append(getattr(RM, method)())
+
+        threads = [threading.Thread(target=call_api, args=(_,)) for _ in methods for __ in range(n_callers)]
+        for th in threads:
+            th.start()
+        for th in threads:
+            th.join()
+
+        assert n_requests == {_: 1 for _ in methods}
+        for method in methods:
+            assert len(results[method]) == n_callers
+            assert all(_ == results[method][0] for _ in results[method])
+        assert len(results["queue_get"][0]["items"]) == 1
+
+        RM.queue_clear()
+        RM.close()
+    else:
+
+        async def testing():
+            RM = instantiate_re_api_class(rm_api_class)
+            count_requests(RM)
+            await RM.item_add(item)
+            await RM.status()
+
+            results = {}
+            for method in methods:
+                results[method] = await asyncio.gather(*[getattr(RM, method)() for _ in range(n_callers)])
+
+            assert n_requests == {_: 1 for _ in methods}
+            for method in methods:
+                assert len(results[method]) == n_callers
+                assert all(_ == results[method][0] for _ in results[method])
+            assert len(results["queue_get"][0]["items"]) == 1
+
+            await RM.queue_clear()
+            await RM.close()
+
+        asyncio.run(testing())
+
+
+# fmt: off
+@pytest.mark.parametrize("library", ["THREADS", "ASYNC"])
+@pytest.mark.parametrize("protocol", ["ZMQ", "HTTP"])
+# fmt: on
+def test_queue_get_04(re_manager, fastapi_server, protocol, library):  # noqa: F811
+    """
+    ``queue_get``, ``history_get``: background prefetching of cached data
+    """
+    rm_api_class = _select_re_manager_api(protocol, library)
+    item = BPlan("count", ["det1", "det2"], num=10, delay=1)
+    n_requests = {"queue_get": 0, "history_get": 0}
+
+    def count_requests(RM):
+        send_request = RM.send_request
+
+        if not _is_async(library):
+
+            def send_request_counted(*, method, **kwargs):
+                if method in n_requests:
+                    n_requests[method] += 1
+                return send_request(method=method, **kwargs)
+
+        else:
+
+            async def send_request_counted(*, method, **kwargs):
+                if method in n_requests:
+                    n_requests[method] += 1
+                return await send_request(method=method, **kwargs)
+
+        RM.send_request = send_request_counted
+
+    if not _is_async(library):
+        RM = instantiate_re_api_class(rm_api_class)
+        count_requests(RM)
+        with pytest.raises(TypeError, match="may be set only to boolean values"):
+            RM.prefetch_enabled = 1
+        RM.prefetch_enabled = True
+        assert RM.prefetch_enabled is True
+        ttime.sleep(2)
+        assert n_requests == {"queue_get": 1, "history_get": 1}
+
+        RM.item_add(item)
+        ttime.sleep(2)
+        assert n_requests == {"queue_get": 2, "history_get": 1}
+
+        # The data is returned from cache
+        assert len(RM.queue_get()["items"]) == 1
+        assert len(RM.history_get()["items"]) == 0
+        assert n_requests == {"queue_get": 2, "history_get": 1}
+
+        RM.prefetch_enabled = False
+        RM.queue_clear()
+        ttime.sleep(2)
+        assert n_requests == {"queue_get": 2, "history_get": 1}
+
+        RM.close()
+    else:
+
+        async def testing():
+            RM = instantiate_re_api_class(rm_api_class)
+            count_requests(RM)
+            with pytest.raises(TypeError, match="may be set only to boolean values"):
+                RM.prefetch_enabled = 1
+            RM.prefetch_enabled = True
+            assert RM.prefetch_enabled is True
+            await asyncio.sleep(2)
+            assert n_requests == {"queue_get": 1, "history_get": 1}
+
+            await RM.item_add(item)
+            await asyncio.sleep(2)
+            assert n_requests == {"queue_get": 2, "history_get": 1}
+
+            # The data is returned from cache
+            assert len((await RM.queue_get())["items"]) == 1
+            assert len((await RM.history_get())["items"]) == 0
+            assert n_requests == {"queue_get": 2, "history_get": 1}
+
+            RM.prefetch_enabled = False
+            await RM.queue_clear()
+            await asyncio.sleep(2)
+            assert n_requests == {"queue_get": 2, "history_get": 1}
+
+            await RM.close()
+
+        asyncio.run(testing())
+
+
+# fmt: off
+@pytest.mark.benchmark
+@pytest.mark.parametrize("library", ["THREADS", "ASYNC"])
+@pytest.mark.parametrize("protocol", ["ZMQ", "HTTP"])
+# fmt: on
+def test_history_get_02(protocol, library):  # noqa: F811
+    """
+    ``history_get``: benchmark generating responses from cached history with 10000 items
+    with and without read-only responses. Run without servers.
+    """
+    rm_api_class = _select_re_manager_api(protocol, library)
+    n_items, n_calls = 10000, 10
+
+    items = [BPlan("count", ["det1", "det2"], num=10, delay=1).to_dict() for _ in range(n_items)]
+    for n, item in enumerate(items):
+        item.update({"item_uid": f"uid-{n}", "result": {"exit_status": "completed", "run_uids": [f"run-{n}"]}})
+    response = {"success": True, "msg": "", "items": items, "plan_history_uid": "some-uid"}
+
+    def benchmark(RM):
+        RM._process_response_history_get(response)
+
+        t0 = ttime.time()
+        for _ in range(n_calls):
+            response_copy = RM._generate_response_history_get()
+        time_copy = (ttime.time() - t0) / n_calls
+        assert response_copy["items"] == items
+
+        RM.readonly_responses = True
+        RM._generate_response_history_get()  # The view is created once after the cache is updated
+        t0 = ttime.time()
+        for _ in range(n_calls):
+            response_view = RM._generate_response_history_get()
+        time_view = (ttime.time() - t0) / n_calls
+        assert len(response_view["items"]) == n_items
+        assert response_view["items"][-1]["item_uid"] == items[-1]["item_uid"]
+
+        print(f"'history_get' (10000 items): deep copy {time_copy * 1000:.3f} ms, view {time_view * 1000:.3f} ms")
+        assert time_view * 100 < time_copy
+
+    if not _is_async(library):
+        RM = rm_api_class()
+        benchmark(RM)
+        RM.close()
+    else:
 
+        async def testing():
+            RM = rm_api_class()
+            benchmark(RM)
             await RM.close()
 
         asyncio.run(testing())
@@ -1817,6 +3162,105 @@ def test_plans_devices_existing_01(re_manager, fastapi_server, protocol, library
         asyncio.run(testing())
 
 
+# fmt: off
+@pytest.mark.parametrize("library", ["THREADS", "ASYNC"])
+@pytest.mark.parametrize("protocol", ["ZMQ", "HTTP"])
+# fmt: on
+def test_plans_devices_existing_02(re_manager, fastapi_server, protocol, library, tmp_path):  # noqa: F811
+    """
+    ``plans_existing``, ``devices_existing``, ``plans_allowed``, ``devices_allowed``: persistent
+    cache. The lists are loaded from disk by new API instances if the UIDs match the status.
+    """
+    rm_api_class = _select_re_manager_api(protocol, library)
+    methods = ("plans_existing", "devices_existing", "plans_allowed", "devices_allowed")
+    n_requests = {_: 0 for _ in methods}
+
+    def count_requests(RM):
+        send_request = RM.send_request
+
+        if not _is_async(library):
+
+            def send_request_counted(*, method, **kwargs):
+                if method in n_requests:
+                    n_requests[method] += 1
+                return send_request(method=method, **kwargs)
+
+        else:
+
+            async def send_request_counted(*, method, **kwargs):
+                if method in n_requests:
+                    n_requests[method] += 1
+                return await send_request(method=method, **kwargs)
+
+        RM.send_request = send_request_counted
+
+    def corrupt_cache_file(name):
+        (file_path,) = [_ for _ in os.listdir(tmp_path) if _.startswith(name)]
+        with open(os.path.join(tmp_path, file_path), "wb") as f:
+            f.write(b"invalid data")
+
+    if not _is_async(library):
+        RM = instantiate_re_api_class(rm_api_class)
+        assert RM.persistent_cache_dir is None
+        with pytest.raises(TypeError):
+            RM.persistent_cache_dir = 10
+        RM.persistent_cache_dir = tmp_path
+        assert RM.persistent_cache_dir == str(tmp_path)
+        count_requests(RM)
+        responses = {_: getattr(RM, _)() for _ in methods}
+        assert n_requests == {_: 1 for _ in methods}
+        assert len(os.listdir(tmp_path)) == len(methods)
+        RM.close()
+
+        RM = instantiate_re_api_class(rm_api_class)
+        RM.persistent_cache_dir = tmp_path
+        count_requests(RM)
+        for method in methods:
+            assert getattr(RM, method)() == responses[method]
+        assert n_requests == {_: 1 for _ in methods}
+        RM.close()
+
+        corrupt_cache_file("plans_existing")
+        RM = instantiate_re_api_class(rm_api_class)
+        RM.persistent_cache_dir = tmp_path
+        count_requests(RM)
+        assert RM.plans_existing() == responses["plans_existing"]
+        assert n_requests["plans_existing"] == 2
+        RM.close()
+    else:
+
+        async def testing():
+            RM = instantiate_re_api_class(rm_api_class)
+            assert RM.persistent_cache_dir is None
+            with pytest.raises(TypeError):
+                RM.persistent_cache_dir = 10
+            RM.persistent_cache_dir = tmp_path
+            assert RM.persistent_cache_dir == str(tmp_path)
+            count_requests(RM)
+            responses = {_: await getattr(RM, _)() for _ in methods}
+            assert n_requests == {_: 1 for _ in methods}
+            assert len(os.listdir(tmp_path)) == len(methods)
+            await RM.close()
+
+            RM = instantiate_re_api_class(rm_api_class)
+            RM.persistent_cache_dir = tmp_path
+            count_requests(RM)
+            for method in methods:
+                assert await getattr(RM, method)() == responses[method]
+            assert n_requests == {_: 1 for _ in methods}
+            await RM.close()
+
+            corrupt_cache_file("plans_existing")
+            RM = instantiate_re_api_class(rm_api_class)
+            RM.persistent_cache_dir = tmp_path
+            count_requests(RM)
+            assert await RM.plans_existing() == responses["plans_existing"]
+            assert n_requests["plans_existing"] == 2
+            await RM.close()
+
+        asyncio.run(testing())
+
+
 # fmt: off
 @pytest.mark.parametrize("library", ["THREADS", "ASYNC"])
 @pytest.mark.parametrize("protocol", ["ZMQ", "HTTP"])
@@ -2743,6 +4187,54 @@ def test_re_runs_01(re_manager, fastapi_server, protocol, library, options, n_el
         asyncio.run(testing())
 
 
+# fmt: off
+@pytest.mark.parametrize("option, n_elements", [(None, 2), ("active", 2), ("open", 1), ("closed", 1)])
+@pytest.mark.parametrize("library", ["THREADS", "ASYNC"])
+@pytest.mark.parametrize("protocol", ["ZMQ", "HTTP"])
+# fmt: on
+def test_re_runs_02(protocol, library, option, n_elements):  # noqa: F811
+    """
+    ``re_runs``: read-only responses. Responses generated from cached data are read-only views,
+    responses received from the server are not converted. Run without servers.
+    """
+    rm_api_class = _select_re_manager_api(protocol, library)
+    run_list = [{"uid": "run-1", "is_open": True}, {"uid": "run-2", "is_open": False}]
+
+    def check(RM):
+        RM.readonly_responses = True
+        response = {
+            "success": True,
+            "msg": "",
+            "run_list": [dict(_) for _ in run_list],
+            "run_list_uid": "some-uid",
+        }
+
+        response = RM._process_response_re_runs(response, option=option)
+        assert isinstance(response["run_list"], list)
+        assert len(response["run_list"]) == n_elements
+        response["run_list"][0]["uid"] = "abc"
+
+        response = RM._generate_response_re_runs(option=option)
+        assert isinstance(response["run_list"], tuple)
+        assert len(response["run_list"]) == n_elements
+        assert response["run_list"][0]["uid"] != "abc"
+        with pytest.raises(TypeError):
+            response["run_list"][0]["uid"] = "abc"
+
+    if not _is_async(library):
+        RM = rm_api_class()
+        check(RM)
+        RM.close()
+    else:
+
+        async def testing():
+            RM = rm_api_class()
+            check(RM)
+            await RM.close()
+
+        asyncio.run(testing())
+
+
 # fmt: off
 @pytest.mark.parametrize("pause_option, continue_option", [
     (None, "resume"),
@@ -3507,6 +4999,10 @@ def test_console_monitor_06(re_manager_cmd, fastapi_server, library, protocol, n
 
         check_resp(RM.queue_start())
         RM.wait_for_idle(timeout=30)
+        # The plan may be completed before the console monitor loads the remaining output
+        t_stop = ttime.time() + 10
+        while ("TEST COMPLETED" not in RM.console_monitor.text()) and (ttime.time() < t_stop):
+            ttime.sleep(0.1)
         check_status(RM.status(), "idle", 0)
 
         text = RM.console_monitor.text()
@@ -3550,6 +5046,10 @@ def test_console_monitor_06(re_manager_cmd, fastapi_server, library, protocol, n
 
             check_resp(await RM.queue_start())
             await RM.wait_for_idle(timeout=30)
+            # The plan may be completed before the console monitor loads the remaining output
+            t_stop = ttime.time() + 10
+            while ("TEST COMPLETED" not in (await RM.console_monitor.text())) and (ttime.time() < t_stop):
+                await asyncio.sleep(0.1)
             check_status(await RM.status(), "idle", 0)
 
             text = await RM.console_monitor.text()
@@ -3809,6 +5309,306 @@ def test_console_monitor_08(re_manager_cmd, fastapi_server, library, protocol):
         asyncio.run(testing())
 
 
+# fmt: off
+@pytest.mark.parametrize("library", ["THREADS", "ASYNC"])
+@pytest.mark.parametrize("protocol", ["ZMQ", "HTTP"])
+# fmt: on
+def test_console_monitor_09(re_manager_cmd, fastapi_server, library, protocol):  # noqa: F811
+    """
+    RM.console_monitor.text_since(): reconstruct the text from changes loaded while
+    the plan generating progress bars is running.
+    """
+    rm_api_class = _select_re_manager_api(protocol, library)
+
+    params = ["--zmq-publish-console", "ON"]
+    re_manager_cmd(params)
+
+    def check_resp(resp):
+        assert resp["success"] is True
+        assert resp["msg"] == ""
+
+    def apply_changes(lines, changes):
+        del lines[: changes["lines_removed"]]
+        assert changes["first_changed_line"] <= len(lines)
+        lines[changes["first_changed_line"] :] = changes["lines"]
+        return changes["text_uid"]
+
+    if not _is_async(library):
+        RM = instantiate_re_api_class(rm_api_class)
+
+        check_resp(RM.environment_open())
+        RM.wait_for_idle(timeout=10)
+
+        RM.console_monitor.enable()
+        ttime.sleep(1)
+
+        lines, text_uid, n_updates = [], None, 0
+        check_resp(RM.item_add(BPlan("plan_test_progress_bars", 3)))
+        check_resp(RM.queue_start())
+        t_stop = ttime.time() + 30
+        while ttime.time() < t_stop:
+            if RM.console_monitor.text_uid != text_uid:
+                text_uid = apply_changes(lines, RM.console_monitor.text_since(text_uid))
+                n_updates += 1
+            if RM.status()["manager_state"] == "idle":
+                break
+            ttime.sleep(0.1)
+
+        RM.wait_for_idle(timeout=10)
+        ttime.sleep(1)  # Wait until all console output is loaded
+        text_uid = apply_changes(lines, RM.console_monitor.text_since(text_uid))
+
+        assert n_updates > 5
+        text = RM.console_monitor.text()
+        assert "TEST COMPLETED" in text
+        assert "\n".join(lines) == text
+        assert RM.console_monitor.text_since(text_uid)["lines"] == []
+
+        RM.console_monitor.clear()
+        changes = RM.console_monitor.text_since(text_uid)
+        assert changes["text_uid"] == RM.console_monitor.text_uid
+        assert (changes["lines_removed"], changes["first_changed_line"]) == (0, 0)
+
+        check_resp(RM.environment_close())
+        RM.wait_for_idle(timeout=10)
+        RM.close()
+
+    else:
+
+        async def testing():
+            RM = instantiate_re_api_class(rm_api_class)
+
+            check_resp(await RM.environment_open())
+            await RM.wait_for_idle(timeout=10)
+
+            RM.console_monitor.enable()
+            await asyncio.sleep(1)
+
+            lines, text_uid, n_updates = [], None, 0
+            check_resp(await RM.item_add(BPlan("plan_test_progress_bars", 3)))
+            check_resp(await RM.queue_start())
+            t_stop = ttime.time() + 30
+            while ttime.time() < t_stop:
+                if RM.console_monitor.text_uid != text_uid:
+                    text_uid = apply_changes(lines, await RM.console_monitor.text_since(text_uid))
+                    n_updates += 1
+                if (await RM.status())["manager_state"] == "idle":
+                    break
+                await asyncio.sleep(0.1)
+
+            await RM.wait_for_idle(timeout=10)
+            await asyncio.sleep(1)  # Wait until all console output is loaded
+            text_uid = apply_changes(lines, await RM.console_monitor.text_since(text_uid))
+
+            assert n_updates > 5
+            text = await RM.console_monitor.text()
+            assert "TEST COMPLETED" in text
+            assert "\n".join(lines) == text
+            assert (await RM.console_monitor.text_since(text_uid))["lines"] == []
+
+            RM.console_monitor.clear()
+            changes = await RM.console_monitor.text_since(text_uid)
+            assert changes["text_uid"] == RM.console_monitor.text_uid
+            assert (changes["lines_removed"], changes["first_changed_line"]) == (0, 0)
+
+            check_resp(await RM.environment_close())
+            await RM.wait_for_idle(timeout=10)
+            await RM.close()
+
+        asyncio.run(testing())
+
+
+# fmt: off
+@pytest.mark.parametrize("library", ["THREADS", "ASYNC"])
+@pytest.mark.parametrize("protocol", ["HTTP"])
+# fmt: on
+def test_console_monitor_10(re_manager_cmd, fastapi_server, library, protocol):  # noqa: F811
+    """
+    Console monitor (HTTP): receive console output using streaming. Check that the messages
+    are received once and the monitor is quickly disabled while the stream is open.
+    """
+    rm_api_class = _select_re_manager_api(protocol, library)
+
+    params = ["--zmq-publish-console", "ON"]
+    re_manager_cmd(params)
+
+    def check_resp(resp):
+        assert resp["success"] is True
+        assert resp["msg"] == ""
+
+    def check_msgs(msgs, text):
+        assert len(msgs) > 10
+        assert len({(_["time"], _["msg"]) for _ in msgs}) == len(msgs)
+        assert "TEST COMPLETED" in text
+
+    if not _is_async(library):
+        RM = instantiate_re_api_class(rm_api_class, console_monitor_streaming=True)
+
+        check_resp(RM.environment_open())
+        RM.wait_for_idle(timeout=10)
+
+        for _ in range(2):
+            RM.console_monitor.enable()
+            ttime.sleep(1)
+            assert RM.console_monitor._monitor_streaming_active is True
+
+            check_resp(RM.item_add(BPlan("plan_test_progress_bars", 2)))
+            check_resp(RM.queue_start())
+            ttime.sleep(1)
+            RM.wait_for_idle(timeout=30)
+            ttime.sleep(1)  # Wait until all console output is loaded
+
+            msgs = []
+            while True:
+                try:
+                    msgs.append(RM.console_monitor.next_msg())
+                except RM.RequestTimeoutError:
+                    break
+            check_msgs(msgs, RM.console_monitor.text())
+
+            t0 = ttime.time()
+            RM.console_monitor.disable_wait(timeout=2)
+            assert ttime.time() - t0 < 1
+
+        check_resp(RM.environment_close())
+        RM.wait_for_idle(timeout=10)
+        RM.close()
+
+    else:
+
+        async def testing():
+            RM = instantiate_re_api_class(rm_api_class, console_monitor_streaming=True)
+
+            check_resp(await RM.environment_open())
+            await RM.wait_for_idle(timeout=10)
+
+            for _ in range(2):
+                RM.console_monitor.enable()
+                await asyncio.sleep(1)
+                assert RM.console_monitor._monitor_streaming_active is True
+
+                check_resp(await RM.item_add(BPlan("plan_test_progress_bars", 2)))
+                check_resp(await RM.queue_start())
+                await asyncio.sleep(1)
+                await RM.wait_for_idle(timeout=30)
+                await asyncio.sleep(1)  # Wait until all console output is loaded
+
+                msgs = []
+                while True:
+                    try:
+                        msgs.append(await RM.console_monitor.next_msg())
+                    except RM.RequestTimeoutError:
+                        break
+                check_msgs(msgs, await RM.console_monitor.text())
+
+                t0 = ttime.time()
+                await RM.console_monitor.disable_wait(timeout=2)
+                assert ttime.time() - t0 < 1
+
+            check_resp(await RM.environment_close())
+            await RM.wait_for_idle(timeout=10)
+            await RM.close()
+
+        asyncio.run(testing())
+
+
+# fmt: off
+@pytest.mark.parametrize("overflow", ["drop_newest", "coalesce"])
+@pytest.mark.parametrize("library", ["THREADS", "ASYNC"])
+@pytest.mark.parametrize("protocol", ["ZMQ", "HTTP"])
+# fmt: on
+def test_console_monitor_11(re_manager_cmd, fastapi_server, overflow, library, protocol):  # noqa: F811
+    """
+    Console monitor: overflow policies of the message queue. The output of the plan generating
+    progress bars does not fit in the queue. The text buffer contains the full output regardless
+    of the policy.
+    """
+    rm_api_class = _select_re_manager_api(protocol, library)
+
+    params = ["--zmq-publish-console", "ON"]
+    re_manager_cmd(params)
+
+    def check_resp(resp):
+        assert resp["success"] is True
+        assert resp["msg"] == ""
+
+    def check_msgs(msgs, text, stats):
+        assert len(msgs) == 10
+        assert stats["max_size"] == 10
+        assert "TEST COMPLETED" in text
+        if overflow == "coalesce":
+            assert stats["dropped"] == 0
+            assert stats["coalesced"] > 0
+            assert "TEST COMPLETED" in "".join(_["msg"] for _ in msgs)
+        else:
+            assert stats["dropped"] > 0
+            assert stats["coalesced"] == 0
+
+    api_params = dict(console_monitor_max_msgs=10, console_monitor_overflow=overflow)
+
+    if not _is_async(library):
+        RM = instantiate_re_api_class(rm_api_class, **api_params)
+
+        check_resp(RM.environment_open())
+        RM.wait_for_idle(timeout=10)
+
+        RM.console_monitor.enable()
+        ttime.sleep(1)
+
+        check_resp(RM.item_add(BPlan("plan_test_progress_bars", 2)))
+        check_resp(RM.queue_start())
+        ttime.sleep(1)
+        RM.wait_for_idle(timeout=30)
+        ttime.sleep(1)  # Wait until all console output is loaded
+
+        stats = RM.console_monitor.msg_queue_stats
+        msgs = []
+        while True:
+            try:
+                msgs.append(RM.console_monitor.next_msg())
+            except RM.RequestTimeoutError:
+                break
+        check_msgs(msgs, RM.console_monitor.text(), stats)
+
+        RM.console_monitor.disable()
+        check_resp(RM.environment_close())
+        RM.wait_for_idle(timeout=10)
+        RM.close()
+
+    else:
+
+        async def testing():
+            RM = instantiate_re_api_class(rm_api_class, **api_params)
+
+            check_resp(await RM.environment_open())
+            await RM.wait_for_idle(timeout=10)
+
+            RM.console_monitor.enable()
+            await asyncio.sleep(1)
+
+            check_resp(await RM.item_add(BPlan("plan_test_progress_bars", 2)))
+            check_resp(await RM.queue_start())
+            await asyncio.sleep(1)
+            await RM.wait_for_idle(timeout=30)
+            await asyncio.sleep(1)  # Wait until all console output is loaded
+
+            stats = RM.console_monitor.msg_queue_stats
+            msgs = []
+            while True:
+                try:
+                    msgs.append(await RM.console_monitor.next_msg())
+                except RM.RequestTimeoutError:
+                    break
+            check_msgs(msgs, await RM.console_monitor.text(), stats)
+
+            RM.console_monitor.disable()
+            check_resp(await RM.environment_close())
+            await RM.wait_for_idle(timeout=10)
+            await RM.close()
+
+        asyncio.run(testing())
+
+
 # ====================================================================================================
 #                                     Locking RE Manager
 # ====================================================================================================
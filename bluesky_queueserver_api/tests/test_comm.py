@@ -1,10 +1,23 @@
 import asyncio
+import base64
+import httpx
+import itertools
+import json
+import logging
 import pytest
 import re
+import threading
+import time as ttime
 
 from bluesky_queueserver import generate_zmq_keys
 
-from bluesky_queueserver_api.comm_base import ReManagerAPI_Base
+from bluesky_queueserver_api.comm_base import (
+    ReManagerAPI_Base,
+    rest_api_method_map,
+    _json_codecs,
+    _jwt_expiration_time,
+    _request_policy_default,
+)
 from bluesky_queueserver_api.comm_threads import ReManagerComm_ZMQ_Threads, ReManagerComm_HTTP_Threads
 from bluesky_queueserver_api.comm_async import ReManagerComm_ZMQ_Async, ReManagerComm_HTTP_Async
 from bluesky_queueserver_api._defaults import default_http_server_uri
@@ -55,6 +68,161 @@ def test_ReManagerAPI_Base_02(request_fail_exceptions, response, success, msg):
             assert False, "Exception was not raised"
 
 
+def test_ReManagerAPI_Base_03(caplog):
+    """
+    ReManagerAPI_Base: request hooks, request statistics and cache statistics.
+    """
+    RM = ReManagerAPI_Base()
+    caplog.set_level(logging.ERROR)
+    calls = []
+
+    def pre_request(**kwargs):
+        calls.append(("pre", kwargs))
+
+    def post_request(**kwargs):
+        calls.append(("post", kwargs))
+
+    def hook_failing(**kwargs):
+        raise Exception("Hook failed")
+
+    with pytest.raises(TypeError, match="must be callable"):
+        RM.add_request_hooks(pre_request=10)
+
+    RM.add_request_hooks(pre_request=pre_request, post_request=post_request)
+    RM.add_request_hooks(pre_request=hook_failing, post_request=hook_failing)
+
+    time_start = RM._request_started(method="status", params=None)
+    RM._request_completed(method="status", params=None, time_start=time_start, response={"success": True})
+    ex = RM.RequestFailedError({}, {"success": False})
+    time_start = RM._request_started(method=("GET", "/api/custom"), params={"a": 1})
+    RM._request_completed(method=("GET", "/api/custom"), params={"a": 1}, time_start=time_start, exception=ex)
+
+    assert [_[0] for _ in calls] == ["pre", "post", "pre", "post"]
+    assert calls[0][1] == {"method": "status", "params": None}
+    assert calls[1][1]["response"] == {"success": True}
+    assert calls[1][1]["exception"] is None
+    assert 0 <= calls[1][1]["latency"] < 1
+    assert calls[3][1]["exception"] is ex
+    assert calls[3][1]["response"] is None
+
+    # Exceptions raised by the hooks are logged
+    messages = [_.getMessage() for _ in caplog.records]
+    assert (
+        messages
+        == [
+            "Exception was raised by pre-request hook: Hook failed",
+            "Exception was raised by post-request hook: Hook failed",
+        ]
+        * 2
+    )
+
+    # Request statistics
+    for latency in (0.0001, 0.003, 0.003, 100):
+        RM._request_completed(method="status", params=None, time_start=ttime.perf_counter() - latency)
+
+    stats = RM.stats()
+    st = stats["requests"]["status"]
+    assert st["count"] == 5
+    assert st["failed"] == 0
+    assert st["latency_max"] >= 100
+    assert st["latency_sum"] >= 100.006
+    bounds, counts = zip(*st["latency_buckets"])
+    assert bounds[-1] == float("inf")
+    assert list(bounds) == sorted(bounds)
+    assert sum(counts) == 5
+    assert counts[0] == 2
+    assert counts[bounds.index(0.005)] == 2
+    assert counts[-1] == 1
+    assert stats["requests"]["GET /api/custom"]["count"] == 1
+    assert stats["requests"]["GET /api/custom"]["failed"] == 1
+    assert stats["requests"]["GET /api/custom"]["errors"] == {"RequestFailedError": 1}
+    assert st["errors"] == {}
+
+    # Cache statistics
+    RM._stats_cache_record("queue_get", hit=False)
+    RM._stats_cache_record("queue_get", hit=True)
+    RM._stats_cache_record("queue_get", hit=True)
+    assert RM.stats()["cache"] == {"queue_get": {"hits": 2, "misses": 1}}
+
+    RM.stats_reset()
+    assert RM.stats() == {"requests": {}, "cache": {}}
+
+    # Remove hooks
+    RM.remove_request_hooks(pre_request=pre_request, post_request=post_request)
+    RM.remove_request_hooks(pre_request=hook_failing, post_request=hook_failing)
+    with pytest.raises(ValueError, match="is not registered"):
+        RM.remove_request_hooks(pre_request=pre_request)
+
+    calls.clear()
+    time_start = RM._request_started(method="status", params=None)
+    RM._request_completed(method="status", params=None, time_start=time_start)
+    assert calls == []
+
+
+def test_ReManagerAPI_Base_04():
+    """
+    ReManagerAPI_Base: request policies.
+    """
+    RM = ReManagerAPI_Base()
+    policies = RM.request_policies
+    assert policies["status"] == {"timeout": None, "retries": 0, "backoff": 0.1, "idempotent": True}
+    assert policies["queue_get"]["retries"] == 2
+    assert "queue_item_add" not in policies
+    # The default policies do not override the timeout passed to the constructor
+    assert all(_["timeout"] is None for _ in policies.values())
+    assert RM._get_request_policy("queue_item_add") == _request_policy_default
+    assert RM._get_request_policy(("GET", "/api/status")) == _request_policy_default
+    assert all(_ in rest_api_method_map for _ in policies)
+
+    # The property returns a copy
+    policies["status"]["timeout"] = 100
+    assert RM.request_policies["status"]["timeout"] is None
+
+    # Custom policies are merged with the default policies
+    RM = ReManagerAPI_Base(
+        request_policies={
+            "status": {"timeout": 0.5},
+            "queue_item_add": {"timeout": 10},
+            "history_get": {"retries": 0},
+        }
+    )
+    policies = RM.request_policies
+    assert policies["status"] == {"timeout": 0.5, "retries": 0, "backoff": 0.1, "idempotent": True}
+    assert policies["queue_item_add"] == {"timeout": 10, "retries": 0, "backoff": 0.1, "idempotent": False}
+    assert policies["history_get"]["retries"] == 0
+
+    # fmt: off
+    for request_policies, msg in [
+        ([], "must be a dictionary"),
+        ({"unknown": {}}, "unknown method"),
+        ({"status": 10}, "must be a dictionary"),
+        ({"status": {"delay": 10}}, "unsupported parameters"),
+        ({"status": {"timeout": 0}}, "Invalid timeout"),
+        ({"status": {"retries": -1}}, "Invalid number of retries"),
+        ({"status": {"backoff": "a"}}, "Invalid backoff"),
+        ({"status": {"idempotent": 1}}, "Invalid value of 'idempotent'"),
+        ({"queue_item_add": {"retries": 1}}, "is not idempotent"),
+        ({"ping": {"idempotent": False}}, "is not idempotent"),
+    ]:
+        with pytest.raises(RM.RequestParameterError, match=msg):
+            ReManagerAPI_Base(request_policies=request_policies)
+    # fmt: on
+
+    # Retry delays
+    policy = dict(_request_policy_default, retries=2, backoff=0.1, idempotent=True)
+    ex_timeout = RM.RequestTimeoutError("timeout", {})
+    delays = [RM._get_request_retry_delay(policy=policy, n_attempt=_, exception=ex_timeout) for _ in range(3)]
+    assert 0.05 <= delays[0] <= 0.15
+    assert 0.1 <= delays[1] <= 0.3
+    assert delays[2] is None
+    ex_failed = RM.RequestFailedError({}, {"success": False})
+    assert RM._get_request_retry_delay(policy=policy, n_attempt=0, exception=ex_failed) is None
+    ex_request = RM.HTTPRequestError("Connection failed")
+    assert RM._get_request_retry_delay(policy=policy, n_attempt=0, exception=ex_request) is not None
+    policy = dict(policy, idempotent=False)
+    assert RM._get_request_retry_delay(policy=policy, n_attempt=0, exception=ex_timeout) is None
+
+
 def test_ReManagerComm_ZMQ_01():
     """
     ReManagerComm_ZMQ_Threads and ReManagerComm_ZMQ_Async: basic test.
@@ -109,6 +277,235 @@ def test_ReManagerComm_ZMQ_02(monkeypatch, re_manager_cmd):  # noqa: F811
     asyncio.run(testing())
 
 
+def test_ReManagerComm_ZMQ_03(re_manager):  # noqa: F811
+    """
+    ReManagerComm_ZMQ_Threads, ReManagerComm_ZMQ_Async: pool of connections and
+    the dedicated connection for control requests.
+    """
+    for RM_class in (ReManagerComm_ZMQ_Threads, ReManagerComm_ZMQ_Async):
+        for n_connections in (0, -1, "2", None):
+            with pytest.raises(RM_class.RequestParameterError, match="must be a positive integer"):
+                RM_class(zmq_n_connections=n_connections)
+
+    n_threads, n_requests = 8, 10
+    n_priority_requests = []
+
+    def count_priority_requests(RM):
+        send_message = RM._client_priority.send_message
+
+        def send_message_counted(*, method, **kwargs):
+            n_priority_requests.append(method)
+            return send_message(method=method, **kwargs)
+
+        RM._client_priority.send_message = send_message_counted
+
+    RM = ReManagerComm_ZMQ_Threads()
+    assert len(RM._clients) == 1
+    assert RM._client_priority is None
+    RM.close()
+
+    RM = ReManagerComm_ZMQ_Threads(
+        zmq_n_connections=4, zmq_priority_connection=True, request_fail_exceptions=False
+    )
+    assert len(RM._clients) == 4
+    assert RM._client_priority is not None
+    count_priority_requests(RM)
+
+    results = []
+
+    def send_requests():
+        for _ in range(n_requests):
+            results.append(RM.send_request(method="status"))
+
+    threads = [threading.Thread(target=send_requests) for _ in range(n_threads)]
+    for th in threads:
+        th.start()
+    for th in threads:
+        th.join()
+
+    assert len(results) == n_threads * n_requests
+    assert all([_["manager_state"] == "idle" for _ in results])
+    assert RM._clients_idle.qsize() == 4
+    assert n_priority_requests == []
+
+    result = RM.send_request(method="re_pause", params={"option": "immediate"})
+    assert result["success"] is False  # No plan is running
+    assert n_priority_requests == ["re_pause"]
+    RM.close()
+
+    async def testing():
+        n_priority_requests.clear()
+        RM = ReManagerComm_ZMQ_Async(
+            zmq_n_connections=4, zmq_priority_connection=True, request_fail_exceptions=False
+        )
+        assert len(RM._clients) == 4
+
+        async def send_message_counted(*, method, **kwargs):
+            n_priority_requests.append(method)
+            return await send_message(method=method, **kwargs)
+
+        send_message = RM._client_priority.send_message
+        RM._client_priority.send_message = send_message_counted
+
+        results = await asyncio.gather(*[RM.send_request(method="status") for _ in range(n_threads * n_requests)])
+        assert all([_["manager_state"] == "idle" for _ in results])
+        assert RM._clients_idle.qsize() == 4
+        assert n_priority_requests == []
+
+        result = await RM.send_request(method="re_pause", params={"option": "immediate"})
+        assert result["success"] is False  # No plan is running
+        assert n_priority_requests == ["re_pause"]
+        await RM.close()
+
+    asyncio.run(testing())
+
+
+@pytest.mark.benchmark
+def test_ReManagerComm_ZMQ_04(re_manager):  # noqa: F811
+    """
+    Benchmark: latency of control requests (``re_pause``) sent while other threads are sending
+    slow requests (``queue_get`` with a large queue) with and without the pool of connections.
+    """
+    n_items, n_threads, n_control_requests = 1000, 4, 20
+    params = {"items": [_plan1] * n_items, "user": _user, "user_group": _user_group}
+
+    RM = ReManagerComm_ZMQ_Threads(timeout_recv=30)
+    result = RM.send_request(method="queue_item_add_batch", params=params)
+    assert result["success"] is True
+    RM.close()
+
+    for n_connections, priority_connection in ((1, False), (1, True), (n_threads, True)):
+        RM = ReManagerComm_ZMQ_Threads(
+            zmq_n_connections=n_connections,
+            zmq_priority_connection=priority_connection,
+            request_fail_exceptions=False,
+        )
+        stop = threading.Event()
+
+        def load():
+            while not stop.is_set():
+                RM.send_request(method="queue_get")
+                ttime.sleep(0.001)  # Otherwise the control requests may never acquire the single connection
+
+        threads = [threading.Thread(target=load) for _ in range(n_threads)]
+        for th in threads:
+            th.start()
+
+        latency = []
+        try:
+            for _ in range(n_control_requests):
+                t0 = ttime.perf_counter()
+                result = RM.send_request(method="re_pause", params={"option": "immediate"})
+                latency.append(ttime.perf_counter() - t0)
+                assert result["success"] is False  # No plan is running
+                ttime.sleep(0.02)
+        finally:
+            stop.set()
+            for th in threads:
+                th.join()
+            RM.close()
+
+        latency.sort()
+        print(
+            f"n_connections={n_connections}, priority_connection={priority_connection}: 're_pause' latency "
+            f"median {latency[len(latency) // 2] * 1000:.1f} ms, max {latency[-1] * 1000:.1f} ms"
+        )
+
+    RM = ReManagerComm_ZMQ_Threads()
+    result = RM.send_request(method="queue_clear")
+    assert result["success"] is True
+    RM.close()
+
+
+def test_ReManagerComm_ZMQ_05():
+    """
+    ReManagerComm_ZMQ_Threads and ReManagerComm_ZMQ_Async: request policies. Idempotent requests
+    are repeated after timeout, other requests are not repeated. The server is not running.
+    """
+    request_policies = {"status": {"timeout": 0.2, "retries": 2, "backoff": 0}, "queue_item_add": {"timeout": 0.3}}
+    params = {"item": _plan1, "user": _user, "user_group": _user_group}
+
+    def count_attempts(RM):
+        timeouts = []
+        send_request = RM._send_request
+
+        if isinstance(RM, ReManagerComm_ZMQ_Async):
+
+            async def send_request_counted(**kwargs):
+                timeouts.append(kwargs["timeout"])
+                return await send_request(**kwargs)
+
+        else:
+
+            def send_request_counted(**kwargs):
+                timeouts.append(kwargs["timeout"])
+                return send_request(**kwargs)
+
+        RM._send_request = send_request_counted
+        return timeouts
+
+    RM = ReManagerComm_ZMQ_Threads(request_policies=request_policies)
+    timeouts = count_attempts(RM)
+    t0 = ttime.time()
+    with pytest.raises(RM.RequestTimeoutError):
+        RM.send_request(method="status")
+    assert 0.6 <= ttime.time() - t0 < 1.5
+    assert timeouts == [0.2] * 3
+
+    timeouts.clear()
+    t0 = ttime.time()
+    with pytest.raises(RM.RequestTimeoutError):
+        RM.send_request(method="queue_item_add", params=params)
+    assert 0.3 <= ttime.time() - t0 < 0.6
+    assert timeouts == [0.3]
+
+    # The default timeout is used (2 s)
+    timeouts.clear()
+    with pytest.raises(RM.RequestTimeoutError):
+        RM.send_request(method="queue_start")
+    assert timeouts == [None]
+    assert RM.stats()["requests"]["status"]["count"] == 1
+    # Dedicated connection is created for each timeout set by the policies
+    assert sorted(RM._clients_timeout) == [0.2, 0.3]
+    RM.close()
+
+    # The default policies use the timeout passed to the constructor
+    RM = ReManagerComm_ZMQ_Threads(timeout_recv=0.3)
+    assert RM._clients_timeout == {}
+    timeouts = count_attempts(RM)
+    t0 = ttime.time()
+    with pytest.raises(RM.RequestTimeoutError):
+        RM.send_request(method="status")
+    assert 0.3 <= ttime.time() - t0 < 0.6
+    # 'status' fails fast: the request is not repeated by default
+    assert timeouts == [None]
+
+    timeouts.clear()
+    t0 = ttime.time()
+    with pytest.raises(RM.RequestTimeoutError):
+        RM.send_request(method="queue_get")
+    assert 0.9 <= ttime.time() - t0 < 2
+    assert timeouts == [None] * 3
+    RM.close()
+
+    async def testing():
+        RM = ReManagerComm_ZMQ_Async(request_policies=request_policies)
+        timeouts = count_attempts(RM)
+        t0 = ttime.time()
+        with pytest.raises(RM.RequestTimeoutError):
+            await RM.send_request(method="status")
+        assert 0.6 <= ttime.time() - t0 < 1.5
+        assert timeouts == [0.2] * 3
+
+        timeouts.clear()
+        with pytest.raises(RM.RequestTimeoutError):
+            await RM.send_request(method="queue_item_add", params=params)
+        assert timeouts == [0.3]
+        await RM.close()
+
+    asyncio.run(testing())
+
+
 def test_ReManagerComm_HTTP_01():
     """
     ReManagerComm_HTTP_Thread and ReManagerComm_HTTP_Async: basic test.
@@ -192,6 +589,579 @@ def test_ReManagerComm_HTTP_03():
     asyncio.run(testing())
 
 
+def _json_codec_available(name):
+    try:
+        _json_codecs[name]()
+    except ImportError:
+        return False
+    return True
+
+
+def test_ReManagerComm_HTTP_04():
+    """
+    ReManagerComm_HTTP_Thread and ReManagerComm_HTTP_Async: selection of JSON codec.
+    """
+    custom_codec = (lambda obj: json.dumps(obj).encode("utf-8"), json.loads)
+
+    for RM_class in (ReManagerComm_HTTP_Threads, ReManagerComm_HTTP_Async):
+        RM = RM_class()
+        assert RM.json_codec in _json_codecs
+        assert _json_codec_available(RM.json_codec)
+
+        for name in _json_codecs:
+            if _json_codec_available(name):
+                assert RM_class(json_codec=name).json_codec == name
+            else:
+                with pytest.raises(RM.RequestParameterError, match="is not available"):
+                    RM_class(json_codec=name)
+
+        RM = RM_class(json_codec=custom_codec)
+        assert RM.json_codec == "custom"
+        assert RM._json_decode(RM._json_encode({"a": [1, 2]})) == {"a": [1, 2]}
+
+        with pytest.raises(RM.RequestParameterError, match="Unknown JSON codec"):
+            RM_class(json_codec="unknown")
+        with pytest.raises(RM.RequestParameterError, match="Custom JSON codec must be"):
+            RM_class(json_codec=(json.loads,))
+        with pytest.raises(RM.RequestParameterError, match="Invalid JSON codec"):
+            RM_class(json_codec=None)
+
+
+# fmt: off
+@pytest.mark.parametrize("json_codec", ["auto", "json", "orjson", "msgspec"])
+# fmt: on
+def test_ReManagerComm_HTTP_05(re_manager, fastapi_server, json_codec):  # noqa: F811
+    """
+    ReManagerComm_HTTP_Thread and ReManagerComm_HTTP_Async: send requests using different JSON codecs.
+    """
+    if (json_codec != "auto") and not _json_codec_available(json_codec):
+        pytest.skip(f"JSON codec {json_codec!r} is not installed")
+
+    params = {"item": _plan1}
+
+    RM = ReManagerComm_HTTP_Threads(json_codec=json_codec)
+    RM.set_authorization_key(api_key=API_KEY_FOR_TESTS)
+    result = RM.send_request(method="queue_item_add", params=params)
+    assert result["success"] is True
+    result = RM.send_request(method="queue_get")
+    assert result["items"][0]["name"] == _plan1["name"]
+    result = RM.send_request(method="queue_clear")
+    assert result["success"] is True
+    RM.close()
+
+    async def testing():
+        RM = ReManagerComm_HTTP_Async(json_codec=json_codec)
+        RM.set_authorization_key(api_key=API_KEY_FOR_TESTS)
+        result = await RM.send_request(method="queue_item_add", params=params)
+        assert result["success"] is True
+        result = await RM.send_request(method="queue_get")
+        assert result["items"][0]["name"] == _plan1["name"]
+        result = await RM.send_request(method="queue_clear")
+        assert result["success"] is True
+        await RM.close()
+
+    asyncio.run(testing())
+
+
+@pytest.mark.benchmark
+def test_ReManagerComm_HTTP_06():
+    """
+    Benchmark: encoding and decoding of a large payload (similar to the response of
+    ``history_get``) using the available JSON codecs. The server is not needed.
+    """
+    n_items, n_repeat = 5000, 5
+    history = [
+        {
+            "name": "count",
+            "args": [["det1", "det2"]],
+            "kwargs": {"num": 10, "delay": 0.5, "md": {"sample": f"sample_{n}", "temperature": 296.5}},
+            "item_type": "plan",
+            "item_uid": f"{n:08d}-2d4a-4b7e-9f45-0a1c2e3d4f5b",
+            "user": "Test User",
+            "user_group": "primary",
+            "result": {
+                "exit_status": "completed",
+                "run_uids": [f"{n:08d}-aaaa-bbbb-cccc-dddddddddddd"],
+                "scan_ids": [n],
+                "time_start": 1.6e9 + n,
+                "time_stop": 1.6e9 + n + 5.5,
+                "msg": "",
+                "traceback": "",
+            },
+        }
+        for n in range(n_items)
+    ]
+    payload = {"success": True, "msg": "", "items": history, "plan_history_uid": "some-uid"}
+
+    timing = {}
+    for name, codec in _json_codecs.items():
+        if not _json_codec_available(name):
+            continue
+        encode, decode = codec()
+        content = encode(payload)
+        assert decode(content) == payload
+
+        t0 = ttime.perf_counter()
+        for _ in range(n_repeat):
+            encode(payload)
+        t_encode = (ttime.perf_counter() - t0) / n_repeat
+
+        t0 = ttime.perf_counter()
+        for _ in range(n_repeat):
+            decode(content)
+        t_decode = (ttime.perf_counter() - t0) / n_repeat
+
+        timing[name] = (t_encode, t_decode)
+        print(f"JSON codec {name!r}: encode {t_encode * 1000:.2f} ms, decode {t_decode * 1000:.2f} ms")
+
+    print(f"Payload size: {len(_json_codecs['json']()[0](payload)) / 1e6:.2f} MB")
+    assert "json" in timing
+
+
+def test_ReManagerComm_HTTP_07():
+    """
+    ReManagerComm_HTTP_Thread, ReManagerComm_HTTP_Async and http.aio.REManagerAPI: parameters
+    of the connection pool are passed to the client.
+    """
+    from bluesky_queueserver_api.http.aio import REManagerAPI
+
+    try:
+        import h2  # noqa: F401
+
+        h2_installed = True
+    except ImportError:
+        h2_installed = False
+
+    pool_params = dict(http_max_connections=256, http_max_keepalive_connections=64, http_keepalive_expiry=2.5)
+
+    def check_pool(RM, *, max_connections, max_keepalive_connections, keepalive_expiry, http2):
+        pool = RM._client._transport._pool
+        assert pool._max_connections == max_connections
+        assert pool._max_keepalive_connections == max_keepalive_connections
+        assert pool._keepalive_expiry == keepalive_expiry
+        assert pool._http2 == http2
+
+    RM = ReManagerComm_HTTP_Threads()
+    check_pool(RM, max_connections=100, max_keepalive_connections=20, keepalive_expiry=5.0, http2=False)
+    RM.close()
+
+    RM = ReManagerComm_HTTP_Threads(**pool_params)
+    check_pool(RM, max_connections=256, max_keepalive_connections=64, keepalive_expiry=2.5, http2=False)
+    RM.close()
+
+    async def testing():
+        RM = ReManagerComm_HTTP_Async(**pool_params)
+        check_pool(RM, max_connections=256, max_keepalive_connections=64, keepalive_expiry=2.5, http2=False)
+        await RM.close()
+
+        RM = REManagerAPI(**pool_params)
+        check_pool(RM, max_connections=256, max_keepalive_connections=64, keepalive_expiry=2.5, http2=False)
+        await RM.close()
+
+        if h2_installed:
+            RM = REManagerAPI(http2=True)
+            check_pool(RM, max_connections=100, max_keepalive_connections=20, keepalive_expiry=5.0, http2=True)
+            await RM.close()
+        else:
+            with pytest.raises(ImportError):
+                REManagerAPI(http2=True)
+
+    asyncio.run(testing())
+
+
+@pytest.mark.benchmark
+def test_ReManagerComm_HTTP_08():
+    """
+    Benchmark: throughput of ReManagerComm_HTTP_Async for 1-256 concurrent requests with different
+    limits on the number of connections. A minimal HTTP/1.1 server with keep-alive support that
+    responds to each request after a fixed delay is used as a stand-in for the HTTP Server.
+    """
+    response_delay = 0.01  # Simulated processing time of a request
+    n_requests = 256
+    response_body = json.dumps({"success": True, "msg": ""}).encode("utf-8")
+
+    async def handle_connection(reader, writer):
+        try:
+            while True:
+                header = await reader.readuntil(b"\r\n\r\n")
+                match = re.search(rb"content-length: *(\d+)", header, re.IGNORECASE)
+                if match:
+                    await reader.readexactly(int(match.group(1)))
+                await asyncio.sleep(response_delay)
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                    + f"Content-Length: {len(response_body)}\r\n\r\n".encode("utf-8")
+                    + response_body
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def run_requests(RM, n_concurrent):
+        semaphore = asyncio.Semaphore(n_concurrent)
+
+        async def send():
+            async with semaphore:
+                return await RM.send_request(method="ping")
+
+        t0 = ttime.perf_counter()
+        results = await asyncio.gather(*[send() for _ in range(n_requests)])
+        t_elapsed = ttime.perf_counter() - t0
+        assert all([_["success"] is True for _ in results])
+        return n_requests / t_elapsed
+
+    async def testing():
+        server = await asyncio.start_server(handle_connection, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            for max_connections in (20, 256):
+                RM = ReManagerComm_HTTP_Async(
+                    http_server_uri=f"http://127.0.0.1:{port}",
+                    http_max_connections=max_connections,
+                    http_max_keepalive_connections=max_connections,
+                )
+                for n_concurrent in (1, 4, 16, 64, 256):
+                    throughput = await run_requests(RM, n_concurrent)
+                    print(
+                        f"max_connections={max_connections:3d}, concurrent requests={n_concurrent:3d}: "
+                        f"{throughput:8.1f} requests/s"
+                    )
+                await RM.close()
+        finally:
+            server.close()
+            await server.wait_closed()
+
+    asyncio.run(testing())
+
+
+def _make_jwt(payload):
+    def encode(obj):
+        return base64.urlsafe_b64encode(json.dumps(obj).encode("utf-8")).rstrip(b"=").decode("ascii")
+
+    return f"{encode({'alg': 'HS256', 'typ': 'JWT'})}.{encode(payload)}.signature"
+
+
+class _AuthServerStandIn:
+    """
+    Stand-in for the authentication API of HTTP Server used with ``httpx.MockTransport``.
+    The server issues access tokens with short lifetime and rejects the requests with expired tokens.
+    """
+
+    def __init__(self, *, token_lifetime, report_expires_in=True, refresh_delay=0):
+        self.token_lifetime = token_lifetime
+        self.report_expires_in = report_expires_in
+        self.refresh_delay = refresh_delay
+        self.n_requests = 0
+        self.n_refresh = 0
+        self.n_expired = 0
+        self.tokens = {}  # access token -> expiration time
+        self.refresh_token = None
+        self._counter = itertools.count()
+
+    def login(self):
+        exp = ttime.time() + self.token_lifetime
+        access_token = _make_jwt({"sub": "user", "exp": exp, "n": next(self._counter)})
+        self.tokens[access_token] = exp
+        self.refresh_token = f"refresh-{next(self._counter)}"
+        response = {"access_token": access_token, "refresh_token": self.refresh_token, "token_type": "bearer"}
+        if self.report_expires_in:
+            response["expires_in"] = self.token_lifetime
+        return response
+
+    def _handle_refresh(self, request):
+        self.n_refresh += 1
+        if json.loads(request.content)["refresh_token"] != self.refresh_token:
+            return httpx.Response(401, json={"detail": "Session has expired. Please log in."})
+        return httpx.Response(200, json=self.login())
+
+    def handle(self, request):
+        if request.url.path == "/api/auth/session/refresh":
+            ttime.sleep(self.refresh_delay)
+            return self._handle_refresh(request)
+        self.n_requests += 1
+        token = request.headers.get("Authorization", "").replace("Bearer ", "")
+        if token not in self.tokens:
+            return httpx.Response(401, json={"detail": "Could not validate credentials"})
+        if ttime.time() > self.tokens[token]:
+            self.n_expired += 1
+            return httpx.Response(401, json={"detail": "Access token has expired. Refresh token."})
+        return httpx.Response(200, json={"success": True, "msg": ""})
+
+    async def handle_async(self, request):
+        if request.url.path == "/api/auth/session/refresh":
+            await asyncio.sleep(self.refresh_delay)
+            return self._handle_refresh(request)
+        return self.handle(request)
+
+
+def test_ReManagerComm_HTTP_09():
+    """
+    ReManagerComm_HTTP_Thread and ReManagerComm_HTTP_Async: expiration time of the access token
+    is obtained from the login response (``expires_in``) or from JWT (``exp`` claim).
+    """
+    exp = ttime.time() + 100
+    assert _jwt_expiration_time(_make_jwt({"exp": exp})) == exp
+    assert _jwt_expiration_time(_make_jwt({"sub": "user"})) is None
+    assert _jwt_expiration_time("not-a-jwt") is None
+    assert _jwt_expiration_time("a.!!!.c") is None
+
+    RM = ReManagerComm_HTTP_Threads()
+    assert RM._token_expires_at is None
+
+    # Token without refresh token: the refresh is not scheduled
+    RM.set_authorization_key(token=_make_jwt({"exp": exp}))
+    assert RM._token_expires_at == exp
+    assert RM._token_refresh_at is None
+
+    RM.set_authorization_key(token=_make_jwt({"exp": exp}), refresh_token="abc")
+    assert RM._token_refresh_at == pytest.approx(exp - 30)
+    assert RM._token_refresh_task.is_alive()
+
+    # Short lifetime: refresh after a half of the lifetime
+    RM.set_authorization_key(token=_make_jwt({"exp": ttime.time() + 10}), refresh_token="abc")
+    assert RM._token_refresh_at == pytest.approx(ttime.time() + 5, abs=0.1)
+
+    # 'expires_in' takes precedence
+    RM._process_login_response({"access_token": _make_jwt({"exp": exp}), "refresh_token": "abc", "expires_in": 50})
+    assert RM._token_expires_at == pytest.approx(ttime.time() + 50, abs=0.1)
+
+    timer = RM._token_refresh_task
+    RM.set_authorization_key(api_key="abc")
+    assert RM._token_expires_at is None
+    assert RM._token_refresh_task is None
+    timer.join(timeout=1)
+    assert not timer.is_alive()
+    RM.close()
+
+    RM = ReManagerComm_HTTP_Threads(token_refresh_margin=None)
+    RM.set_authorization_key(token=_make_jwt({"exp": exp}), refresh_token="abc")
+    assert RM._token_expires_at == exp
+    assert RM._token_refresh_at is None
+    RM.close()
+
+    with pytest.raises(RM.RequestParameterError, match="Token refresh margin"):
+        ReManagerComm_HTTP_Threads(token_refresh_margin=-1)
+
+    async def testing():
+        RM = ReManagerComm_HTTP_Async()
+        RM.set_authorization_key(token=_make_jwt({"exp": exp}), refresh_token="abc")
+        assert RM._token_refresh_at == pytest.approx(exp - 30)
+        task = RM._token_refresh_task
+        assert not task.done()
+        await RM.close()
+        await asyncio.sleep(0)
+        assert task.cancelled()
+
+    asyncio.run(testing())
+
+    # No running loop: the refresh is not scheduled in the background
+    RM = ReManagerComm_HTTP_Async()
+    RM.set_authorization_key(token=_make_jwt({"exp": exp}), refresh_token="abc")
+    assert RM._token_refresh_at == pytest.approx(exp - 30)
+    assert RM._token_refresh_task is None
+
+
+# fmt: off
+@pytest.mark.parametrize("report_expires_in", [True, False])
+@pytest.mark.parametrize("token_refresh_margin", [0.4, None])
+@pytest.mark.parametrize("library", ["THREADS", "ASYNC"])
+# fmt: on
+def test_ReManagerComm_HTTP_10(library, token_refresh_margin, report_expires_in):
+    """
+    ReManagerComm_HTTP_Thread and ReManagerComm_HTTP_Async: proactive refresh of the session.
+    The session is refreshed before the access token expires, so requests are never rejected.
+    If proactive refresh is disabled, the session is refreshed after the request is rejected.
+    """
+    token_lifetime = 1.0
+    server = _AuthServerStandIn(token_lifetime=token_lifetime, report_expires_in=report_expires_in)
+    proactive = token_refresh_margin is not None
+
+    def check_results(n_sent):
+        assert server.n_refresh >= 2
+        if proactive:
+            assert server.n_expired == 0
+            assert server.n_requests == n_sent
+        else:
+            assert server.n_expired >= 1
+            assert server.n_requests == n_sent + server.n_expired
+
+    if library == "THREADS":
+        RM = ReManagerComm_HTTP_Threads(token_refresh_margin=token_refresh_margin)
+        RM._client = httpx.Client(base_url=default_http_server_uri, transport=httpx.MockTransport(server.handle))
+        RM._process_login_response(server.login())
+
+        # Send requests for some time
+        n_sent, t_stop = 0, ttime.time() + token_lifetime * 2.5
+        while ttime.time() < t_stop:
+            RM.send_request(method="status")
+            n_sent += 1
+            ttime.sleep(0.05)
+
+        # No requests are sent: the session is refreshed in the background
+        n_refresh = server.n_refresh
+        ttime.sleep(token_lifetime * 1.5)
+        assert (server.n_refresh > n_refresh) == proactive
+        RM.send_request(method="status")
+        n_sent += 1
+
+        check_results(n_sent)
+        RM.close()
+    else:
+
+        async def testing():
+            RM = ReManagerComm_HTTP_Async(token_refresh_margin=token_refresh_margin)
+            RM._client = httpx.AsyncClient(
+                base_url=default_http_server_uri, transport=httpx.MockTransport(server.handle_async)
+            )
+            RM._process_login_response(server.login())
+
+            n_sent, t_stop = 0, ttime.time() + token_lifetime * 2.5
+            while ttime.time() < t_stop:
+                await RM.send_request(method="status")
+                n_sent += 1
+                await asyncio.sleep(0.05)
+
+            n_refresh = server.n_refresh
+            await asyncio.sleep(token_lifetime * 1.5)
+            assert (server.n_refresh > n_refresh) == proactive
+            await RM.send_request(method="status")
+            n_sent += 1
+
+            check_results(n_sent)
+            await RM.close()
+
+        asyncio.run(testing())
+
+
+# fmt: off
+@pytest.mark.parametrize("proactive", [False, True])
+@pytest.mark.parametrize("library", ["THREADS", "ASYNC"])
+# fmt: on
+def test_ReManagerComm_HTTP_11(library, proactive):
+    """
+    ReManagerComm_HTTP_Thread and ReManagerComm_HTTP_Async: many concurrent requests are sent
+    after the access token expired (or when the token is about to expire). The session is
+    refreshed once and all requests succeed. The stand-in server rotates refresh tokens,
+    so repeated refresh requests would fail.
+    """
+    n_requests, token_lifetime = 20, 0.5
+    server = _AuthServerStandIn(token_lifetime=token_lifetime, refresh_delay=0.2)
+    # Proactive refresh: the token is refreshed before the first request. Otherwise the token
+    #   expires before the requests are sent and the requests are rejected by the server.
+    token_refresh_margin = 100 if proactive else None
+
+    def check_results(results):
+        assert results == [{"success": True, "msg": ""}] * n_requests
+        assert server.n_refresh == 1
+        assert server.n_expired == (0 if proactive else n_requests)
+
+    if library == "THREADS":
+        RM = ReManagerComm_HTTP_Threads(token_refresh_margin=token_refresh_margin)
+        RM._client = httpx.Client(base_url=default_http_server_uri, transport=httpx.MockTransport(server.handle))
+        RM._process_login_response(server.login())
+        # Do not allow the timer to refresh the token in the background
+        if RM._token_refresh_task:
+            RM._token_refresh_task.cancel()
+        ttime.sleep(token_lifetime * 1.2)
+
+        results = [None] * n_requests
+
+        def send_request(n):
+            results[n] = RM.send_request(method="status")
+
+        threads = [threading.Thread(target=send_request, args=(_,)) for _ in range(n_requests)]
+        for th in threads:
+            th.start()
+        for th in threads:
+            th.join()
+
+        check_results(results)
+        RM.close()
+    else:
+
+        async def testing():
+            RM = ReManagerComm_HTTP_Async(token_refresh_margin=token_refresh_margin)
+            RM._client = httpx.AsyncClient(
+                base_url=default_http_server_uri, transport=httpx.MockTransport(server.handle_async)
+            )
+            RM._process_login_response(server.login())
+            if RM._token_refresh_task:
+                RM._token_refresh_task.cancel()
+            # The event loop is blocked, so that the background task can not refresh the session
+            ttime.sleep(token_lifetime * 1.2)
+
+            results = await asyncio.gather(*[RM.send_request(method="status") for _ in range(n_requests)])
+
+            check_results(list(results))
+            await RM.close()
+
+        asyncio.run(testing())
+
+
+# fmt: off
+@pytest.mark.parametrize("library", ["THREADS", "ASYNC"])
+# fmt: on
+def test_ReManagerComm_HTTP_12(library):
+    """
+    ReManagerComm_HTTP_Thread and ReManagerComm_HTTP_Async: request policies. Idempotent requests
+    are repeated after communication errors, the timeouts are passed to the client.
+    """
+    n_failures = {"status": 2, "queue_item_add": 2, "history_get": 5}
+    attempts = {}
+
+    def handle(request):
+        method = {
+            "/api/status": "status",
+            "/api/queue/item/add": "queue_item_add",
+            "/api/history/get": "history_get",
+        }[request.url.path]
+        attempts.setdefault(method, []).append(request.extensions["timeout"]["read"])
+        if len(attempts[method]) <= n_failures[method]:
+            raise httpx.ConnectError("Connection refused", request=request)
+        return httpx.Response(200, json={"success": True, "msg": ""})
+
+    request_policies = {"status": {"retries": 2, "backoff": 0.01}, "history_get": {"backoff": 0.01}}
+
+    def check_attempts():
+        # Status: the timeout of the client is used, 2 failures, 2 retries
+        assert attempts["status"] == [5.0] * 3
+        # Non-idempotent request is not repeated, the default timeout is used
+        assert attempts["queue_item_add"] == [5.0]
+        # Custom timeout passed with the request takes precedence
+        assert attempts["history_get"] == [7.0] * 3
+
+    if library == "THREADS":
+        RM = ReManagerComm_HTTP_Threads(request_policies=request_policies)
+        RM._client = httpx.Client(
+            base_url=default_http_server_uri, transport=httpx.MockTransport(handle), timeout=5
+        )
+        assert RM.send_request(method="status")["success"] is True
+        with pytest.raises(RM.HTTPRequestError, match="Connection refused"):
+            RM.send_request(method="queue_item_add", params={"item": _plan1})
+        with pytest.raises(RM.HTTPRequestError, match="Connection refused"):
+            RM.send_request(method="history_get", timeout=7)
+        check_attempts()
+        RM.close()
+    else:
+
+        async def testing():
+            RM = ReManagerComm_HTTP_Async(request_policies=request_policies)
+            RM._client = httpx.AsyncClient(
+                base_url=default_http_server_uri, transport=httpx.MockTransport(handle), timeout=5
+            )
+            assert (await RM.send_request(method="status"))["success"] is True
+            with pytest.raises(RM.HTTPRequestError, match="Connection refused"):
+                await RM.send_request(method="queue_item_add", params={"item": _plan1})
+            with pytest.raises(RM.HTTPRequestError, match="Connection refused"):
+                await RM.send_request(method="history_get", timeout=7)
+            check_attempts()
+            await RM.close()
+
+        asyncio.run(testing())
+
+
 @pytest.mark.parametrize("protocol", ["ZMQ", "HTTP"])
 def test_ReManagerComm_ALL_01(re_manager, fastapi_server, protocol):  # noqa: F811
     """
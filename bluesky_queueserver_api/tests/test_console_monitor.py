@@ -0,0 +1,715 @@
+import asyncio
+import json
+import random
+import threading
+import time as ttime
+
+import httpx
+import pytest
+
+from bluesky_queueserver_api import console_monitor
+from bluesky_queueserver_api.comm_base import RequestParameterError, RequestTimeoutError
+from bluesky_queueserver_api.console_monitor import (
+    ConsoleMonitor_HTTP_Async,
+    ConsoleMonitor_HTTP_Threads,
+    ConsoleMonitor_ZMQ_Threads,
+    _ConsoleOutputStreamDecoder,
+    _skip_received_msgs,
+    _skip_stream_overlap,
+)
+
+
+def _create_console_monitor(max_lines):
+    return ConsoleMonitor_ZMQ_Threads(zmq_info_addr=None, poll_timeout=0.1, max_msgs=100, max_lines=max_lines)
+
+
+class _TextBufferReference:
+    """
+    Reference implementation of the text buffer (processing one control sequence at a time).
+    """
+
+    def __init__(self):
+        self.buffer, self.line, self.pos = [], 0, 0
+
+    def add_msg(self, msg):
+        patterns = {"new_line": "\n", "cr": "\r", "one_line_up": "\x1B\x5B\x41"}
+        while msg:
+            indices = {k: msg.find(v) for k, v in patterns.items()}
+            indices_nonzero = [_ for _ in indices.values() if (_ >= 0)]
+            next_ind = min(indices_nonzero) if indices_nonzero else len(msg)
+
+            if not self.buffer:
+                self.buffer, self.line, self.pos = [""], 0, 0
+
+            if next_ind != 0:
+                substr, msg = msg[:next_ind], msg[next_ind:]
+                line = self.buffer[self.line]
+                line += " " * max(self.pos - len(line), 0)
+                self.buffer[self.line] = line[: self.pos] + substr + line[self.pos + len(substr) :]
+                self.pos += len(substr)
+            elif indices["new_line"] == 0:
+                self.line += 1
+                if self.line >= len(self.buffer):
+                    self.buffer.append("")
+                self.pos, msg = 0, msg[1:]
+            elif indices["cr"] == 0:
+                self.pos, msg = 0, msg[1:]
+            elif indices["one_line_up"] == 0:
+                self.line = max(self.line - 1, 0)
+                msg = msg[3:]
+
+    def trim(self, max_lines):
+        max_lines += 1 if (self.buffer and self.buffer[-1] == "") else 0
+        n_remove = max(len(self.buffer) - max_lines, 0)
+        self.buffer = self.buffer[n_remove:]
+        self.line = max(self.line - n_remove, 0)
+
+    def text(self, nlines):
+        lines = self.buffer[:-1] if (self.buffer and self.buffer[-1] == "") else self.buffer
+        nlines = len(lines) if nlines is None else min(max(nlines, 0), len(lines))
+        return "\n".join(lines[len(lines) - nlines :])
+
+
+def _progress_bar_stream(n_bars, n_steps):
+    """
+    Generate console output similar to output of multiple progress bars (tqdm style).
+    """
+    msgs = ["Starting the plan ...\n"]
+    for n in range(n_steps + 1):
+        parts = []
+        for k in range(n_bars):
+            percent = 100 * n // n_steps
+            bar = "#" * (percent // 4)
+            parts.append(f"\rmotor{k}: {percent:3d}%|{bar:<25}| {n}/{n_steps}\n")
+        msgs.append("".join(parts) + "\x1B\x5B\x41" * n_bars)
+    msgs.append("\n" * n_bars + "Plan completed\n")
+    return msgs
+
+
+def _random_stream(n_msgs, seed):
+    rng = random.Random(seed)
+    tokens = ["\n", "\r", "\x1B\x5B\x41", "abc", "Some text", "x", "12345678901234567890", " ", "\x1B\x5B"]
+    return ["".join(rng.choices(tokens, k=rng.randint(0, 20))) for _ in range(n_msgs)]
+
+
+# fmt: off
+@pytest.mark.parametrize("msgs", [
+    [],
+    [""],
+    ["abc"],
+    ["\n\n\n"],
+    ["\x1B\x5B\x41\x1B\x5B\x41abc"],
+    ["abc\rde", "f\n", "1234567890\r\x1B\x5B\x41", "xyz\n"],
+    ["progress 10%\r", "progress 20%\r", "progress 100%\n"],
+    _progress_bar_stream(3, 50),
+    _random_stream(500, seed=0),
+    _random_stream(500, seed=1),
+])
+# fmt: on
+def test_console_monitor_text_buffer_01(msgs):
+    """
+    ``_add_msg_to_text_buffer``: the text buffer matches the reference implementation.
+    """
+    cm = _create_console_monitor(max_lines=1000000)
+    ref = _TextBufferReference()
+    for msg in msgs:
+        cm._add_msg_to_text_buffer({"msg": msg})
+        ref.add_msg(msg)
+        assert list(cm._text_buffer) == ref.buffer
+        assert (cm._text_line, cm._text_pos) == (ref.line, ref.pos)
+
+
+def test_console_monitor_text_buffer_02():
+    """
+    ``_add_msg_to_text_buffer``: process a large progress bar stream (a few MB). The stream
+    is sent as large messages (multiple updates per message), the text is checked against
+    the reference implementation.
+    """
+    msgs = _progress_bar_stream(10, 5000)
+    msgs = ["".join(msgs[n : n + 100]) for n in range(0, len(msgs), 100)]
+    assert sum(len(_) for _ in msgs) > 2000000
+
+    cm = _create_console_monitor(max_lines=1000)
+    ref = _TextBufferReference()
+    for msg in msgs:
+        cm._add_msg_to_text_buffer({"msg": msg})
+        cm._adjust_text_buffer_size()
+    for msg in msgs:
+        ref.add_msg(msg)
+        ref.trim(1000)
+
+    assert list(cm._text_buffer) == ref.buffer
+    assert cm._text_generate(nlines=None).splitlines()[-1] == "Plan completed"
+    assert "motor9: 100%|#########################| 5000/5000" in cm._text_generate(nlines=None)
+
+
+# fmt: off
+@pytest.mark.parametrize("max_lines", [1, 2, 5, 100, 10000])
+# fmt: on
+def test_console_monitor_text_buffer_03(max_lines):
+    """
+    ``_adjust_text_buffer_size``, ``_text_generate``: old lines are removed from the buffer,
+    the text contains the requested number of last lines. The cached text is updated when
+    the buffer is full.
+    """
+    cm = _create_console_monitor(max_lines=max_lines)
+    ref = _TextBufferReference()
+    for msg in _random_stream(300, seed=2) + _progress_bar_stream(3, 20):
+        cm._add_msg_to_text_buffer({"msg": msg})
+        cm._adjust_text_buffer_size()
+        ref.add_msg(msg)
+        ref.trim(max_lines)
+
+        assert list(cm._text_buffer) == ref.buffer
+        assert cm._text_line == ref.line
+        for nlines in (None, -1, 0, 1, 3, max_lines, max_lines + 10):
+            assert cm._text_generate(nlines=nlines) == ref.text(nlines), nlines
+
+    # The text is cached
+    assert cm._text_generate(nlines=3) is cm._text_generate(nlines=3)
+
+    # Reducing the maximum number of lines
+    cm.text_max_lines = 1
+    ref.trim(1)
+    assert list(cm._text_buffer) == ref.buffer
+    assert cm._text_generate(nlines=None) == ref.text(None)
+
+
+def _cursor_stream(n_msgs, seed):
+    """
+    Random stream with frequent moves of the cursor between lines.
+    """
+    rng = random.Random(seed)
+    tokens = ["\n", "\n", "\r", "\x1B\x5B\x41", "\x1B\x5B\x41\x1B\x5B\x41", "abc", "Some text", "x"]
+    return ["".join(rng.choices(tokens, k=rng.randint(0, 10))) for _ in range(n_msgs)]
+
+
+# fmt: off
+@pytest.mark.parametrize("max_lines", [1, 3, 20, 10000])
+@pytest.mark.parametrize("stream", ["random", "cursor", "progress"])
+# fmt: on
+def test_console_monitor_text_buffer_04(max_lines, stream):
+    """
+    ``_text_generate``: the text is rendered incrementally and matches the text generated
+    from the full buffer. The text is generated after random numbers of messages.
+    """
+    msgs = {
+        "random": _random_stream(1000, seed=3),
+        "cursor": _cursor_stream(1000, seed=4),
+        "progress": _progress_bar_stream(4, 100),
+    }[stream]
+    rng = random.Random(5)
+
+    cm = _create_console_monitor(max_lines=max_lines)
+    ref = _TextBufferReference()
+    for msg in msgs:
+        cm._add_msg_to_text_buffer({"msg": msg})
+        cm._adjust_text_buffer_size()
+        ref.add_msg(msg)
+        ref.trim(max_lines)
+        if rng.random() < 0.3:
+            assert cm._text_generate(nlines=None) == ref.text(None)
+            assert cm._text_generate(nlines=2) == ref.text(2)
+
+    assert cm._text_generate(nlines=None) == ref.text(None)
+    if (stream == "progress") and (max_lines > 10):
+        # The cursor is at the empty line at the end, all lines are included in the cached prefix
+        assert cm._text_prefix_end - cm._text_prefix_first == len(ref.buffer) - 1
+
+
+# fmt: off
+@pytest.mark.benchmark
+@pytest.mark.parametrize("updates_per_msg", [1, 100])
+# fmt: on
+def test_console_monitor_text_buffer_05(updates_per_msg):
+    """
+    Benchmark: ``_add_msg_to_text_buffer`` processing a multi-MB progress bar stream compared
+    to the reference implementation (processing one control sequence at a time). The stream
+    is sent as messages containing one or multiple updates of the progress bars.
+    """
+    max_lines = 1000
+    msgs = _progress_bar_stream(10, 5000)
+    msgs = ["".join(msgs[n : n + updates_per_msg]) for n in range(0, len(msgs), updates_per_msg)]
+    size = sum(len(_) for _ in msgs) / 1e6
+
+    cm = _create_console_monitor(max_lines=max_lines)
+    t0 = ttime.perf_counter()
+    for msg in msgs:
+        cm._add_msg_to_text_buffer({"msg": msg})
+        cm._adjust_text_buffer_size()
+    t_cm = ttime.perf_counter() - t0
+
+    ref = _TextBufferReference()
+    t0 = ttime.perf_counter()
+    for msg in msgs:
+        ref.add_msg(msg)
+        ref.trim(max_lines)
+    t_ref = ttime.perf_counter() - t0
+
+    assert list(cm._text_buffer) == ref.buffer
+    print(
+        f"Progress bar stream ({size:.2f} MB, {len(msgs)} messages, {updates_per_msg} updates per message): "
+        f"single pass {t_cm:.3f} s, reference {t_ref:.3f} s"
+    )
+
+
+# fmt: off
+@pytest.mark.benchmark
+@pytest.mark.parametrize("max_lines", [1000, 10000, 100000])
+# fmt: on
+def test_console_monitor_text_buffer_06(max_lines):
+    """
+    Benchmark: cost of adding a line to the full text buffer and of generating the text with
+    the last 100 lines for different sizes of the buffer. Removal of the oldest line from
+    a list (``pop(0)``) is timed for comparison.
+    """
+    n_msgs = 20000
+    msgs = [f"line {n}: some console output\n" for n in range(max_lines + n_msgs)]
+
+    cm = _create_console_monitor(max_lines=max_lines)
+    for msg in msgs[:max_lines]:
+        cm._add_msg_to_text_buffer({"msg": msg})
+        cm._adjust_text_buffer_size()
+
+    t0 = ttime.perf_counter()
+    for msg in msgs[max_lines:]:
+        cm._add_msg_to_text_buffer({"msg": msg})
+        cm._adjust_text_buffer_size()
+    t_add = (ttime.perf_counter() - t0) / n_msgs
+    assert cm._text_n_lines() == max_lines
+
+    t0 = ttime.perf_counter()
+    for _ in range(100):
+        cm._text.clear()
+        text = cm._text_generate(nlines=100)
+    t_text = (ttime.perf_counter() - t0) / 100
+    assert text.splitlines()[-1] == msgs[-1].rstrip("\n")
+
+    buffer = msgs[:max_lines]
+    t0 = ttime.perf_counter()
+    for msg in msgs[max_lines:]:
+        buffer.append(msg)
+        buffer.pop(0)
+    t_list = (ttime.perf_counter() - t0) / n_msgs
+
+    print(
+        f"max_lines={max_lines}: add line {t_add * 1e6:.1f} us, text(100) {t_text * 1e6:.1f} us, "
+        f"list 'pop(0)' {t_list * 1e6:.2f} us"
+    )
+
+
+# fmt: off
+@pytest.mark.parametrize("max_lines", [1, 3, 20, 10000])
+@pytest.mark.parametrize("stream", ["random", "cursor", "progress"])
+# fmt: on
+def test_console_monitor_text_since_01(max_lines, stream):
+    """
+    ``_text_generate_since``: the text reconstructed from the changes matches the current text.
+    The changes are requested after random numbers of messages.
+    """
+    msgs = {
+        "random": _random_stream(1000, seed=6),
+        "cursor": _cursor_stream(1000, seed=7),
+        "progress": _progress_bar_stream(4, 100),
+    }[stream]
+    rng = random.Random(8)
+
+    cm = _create_console_monitor(max_lines=max_lines)
+    lines, text_uid = [], None
+    for msg in msgs:
+        cm._add_msg_to_text_buffer({"msg": msg})
+        cm._adjust_text_buffer_size()
+        if rng.random() < 0.3:
+            changes = cm._text_generate_since(text_uid)
+            assert changes["text_uid"] == cm.text_uid
+            text_uid = changes["text_uid"]
+            del lines[: changes["lines_removed"]]
+            assert changes["first_changed_line"] <= len(lines)
+            lines[changes["first_changed_line"] :] = changes["lines"]
+            assert "\n".join(lines) == cm._text_generate(nlines=None)
+
+    # No changes
+    changes = cm._text_generate_since(cm.text_uid)
+    assert changes["lines_removed"] == 0
+    assert changes["lines"] == []
+
+
+def test_console_monitor_text_since_02(monkeypatch):
+    """
+    ``_text_generate_since``: full text is returned for unknown, expired or cleared UIDs.
+    """
+    monkeypatch.setattr(console_monitor, "_text_history_max_size", 10)
+
+    cm = _create_console_monitor(max_lines=100)
+    cm._add_msg_to_text_buffer({"msg": "line 1\nline 2\nline 3"})
+    cm._adjust_text_buffer_size()
+
+    full = {"text_uid": cm.text_uid, "lines_removed": 0, "first_changed_line": 0}
+    full["lines"] = ["line 1", "line 2", "line 3"]
+    assert cm._text_generate_since(None) == full
+    assert cm._text_generate_since("unknown-uid") == full
+
+    text_uid = cm.text_uid
+    cm._add_msg_to_text_buffer({"msg": "\nline 4"})
+    changes = cm._text_generate_since(text_uid)
+    assert changes["lines_removed"] == 0
+    assert changes["first_changed_line"] == 2
+    assert changes["lines"] == ["line 3", "line 4"]
+
+    # Expired UID
+    for n in range(10):
+        cm._add_msg_to_text_buffer({"msg": f"\nline {n + 5}"})
+    assert len(cm._text_history) == 10
+    changes = cm._text_generate_since(text_uid)
+    assert changes["lines_removed"] == 0
+    assert changes["first_changed_line"] == 0
+    assert len(changes["lines"]) == 14
+
+    # Cleared buffer
+    text_uid = cm.text_uid
+    cm._text_clear()
+    cm._add_msg_to_text_buffer({"msg": "new line"})
+    changes = cm._text_generate_since(text_uid)
+    assert (changes["lines_removed"], changes["first_changed_line"]) == (0, 0)
+    assert changes["lines"] == ["new line"]
+
+
+def _msgs_to_stream(msgs, separator):
+    return separator.join(json.dumps(_) for _ in msgs)
+
+
+# fmt: off
+@pytest.mark.parametrize("separator", ["", "\n", " \r\n "])
+@pytest.mark.parametrize("chunk_size", [1, 7, 100, 100000])
+# fmt: on
+def test_console_monitor_stream_decoder_01(separator, chunk_size):
+    """
+    ``_ConsoleOutputStreamDecoder``: messages are decoded from the stream split into chunks
+    of arbitrary size. Messages may be separated by whitespace.
+    """
+    msgs = [{"time": n + 0.5, "msg": f'Line {n} {{}}\\"\n'} for n in range(100)]
+    stream = _msgs_to_stream(msgs, separator)
+
+    decoder = _ConsoleOutputStreamDecoder()
+    msgs_decoded = []
+    for n in range(0, len(stream), chunk_size):
+        msgs_decoded.extend(decoder.decode(stream[n : n + chunk_size]))
+    assert msgs_decoded == msgs
+    assert decoder.decode("") == []
+
+
+def test_console_monitor_stream_decoder_02(monkeypatch):
+    """
+    ``_ConsoleOutputStreamDecoder``: exception is raised if the stream can not be decoded.
+    """
+    monkeypatch.setattr(console_monitor, "_console_monitor_stream_buffer_max", 100)
+    decoder = _ConsoleOutputStreamDecoder()
+    assert decoder.decode('{"msg": "abc"} {"msg": ') == [{"msg": "abc"}]
+    with pytest.raises(ValueError, match="Failed to decode"):
+        decoder.decode("invalid JSON" * 10)
+
+
+def test_console_monitor_stream_skip_01():
+    """
+    ``_skip_received_msgs``, ``_skip_stream_overlap``: messages received twice are skipped.
+    """
+    m = [{"time": n, "msg": f"{n}"} for n in range(6)]
+
+    assert _skip_received_msgs(m[1:5], None) == m[1:5]
+    assert _skip_received_msgs(m[1:5], m[0]) == m[1:5]
+    assert _skip_received_msgs(m[1:5], m[2]) == m[3:5]
+    assert _skip_received_msgs(m[1:5], m[4]) == []
+    assert _skip_received_msgs([], m[4]) == []
+
+    assert _skip_stream_overlap(m[2:4], m[0:4]) == ([], [])
+    assert _skip_stream_overlap(m[2:3], m[0:4]) == ([], m[3:4])
+    assert _skip_stream_overlap(m[2:6], m[0:4]) == (m[4:6], [])
+    assert _skip_stream_overlap(m[4:6], m[0:4]) == (m[4:6], [])
+    assert _skip_stream_overlap(m[0:2], []) == (m[0:2], [])
+
+
+class _ConsoleOutputServer:
+    """
+    Simplified HTTP server, which supports polling and streaming of console output. Each stream
+    is closed after a few messages. The messages are published by the server:
+    before the stream is opened (received by loading the messages from the server buffer), after
+    the stream is opened (received from the stream and from the buffer) and after the messages
+    are loaded from the buffer (received only from the stream). Streaming is not supported
+    after ``n_streams`` streams.
+    """
+
+    def __init__(self, *, n_streams):
+        self.n_streams = n_streams
+        self.n_streams_opened = 0
+        self.msgs, self.msgs_pending = [], []
+
+    def publish(self, n):
+        for _ in range(n):
+            n_msg = len(self.msgs)
+            self.msgs.append((f"uid-{n_msg}", {"time": float(n_msg), "msg": f"Message {n_msg}\n"}))
+
+    def handler(self, request):
+        if request.url.path == "/api/console_output_update":
+            last_msg_uid = json.loads(request.content)["last_msg_uid"]
+            uids = [_[0] for _ in self.msgs]
+            n_first = uids.index(last_msg_uid) + 1 if last_msg_uid in uids else len(uids)
+            response = {"console_output_msgs": [_[1] for _ in self.msgs[n_first:]]}
+            response["last_msg_uid"] = uids[-1] if uids else ""
+            return httpx.Response(200, json=response)
+        elif request.url.path == "/api/stream_console_output":
+            # Messages sent to the previous stream after the messages were loaded
+            self.msgs.extend(self.msgs_pending)
+            if self.n_streams_opened >= self.n_streams:
+                return httpx.Response(404)
+            self.n_streams_opened += 1
+            self.publish(3)  # Published while the stream was closed
+            n_first = len(self.msgs)
+            self.publish(2)  # Published after the stream was opened
+            # Published after the messages are loaded from the buffer
+            n_stream = self.n_streams_opened
+            self.msgs_pending = [
+                (f"uid-{n_stream}-{n}", {"time": -1.0, "msg": f"{n_stream}-{n}\n"}) for n in range(2)
+            ]
+            stream_msgs = [_[1] for _ in self.msgs[n_first:] + self.msgs_pending]
+            stream = _msgs_to_stream(stream_msgs, "").encode("utf-8")
+            return httpx.Response(200, content=stream)
+        return httpx.Response(404)
+
+
+class _ConsoleOutputServerParent:
+    """
+    Minimal replacement for the parent API object.
+    """
+
+    def __init__(self, client):
+        self._client = client
+        self._timeout = 1
+        self._http_server_uri = "http://test"
+
+    def _prepare_headers(self):
+        return None
+
+
+# fmt: off
+@pytest.mark.parametrize("library", ["THREADS", "ASYNC"])
+# fmt: on
+def test_console_monitor_http_stream_01(library):
+    """
+    ``ConsoleMonitor_HTTP_Threads``, ``ConsoleMonitor_HTTP_Async``: streaming of console output.
+    Each message is received once after the stream is reopened (the messages published while the
+    stream is closed are loaded from the server buffer). The monitor switches to polling if
+    streaming is not supported by the server. The messages published before the monitor is
+    enabled are not received.
+    """
+    n_streams = 4
+    server = _ConsoleOutputServer(n_streams=n_streams)
+    server.publish(5)
+    n_msgs_old = len(server.msgs)
+    transport = httpx.MockTransport(server.handler)
+    params = dict(poll_period=0.05, max_msgs=1000, max_lines=1000, streaming=True)
+
+    def check_msgs(msgs, text):
+        # The messages published before the stream was opened for the first time are not received.
+        #   The server publishes 3 messages before the first stream is opened.
+        msgs_expected = [_[1] for _ in server.msgs[n_msgs_old + 3 :]]
+        assert server.n_streams_opened == n_streams
+        assert msgs == msgs_expected
+        assert text == "".join(_["msg"] for _ in msgs_expected).rstrip("\n")
+
+    if library == "THREADS":
+        parent = _ConsoleOutputServerParent(httpx.Client(base_url="http://test", transport=transport))
+        cm = ConsoleMonitor_HTTP_Threads(parent=parent, **params)
+        cm._create_stream_client = lambda: httpx.Client(base_url="http://test", transport=transport)
+
+        cm.enable()
+        ttime.sleep(1)
+        assert cm._monitor_streaming_active is False
+        server.publish(2)  # Received by polling
+        ttime.sleep(0.5)
+        cm.disable_wait()
+
+        msgs = []
+        while True:
+            try:
+                msgs.append(cm.next_msg(timeout=0.1))
+            except RequestTimeoutError:
+                break
+        check_msgs(msgs, cm.text())
+
+    else:
+
+        async def testing():
+            parent = _ConsoleOutputServerParent(httpx.AsyncClient(base_url="http://test", transport=transport))
+            cm = ConsoleMonitor_HTTP_Async(parent=parent, **params)
+
+            cm.enable()
+            await asyncio.sleep(1)
+            assert cm._monitor_streaming_active is False
+            server.publish(2)  # Received by polling
+            await asyncio.sleep(0.5)
+            await cm.disable_wait()
+
+            msgs = []
+            while True:
+                try:
+                    msgs.append(await cm.next_msg(timeout=0.1))
+                except RequestTimeoutError:
+                    break
+            check_msgs(msgs, await cm.text())
+
+        asyncio.run(testing())
+
+
+def _create_console_monitor_async(max_msgs, **kwargs):
+    return console_monitor.ConsoleMonitor_ZMQ_Async(
+        zmq_info_addr=None, poll_timeout=0.1, max_msgs=max_msgs, max_lines=100, **kwargs
+    )
+
+
+# fmt: off
+@pytest.mark.parametrize("overflow, msgs_expected, stats_expected", [
+    ("drop_newest", ["0", "1", "2"], {"dropped": 3, "coalesced": 0, "max_size": 3}),
+    ("drop_oldest", ["3", "4", "5"], {"dropped": 3, "coalesced": 0, "max_size": 3}),
+    ("block", ["0", "1", "2"], {"dropped": 3, "coalesced": 0, "max_size": 3}),
+    ("coalesce", ["0", "1", "2345"], {"dropped": 0, "coalesced": 3, "max_size": 3}),
+])
+@pytest.mark.parametrize("library", ["THREADS", "ASYNC"])
+# fmt: on
+def test_console_monitor_overflow_01(library, overflow, msgs_expected, stats_expected):
+    """
+    ``_add_msg_to_queue``: overflow policies and statistics of the message queue.
+    """
+    msgs = [{"time": n, "msg": str(n)} for n in range(6)]
+    params = dict(overflow=overflow, overflow_timeout=0.01)
+
+    if library == "THREADS":
+        cm = ConsoleMonitor_ZMQ_Threads(zmq_info_addr=None, poll_timeout=0.1, max_msgs=3, max_lines=100, **params)
+        for msg in msgs:
+            cm._add_msg_to_queue(msg)
+        assert cm.msg_queue_stats == stats_expected
+        msgs_queue = [cm.next_msg() for _ in range(cm.msg_queue_size)]
+        cm.clear()
+        assert cm.msg_queue_stats == {"dropped": 0, "coalesced": 0, "max_size": 0}
+
+    else:
+
+        async def testing():
+            cm = _create_console_monitor_async(max_msgs=3, **params)
+            for msg in msgs:
+                await cm._add_msg_to_queue(msg)
+            assert cm.msg_queue_stats == stats_expected
+            msgs_queue = [await cm.next_msg() for _ in range(cm.msg_queue_size)]
+            cm.clear()
+            assert cm.msg_queue_stats == {"dropped": 0, "coalesced": 0, "max_size": 0}
+            return msgs_queue
+
+        msgs_queue = asyncio.run(testing())
+
+    assert [_["msg"] for _ in msgs_queue] == msgs_expected
+    # The timestamp of the first of the coalesced messages is kept
+    assert [_["time"] for _ in msgs_queue] == [int(_[0]) for _ in msgs_expected]
+
+
+# fmt: off
+@pytest.mark.parametrize("library", ["THREADS", "ASYNC"])
+# fmt: on
+def test_console_monitor_overflow_02(library):
+    """
+    ``_add_msg_to_queue``: 'block' policy, the message is added to the queue once another
+    message is read from the queue.
+    """
+    msgs = [{"time": n, "msg": str(n)} for n in range(4)]
+    params = dict(overflow="block", overflow_timeout=5)
+
+    if library == "THREADS":
+        cm = ConsoleMonitor_ZMQ_Threads(zmq_info_addr=None, poll_timeout=0.1, max_msgs=3, max_lines=100, **params)
+        for msg in msgs[:3]:
+            cm._add_msg_to_queue(msg)
+        thread = threading.Thread(target=cm._add_msg_to_queue, args=(msgs[3],))
+        thread.start()
+        ttime.sleep(0.5)
+        assert thread.is_alive()
+        assert cm.next_msg() == msgs[0]
+        thread.join(timeout=1)
+        assert not thread.is_alive()
+        msgs_queue = [cm.next_msg() for _ in range(cm.msg_queue_size)]
+        stats = cm.msg_queue_stats
+
+    else:
+
+        async def testing():
+            cm = _create_console_monitor_async(max_msgs=3, **params)
+            for msg in msgs[:3]:
+                await cm._add_msg_to_queue(msg)
+            task = asyncio.create_task(cm._add_msg_to_queue(msgs[3]))
+            await asyncio.sleep(0.5)
+            assert not task.done()
+            assert await cm.next_msg() == msgs[0]
+            await asyncio.wait_for(task, timeout=1)
+            msgs_queue = [await cm.next_msg() for _ in range(cm.msg_queue_size)]
+            return msgs_queue, cm.msg_queue_stats
+
+        msgs_queue, stats = asyncio.run(testing())
+
+    assert msgs_queue == msgs[1:]
+    assert stats == {"dropped": 0, "coalesced": 0, "max_size": 3}
+
+
+def test_console_monitor_overflow_03():
+    """
+    Unsupported overflow policy.
+    """
+    with pytest.raises(RequestParameterError, match="Unsupported overflow policy"):
+        _create_console_monitor_async(max_msgs=3, overflow="unknown")
+
+
+# fmt: off
+@pytest.mark.parametrize("library", ["THREADS", "ASYNC"])
+# fmt: on
+def test_console_monitor_overflow_04(library):
+    """
+    ``ConsoleMonitor_HTTP_Threads``, ``ConsoleMonitor_HTTP_Async``: the text buffer receives all
+    messages if the message queue is full, polling continues.
+    """
+    server = _ConsoleOutputServer(n_streams=0)
+    server.publish(1)  # Published before the monitor is enabled
+    transport = httpx.MockTransport(server.handler)
+    params = dict(poll_period=0.05, max_msgs=2, max_lines=1000)
+
+    def check_text(cm, text):
+        assert text == "".join(_["msg"] for _ in msgs_published).rstrip("\n")
+        assert cm.msg_queue_size == 2
+        assert cm.msg_queue_stats == {"dropped": 8, "coalesced": 0, "max_size": 2}
+
+    if library == "THREADS":
+        parent = _ConsoleOutputServerParent(httpx.Client(base_url="http://test", transport=transport))
+        cm = ConsoleMonitor_HTTP_Threads(parent=parent, **params)
+        cm._create_stream_client = lambda: httpx.Client(base_url="http://test", transport=transport)
+
+        cm.enable()
+        ttime.sleep(0.5)
+        n_msgs = len(server.msgs)
+        server.publish(10)
+        msgs_published = [_[1] for _ in server.msgs[n_msgs:]]
+        ttime.sleep(0.5)
+        cm.disable_wait()
+        check_text(cm, cm.text())
+
+    else:
+
+        async def testing():
+            nonlocal msgs_published
+            parent = _ConsoleOutputServerParent(httpx.AsyncClient(base_url="http://test", transport=transport))
+            cm = ConsoleMonitor_HTTP_Async(parent=parent, **params)
+
+            cm.enable()
+            await asyncio.sleep(0.5)
+            n_msgs = len(server.msgs)
+            server.publish(10)
+            msgs_published = [_[1] for _ in server.msgs[n_msgs:]]
+            await asyncio.sleep(0.5)
+            await cm.disable_wait()
+            check_text(cm, await cm.text())
+
+        msgs_published = None
+        asyncio.run(testing())
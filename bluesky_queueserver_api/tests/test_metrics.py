@@ -0,0 +1,133 @@
+import asyncio
+import httpx
+import pytest
+import time as ttime
+
+from bluesky_queueserver_api import MetricsExporter
+from bluesky_queueserver_api.zmq import REManagerAPI as REManagerAPI_zmq_threads
+
+from .common import re_manager, fastapi_server  # noqa: F401
+from .common import _select_re_manager_api, _is_async, instantiate_re_api_class
+
+
+def _parse_metrics(text):
+    """
+    Returns the dictionary of samples ``{"name{labels}": value}``.
+    """
+    samples = {}
+    for line in text.splitlines():
+        if line.startswith("#"):
+            continue
+        name, value = line.rsplit(" ", 1)
+        samples[name] = value
+    return samples
+
+
+def test_MetricsExporter_01(tmp_path):
+    """
+    ``MetricsExporter``: generate metrics based on statistics, write metrics to a file.
+    """
+    RM = REManagerAPI_zmq_threads()
+    exporter = MetricsExporter(RM, labels={"client": 'gui "1"'})
+
+    for latency in (0.0001, 0.003, 100):
+        RM._request_completed(method="status", params=None, time_start=ttime.perf_counter() - latency)
+    ex = RM.RequestTimeoutError("timeout", request={})
+    RM._request_completed(method="queue_get", params=None, time_start=ttime.perf_counter(), exception=ex)
+    RM._stats_cache_record("queue_get", hit=True)
+    RM._stats_cache_record("queue_get", hit=False)
+
+    text = exporter.generate()
+    assert "# TYPE qserver_api_request_latency_seconds histogram" in text
+    assert text.endswith("\n")
+
+    samples = _parse_metrics(text)
+    lbl = 'client="gui \\"1\\""'
+    assert samples[f'qserver_api_requests_total{{{lbl},method="status"}}'] == "3"
+    assert samples[f'qserver_api_requests_total{{{lbl},method="queue_get"}}'] == "1"
+    key = f'qserver_api_request_errors_total{{{lbl},method="queue_get",exception="RequestTimeoutError"}}'
+    assert samples[key] == "1"
+    assert samples[f'qserver_api_request_latency_seconds_bucket{{{lbl},method="status",le="0.001"}}'] == "1"
+    assert samples[f'qserver_api_request_latency_seconds_bucket{{{lbl},method="status",le="0.005"}}'] == "2"
+    assert samples[f'qserver_api_request_latency_seconds_bucket{{{lbl},method="status",le="10.0"}}'] == "2"
+    assert samples[f'qserver_api_request_latency_seconds_bucket{{{lbl},method="status",le="+Inf"}}'] == "3"
+    assert samples[f'qserver_api_request_latency_seconds_count{{{lbl},method="status"}}'] == "3"
+    assert float(samples[f'qserver_api_request_latency_seconds_sum{{{lbl},method="status"}}']) >= 100
+    assert samples[f'qserver_api_cache_hits_total{{{lbl},resource="queue_get"}}'] == "1"
+    assert samples[f'qserver_api_cache_misses_total{{{lbl},resource="queue_get"}}'] == "1"
+    assert float(samples[f"qserver_api_status_polling_period_seconds{{{lbl}}}"]) > 0
+    assert samples[f"qserver_api_console_monitor_queue_size{{{lbl}}}"] == "0"
+
+    # Custom prefix
+    text = MetricsExporter(RM, prefix="client").generate()
+    assert 'client_requests_total{method="status"} 3' in text.splitlines()
+
+    path = tmp_path / "qserver_api.prom"
+    exporter.write_textfile(path)
+    assert path.read_text() == exporter.generate()
+    assert [_.name for _ in tmp_path.iterdir()] == ["qserver_api.prom"]
+
+    RM.close()
+
+
+def test_MetricsExporter_02():
+    """
+    ``MetricsExporter``: serve metrics over HTTP.
+    """
+    RM = REManagerAPI_zmq_threads()
+    exporter = MetricsExporter(RM)
+    assert exporter.server_address is None
+
+    exporter.start_server(port=0)
+    with pytest.raises(RuntimeError, match="already running"):
+        exporter.start_server(port=0)
+
+    addr, port = exporter.server_address
+    RM._request_completed(method="status", params=None, time_start=ttime.perf_counter())
+    response = httpx.get(f"http://{addr}:{port}/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'qserver_api_requests_total{method="status"} 1' in response.text.splitlines()
+
+    assert httpx.get(f"http://{addr}:{port}/unknown").status_code == 404
+
+    exporter.stop_server()
+    assert exporter.server_address is None
+    exporter.stop_server()  # Ignored
+
+    RM.close()
+
+
+# fmt: off
+@pytest.mark.parametrize("library", ["THREADS", "ASYNC"])
+@pytest.mark.parametrize("protocol", ["ZMQ", "HTTP"])
+# fmt: on
+def test_MetricsExporter_03(re_manager, fastapi_server, protocol, library):  # noqa: F811
+    """
+    ``MetricsExporter``: export metrics collected while communicating with RE Manager.
+    """
+    rm_api_class = _select_re_manager_api(protocol, library)
+
+    def check_metrics(text):
+        samples = _parse_metrics(text)
+        assert int(samples['qserver_api_requests_total{method="status"}']) >= 1
+        assert samples['qserver_api_requests_total{method="queue_get"}'] == "1"
+        assert samples['qserver_api_cache_hits_total{resource="queue_get"}'] == "1"
+        assert samples['qserver_api_cache_misses_total{resource="queue_get"}'] == "1"
+
+    if not _is_async(library):
+        RM = instantiate_re_api_class(rm_api_class)
+        RM.queue_get()
+        RM.queue_get()
+        check_metrics(MetricsExporter(RM).generate())
+        RM.close()
+    else:
+
+        async def testing():
+            RM = instantiate_re_api_class(rm_api_class)
+            await RM.queue_get()
+            await RM.queue_get()
+            check_metrics(MetricsExporter(RM).generate())
+            await RM.close()
+
+        asyncio.run(testing())
@@ -4,14 +4,19 @@ from .._defaults import (
     default_allow_request_fail_exceptions,
     default_zmq_request_timeout_recv,
     default_zmq_request_timeout_send,
+    default_zmq_n_connections,
+    default_zmq_priority_connection,
     default_console_monitor_poll_timeout,
     default_console_monitor_max_msgs,
     default_console_monitor_max_lines,
+    default_console_monitor_overflow,
+    default_console_monitor_overflow_timeout,
     default_status_expiration_period,
     default_status_polling_period,
+    default_status_polling_period_min,
 )
 
-from ..api_docstrings import _doc_REManagerAPI_ZMQ
+from ..api_docstrings import _doc_REManagerAPI_ZMQ, _doc_close
 
 
 class REManagerAPI(ReManagerComm_ZMQ_Threads, API_Threads_Mixin):
@@ -26,10 +31,16 @@ class REManagerAPI(ReManagerComm_ZMQ_Threads, API_Threads_Mixin):
         console_monitor_poll_timeout=default_console_monitor_poll_timeout,
         console_monitor_max_msgs=default_console_monitor_max_msgs,
         console_monitor_max_lines=default_console_monitor_max_lines,
+        console_monitor_overflow=default_console_monitor_overflow,
+        console_monitor_overflow_timeout=default_console_monitor_overflow_timeout,
         zmq_public_key=None,
         request_fail_exceptions=default_allow_request_fail_exceptions,
         status_expiration_period=default_status_expiration_period,
         status_polling_period=default_status_polling_period,
+        status_polling_period_min=default_status_polling_period_min,
+        zmq_n_connections=default_zmq_n_connections,
+        zmq_priority_connection=default_zmq_priority_connection,
+        request_policies=None,
     ):
         ReManagerComm_ZMQ_Threads.__init__(
             self,
@@ -40,14 +51,26 @@ class REManagerAPI(ReManagerComm_ZMQ_Threads, API_Threads_Mixin):
             console_monitor_poll_timeout=console_monitor_poll_timeout,
             console_monitor_max_msgs=console_monitor_max_msgs,
             console_monitor_max_lines=console_monitor_max_lines,
+            console_monitor_overflow=console_monitor_overflow,
+            console_monitor_overflow_timeout=console_monitor_overflow_timeout,
             zmq_public_key=zmq_public_key,
             request_fail_exceptions=request_fail_exceptions,
+            zmq_n_connections=zmq_n_connections,
+            zmq_priority_connection=zmq_priority_connection,
+            request_policies=request_policies,
         )
         API_Threads_Mixin.__init__(
             self,
             status_expiration_period=status_expiration_period,
             status_polling_period=status_polling_period,
+            status_polling_period_min=status_polling_period_min,
         )
 
+    def close(self):
+        # Docstring is maintained separately
+        self._close_api()
+        ReManagerComm_ZMQ_Threads.close(self)
+
 
 REManagerAPI.__doc__ = _doc_REManagerAPI_ZMQ
+REManagerAPI.close.__doc__ = _doc_close